@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+
+# 이 비율 이상 느려지거나(메모리가 늘거나) 하면 회귀로 표시
+DEFAULT_THRESHOLD = 0.15
+# 측정 잡음으로 보고 무시하는 차이 (초, MB)
+MIN_SECONDS_DIFF = 0.005
+MIN_MEMORY_DIFF_MB = 8.0
+
+# (결과 키, 표에 쓰는 이름, 무시하는 차이)
+METRICS = [
+    ("seconds", "time", MIN_SECONDS_DIFF),
+    ("peak_delta_mb", "memory", MIN_MEMORY_DIFF_MB),
+]
+
+
+def load_results(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _by_key(report):
+    return {(r["dataset"], r["case"]): r for r in report.get("results", []) if "error" not in r}
+
+
+def compare(base, current, threshold=DEFAULT_THRESHOLD):
+    """
+    두 결과(run_benchmarks가 저장한 JSON)에서 같은 (데이터셋, 항목)끼리 비교합니다.
+    반환: [(데이터셋, 항목, 지표 이름, 이전 값, 새 값, 비율, 상태), ...]
+    상태는 "regression", "improvement", "" 중 하나입니다.
+    """
+    old, new = _by_key(base), _by_key(current)
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        for field, name, noise in METRICS:
+            a, b = old[key].get(field), new[key].get(field)
+            if a is None or b is None:
+                continue
+            ratio = b / a if a > 0 else float("inf") if b > 0 else 1.0
+            status = ""
+            if abs(b - a) > noise:
+                if ratio > 1 + threshold:
+                    status = "regression"
+                elif ratio < 1 / (1 + threshold):
+                    status = "improvement"
+            rows.append((*key, name, a, b, ratio, status))
+    return rows
+
+
+def print_table(rows, out=sys.stdout):
+    width = max([len(f"{dataset} {case}") for dataset, case, *_ in rows] + [20])
+    for dataset, case, name, a, b, ratio, status in rows:
+        label = f"{dataset} {case}"
+        mark = {"regression": "  << REGRESSION", "improvement": "  (faster)" if name == "time" else "  (smaller)"}
+        print(f"{label:<{width}}  {name:<6} {a:>10.3f} -> {b:>10.3f}  x{ratio:5.2f}{mark.get(status, '')}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base", help="earlier result (JSON)")
+    parser.add_argument("current", help="newer result (JSON)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change reported as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+    rows = compare(load_results(args.base), load_results(args.current), args.threshold)
+    print_table(rows)
+    # 회귀가 있으면 1 (CI에서 실패로 처리할 수 있도록)
+    return 1 if any(row[-1] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,422 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from .compare import DEFAULT_THRESHOLD, compare, load_results, print_table
+from .synthetic_log import PROFILES, dataset_name, ensure_dataset, filter_terms, parse_size
+
+# 저장소 최상위 폴더 (작업자 프로세스를 여기서 -m 으로 실행)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA_DIR = os.path.join(ROOT, "benchmarks", "data")
+DEFAULT_RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# 데이터셋 크기 묶음
+PRESETS = {
+    "quick": ["10M"],
+    "standard": ["10M", "100M", "1G"],
+    "full": ["10M", "100M", "1G", "5G"],
+}
+FORMATS = ("plain", "gz")
+
+# 하이라이트/검색에 쓰는 단어 수와 검색어
+HIGHLIGHT_TERMS = 10
+SEARCH_TERM = "timeout"
+# 검색 결과 이동, 줄 이동, 다시 그리기 횟수
+FIND_STEPS = 100
+JUMPS = 200
+REPAINT_POSITIONS = 20
+# 뷰 크기 (px)
+VIEW_SIZE = (1200, 800)
+# 시작 시간 측정에서 앱이 첫 화면을 그릴 때까지 기다리는 최대 초
+STARTUP_TIMEOUT = 60
+HIGHLIGHT_COLORS = ["#ffff00", "#00ffff", "#ff00ff", "#ff8800", "#88ff00"]
+
+
+# --- 메모리 측정 (작업자 프로세스) ---
+
+def _reset_peak():
+    """최대 RSS 기록을 지금 값으로 되돌립니다. (Linux만, 안 되면 False)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _rss_mb(field):
+    """/proc/self/status의 VmRSS(현재) 또는 VmHWM(최대) 값 (MB), 없으면 None"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if field == "VmHWM":
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return None
+
+
+# --- 측정 항목 ---
+
+class BenchContext:
+    """작업자 프로세스에서 항목들이 함께 쓰는 상태 (불러온 파일, 뷰, Qt 앱)"""
+    def __init__(self, path):
+        self.path = path
+        self._manager = None
+        self._rows = None
+        self._app = None
+        self._view = None
+
+    @property
+    def manager(self):
+        if self._manager is None:
+            from widget.core_logic import LogDataManager
+            self._manager = LogDataManager()
+            self._manager.load_file(self.path)
+        return self._manager
+
+    def replace_manager(self, manager):
+        if self._manager is not None:
+            self._manager.close()
+        self._manager = manager
+        self._rows = None
+
+    @property
+    def rows(self):
+        """뷰에 보일 줄: 하이라이트 단어들로 필터한 결과 (측정하지 않고 한 번만 계산)"""
+        if self._rows is None:
+            self._rows = self.manager.get_filtered_lines(_filters(HIGHLIGHT_TERMS), [])
+        return self._rows
+
+    @property
+    def view(self):
+        if self._view is None:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            from PyQt5.QtWidgets import QApplication
+            from widget.log_view import LogView
+            self._app = QApplication.instance() or QApplication([])
+            self._view = LogView()
+            self._view.resize(*VIEW_SIZE)
+            self._view.show()
+            self._app.processEvents()
+        return self._view
+
+    def reset_view(self, rows):
+        """이전 항목이 남긴 하이라이트/검색 상태 없이 뷰에 rows를 표시합니다."""
+        view = self.view
+        view.search_matches = None
+        view.term_bitmaps = None
+        view.update_highlight_rules([])
+        view.set_log_data(self.manager.store, rows)
+        self.paint()
+        return view
+
+    def paint(self):
+        """미뤄 둔 미니맵 계산까지 끝내고 화면을 바로 다시 그립니다."""
+        view = self.view
+        if view._minimap_timer.isActive():
+            view._minimap_timer.stop()
+            view._update_minimap()
+        view.viewport().repaint()
+
+    def close(self):
+        if self._view is not None:
+            self._view.close()
+        if self._manager is not None:
+            self._manager.close()
+
+
+def _filters(count):
+    return [{"term": term, "is_case_i": False} for term in filter_terms(count)]
+
+
+def prepare_load_file(ctx):
+    from widget.core_logic import LogDataManager
+    ctx.replace_manager(None)
+    manager = LogDataManager()
+
+    def run():
+        manager.load_file(ctx.path)
+        ctx.replace_manager(manager)
+        return {"lines": manager.line_count, "max_line_length": manager.store.max_line_length}
+    return run
+
+
+def _prepare_filter(count):
+    def prepare(ctx):
+        manager = ctx.manager
+        # 단어 비트맵 캐시를 비워 매번 파일을 새로 훑도록
+        manager.match_cache.reset()
+        filters = _filters(count)
+
+        def run():
+            return {"lines": len(manager.get_filtered_lines(filters, []))}
+        return run
+    return prepare
+
+
+def prepare_set_log_data(ctx):
+    store, rows = ctx.manager.store, ctx.rows
+    view = ctx.reset_view(range(0))
+
+    def run():
+        view.set_log_data(store, rows)
+        ctx.paint()
+        return {"rows": len(rows)}
+    return run
+
+
+def prepare_rehighlight(ctx):
+    manager = ctx.manager
+    view = ctx.reset_view(ctx.rows)
+    view.term_bitmaps = manager.get_term_bitmaps
+    manager.match_cache.reset()
+    rules = [{"term": term, "is_case_i": False, "color": HIGHLIGHT_COLORS[i % len(HIGHLIGHT_COLORS)]}
+             for i, term in enumerate(filter_terms(HIGHLIGHT_TERMS))]
+    bar = view.verticalScrollBar()
+
+    def run():
+        # 규칙 적용 + 미니맵 + 뷰 곳곳에서 보이는 줄 다시 그리기
+        view.update_highlight_rules(rules)
+        for k in range(REPAINT_POSITIONS):
+            bar.setValue(bar.maximum() * k // max(1, REPAINT_POSITIONS - 1))
+            ctx.paint()
+        return {"positions": REPAINT_POSITIONS}
+    return run
+
+
+def prepare_find_next(ctx):
+    from PyQt5.QtCore import QEventLoop
+    from widget.search_engine import SearchEngine
+    store, rows = ctx.manager.store, ctx.rows
+    view = ctx.reset_view(rows)
+    engine = SearchEngine()
+    view.search_matches = engine
+    engine.match_selected.connect(view.show_match)
+    first = []
+    engine.match_selected.connect(lambda *args: first.append(time.perf_counter()) if not first else None)
+
+    def run():
+        started = time.perf_counter()
+        loop = QEventLoop()
+        engine.count_changed.connect(lambda index, total, done: loop.quit() if done else None)
+        engine.search(store, rows, SEARCH_TERM, False, False)
+        if not engine.finished:
+            loop.exec_()
+        searched = time.perf_counter()
+        for _ in range(FIND_STEPS):
+            engine.step(True)
+            ctx.paint()
+        stepped = time.perf_counter()
+        return {
+            "matches": len(engine),
+            "first_match_seconds": round(first[0] - started, 6) if first else None,
+            "step_ms": round((stepped - searched) * 1000 / FIND_STEPS, 3),
+        }
+
+    def cleanup():
+        engine.clear()
+        view.search_matches = None
+    run.cleanup = cleanup
+    return run
+
+
+def prepare_go_to_line(ctx):
+    view = ctx.reset_view(ctx.rows)
+    rng = random.Random(JUMPS)
+    targets = [rng.randint(1, ctx.manager.line_count) for _ in range(JUMPS)] if ctx.manager.line_count else []
+
+    def run():
+        started = time.perf_counter()
+        for line in targets:
+            view.go_to_line(line)
+            ctx.paint()
+        return {"jump_ms": round((time.perf_counter() - started) * 1000 / max(1, len(targets)), 3)}
+    return run
+
+
+def prepare_startup(ctx):
+    # 앱을 새 프로세스로 띄워 데이터셋을 인자로 넘기고, 첫 화면이 그려지면 바로 끝냄
+    command = [sys.executable, os.path.join(ROOT, "log_viewer.py"), "--startup-time", ctx.path]
+
+    def run():
+        proc = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, timeout=STARTUP_TIMEOUT)
+        for line in proc.stdout.splitlines():
+            if line.startswith("first paint "):
+                return {"first_paint_ms": float(line.split()[2])}
+        raise RuntimeError(f"No first paint reported: {proc.stderr.strip()[-500:]}")
+    return run
+
+
+# 항목 이름 -> 준비 함수 (측정할 함수를 반환, 준비 과정은 측정하지 않음)
+CASES = {
+    "load_file": prepare_load_file,
+    "filter_1": _prepare_filter(1),
+    "filter_10": _prepare_filter(10),
+    "filter_50": _prepare_filter(50),
+    "set_log_data": prepare_set_log_data,
+    "rehighlight": prepare_rehighlight,
+    "find_next": prepare_find_next,
+    "go_to_line": prepare_go_to_line,
+    "startup": prepare_startup,
+}
+
+
+def run_case(ctx, name, repeat):
+    """항목을 repeat번 실행해 가장 빠른 시간과 가장 큰 메모리 사용량을 기록합니다."""
+    result = {"case": name}
+    best = None
+    for _ in range(repeat):
+        run = CASES[name](ctx)
+        before = _rss_mb("VmRSS")
+        exact = _reset_peak()
+        started = time.perf_counter()
+        extra = run()
+        seconds = time.perf_counter() - started
+        peak = _rss_mb("VmHWM")
+        getattr(run, "cleanup", lambda: None)()
+        if best is None or seconds < best:
+            best = seconds
+            result.update(extra)
+        if peak is not None:
+            result["peak_rss_mb"] = round(max(peak, result.get("peak_rss_mb", 0)), 1)
+            if exact and before is not None:
+                result["peak_delta_mb"] = round(max(peak - before, result.get("peak_delta_mb", 0)), 1)
+    result["seconds"] = round(best, 6)
+    return result
+
+
+def worker_main(path, cases, repeat):
+    """작업자 프로세스: 데이터셋 하나에 대해 항목들을 차례로 측정하고 결과를 한 줄 JSON으로 출력합니다."""
+    ctx = BenchContext(path)
+    results = []
+    try:
+        for name in cases:
+            try:
+                results.append(run_case(ctx, name, repeat))
+            except Exception as e:
+                results.append({"case": name, "error": f"{type(e).__name__}: {e}"})
+    finally:
+        ctx.close()
+    print(json.dumps(results))
+    return 0
+
+
+# --- 실행기 (부모 프로세스) ---
+
+def _environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "filter_mode": os.environ.get("LOG_VIEWER_FILTER_MODE"),
+        "commit": commit,
+    }
+
+
+def _datasets(args):
+    sizes = [parse_size(s) for s in (args.sizes.split(",") if args.sizes else PRESETS[args.preset])]
+    for size in sizes:
+        for profile in args.profiles.split(","):
+            for fmt in args.formats.split(","):
+                yield size, profile, fmt == "gz"
+
+
+def run_dataset(path, cases, repeat, timeout):
+    """데이터셋 하나를 새 프로세스에서 측정합니다. (메모리 측정을 분리하고, 메모리 부족 등으로 죽어도 계속 진행)"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    command = [sys.executable, "-m", "benchmarks.run_benchmarks", "--worker", path,
+               "--cases", ",".join(cases), "--repeat", str(repeat)]
+    try:
+        proc = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return [{"case": name, "error": f"timed out after {timeout}s"} for name in cases]
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or [f"exit code {proc.returncode}"])[-1]
+        return [{"case": name, "error": error} for name in cases]
+    # 저장소 코드가 출력한 메시지 뒤의 마지막 줄이 결과
+    return json.loads(lines[-1])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="run_benchmarks",
+        description="Time the load/filter/render paths on synthetic logs and save the results as JSON.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick",
+                        help="dataset sizes: " + ", ".join(f"{k}={'/'.join(v)}" for k, v in PRESETS.items()))
+    parser.add_argument("--sizes", help="comma-separated sizes instead of the preset, e.g. 10M,250M")
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="short and/or long lines")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="plain and/or gz")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept")
+    parser.add_argument("--timeout", type=int, default=3600, help="seconds allowed per dataset")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="where generated logs are kept and reused")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", metavar="BASE", help="compare with an earlier result and flag regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    unknown = set(args.cases.split(",")) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = args.cases.split(",")
+    if args.worker:
+        return worker_main(args.worker, cases, args.repeat)
+
+    report = {"version": 1, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": _environment(),
+              "repeat": args.repeat, "results": []}
+    for size, profile, compress in _datasets(args):
+        name = dataset_name(size, profile, compress)
+        path = ensure_dataset(args.data_dir, size, profile, compress)
+        print(f"== {name}", flush=True)
+        for result in run_dataset(path, cases, args.repeat, args.timeout):
+            result = {"dataset": name, "size": size, "profile": profile, "compressed": compress, **result}
+            report["results"].append(result)
+            if "error" in result:
+                print(f"  {result['case']:<14} ERROR {result['error']}", flush=True)
+            else:
+                print(f"  {result['case']:<14} {result['seconds']:>9.3f}s  peak {result.get('peak_rss_mb', '?')} MB",
+                      flush=True)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}")
+
+    if args.compare:
+        rows = compare(load_results(args.compare), report, args.threshold)
+        print_table(rows)
+        if any(row[-1] == "regression" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
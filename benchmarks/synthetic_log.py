@@ -0,0 +1,168 @@
+import argparse
+import gzip
+import os
+import random
+import time
+
+# 같은 인자면 항상 같은 내용이 나오도록 고정한 시드
+DEFAULT_SEED = 20240501
+# 첫 줄의 시각 (2024-05-01 00:00:00, 시간대 무시)
+START_TIME = 1714521600
+# 한 번에 만들어 쓰는 줄 수
+BATCH_LINES = 20000
+# gzip 데이터셋의 압축 수준
+GZIP_LEVEL = 6
+# 미리 만들어 두고 돌려 쓰는 메시지 수
+MESSAGE_POOL = 4096
+
+LEVELS = ["V", "D", "I", "I", "I", "W", "E", "F"]
+MODULES = [
+    "modem", "kernel", "audio", "camera", "wifi", "bluetooth", "gps", "sensor",
+    "power", "thermal", "display", "input", "storage", "network", "telephony", "sms",
+    "battery", "usb", "nfc", "vibrator", "media", "codec", "surface", "window",
+    "activity", "package", "alarm", "location", "account", "sync", "backup", "dns",
+]
+WORDS = [
+    "request", "response", "timeout", "retry", "connect", "disconnect", "session", "buffer",
+    "overflow", "underrun", "frame", "packet", "queue", "thread", "handler", "callback",
+    "state", "changed", "ready", "failed", "success", "error", "warning", "invalid",
+    "config", "update", "register", "release", "acquire", "wakelock", "suspend", "resume",
+    "signal", "strength", "channel", "scan", "result", "cache", "miss", "hit",
+    "latency", "bytes", "sent", "received", "open", "close", "start", "stop",
+]
+
+# 데이터셋 종류: 짧은 줄만 / 아주 긴 줄(바이너리 덤프 등)이 섞인 로그
+PROFILES = ("short", "long")
+# 긴 줄 데이터셋에서 덤프 줄이 나오는 비율, 길이 범위 (바이트)
+LONG_LINE_RATIO = 0.02
+LONG_LINE_RANGE = (2 * 1024, 64 * 1024)
+# 가끔 나오는 매우 긴 줄 (1MB)
+HUGE_LINE_RATIO = 0.0002
+HUGE_LINE_LENGTH = 1024 * 1024
+
+_SIZE_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(text):
+    """'10M', '1.5G', '4096' 형식의 크기를 바이트로 바꿉니다."""
+    text = text.strip().upper().rstrip("B")
+    unit = _SIZE_UNITS.get(text[-1:])
+    return int(float(text[:-1]) * unit) if unit else int(text)
+
+
+def size_label(size):
+    for suffix, unit in sorted(_SIZE_UNITS.items(), key=lambda item: -item[1]):
+        if size >= unit and size % unit == 0:
+            return f"{size // unit}{suffix}"
+    return str(size)
+
+
+def filter_terms(count):
+    """필터/하이라이트에 쓸 단어 count개. 모두 생성된 로그에 나오는 단어이며, 같은 count면 항상 같은 목록입니다."""
+    pool = MODULES + WORDS
+    if count > len(pool):
+        raise ValueError(f"At most {len(pool)} terms are available")
+    return random.Random(count).sample(pool, count)
+
+
+def dataset_name(size, profile="short", compress=False, seed=DEFAULT_SEED):
+    suffix = ".log.gz" if compress else ".log"
+    seed_part = "" if seed == DEFAULT_SEED else f"-s{seed}"
+    return f"synthetic-{size_label(size)}-{profile}{seed_part}{suffix}"
+
+
+def _message_pool(rng):
+    messages = []
+    for _ in range(MESSAGE_POOL):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 14)))
+        messages.append(f"{rng.choice(LEVELS)} {rng.choice(MODULES)}: {words} id={rng.randrange(1 << 20)}")
+    return messages
+
+
+class _Clock:
+    """줄마다 0~3ms씩 늘어나는 시각을 ISO 8601 문자열로 만듭니다. (초 단위 부분은 재사용)"""
+    def __init__(self):
+        self.ms = 0
+        self.second = None
+        self.prefix = ""
+
+    def next(self, step):
+        self.ms += step
+        second, ms = divmod(self.ms, 1000)
+        if second != self.second:
+            self.second = second
+            self.prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(START_TIME + second))
+        return f"{self.prefix}.{ms:03d}"
+
+
+def iter_batches(size, profile="short", seed=DEFAULT_SEED):
+    """약 size 바이트(줄 경계에서 끊음)가 될 때까지 BATCH_LINES 줄씩 인코딩된 바이트를 돌려줍니다."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile: {profile}")
+    rng = random.Random(seed)
+    messages = _message_pool(rng)
+    # 긴 줄은 미리 만든 16진수 문자열을 잘라 씀
+    dump = "".join(f"{rng.randrange(1 << 32):08x}" for _ in range(HUGE_LINE_LENGTH // 8))
+    clock = _Clock()
+    written = 0
+    while written < size:
+        lines = []
+        for message, step, roll in zip(rng.choices(messages, k=BATCH_LINES),
+                                       rng.choices(range(4), k=BATCH_LINES),
+                                       [rng.random() for _ in range(BATCH_LINES)]):
+            line = f"{clock.next(step)} {message}"
+            if profile == "long" and roll < LONG_LINE_RATIO:
+                length = HUGE_LINE_LENGTH if roll < HUGE_LINE_RATIO else rng.randint(*LONG_LINE_RANGE)
+                start = rng.randrange(len(dump) - length + 1)
+                line = f"{line} payload={dump[start:start + length]}"
+            lines.append(line)
+        data = ("\n".join(lines) + "\n").encode("ascii")
+        if written + len(data) > size:
+            # 마지막 묶음은 크기를 넘지 않는 줄까지만 (최소 한 줄)
+            cut = data.rfind(b"\n", 0, max(1, size - written)) + 1
+            data = data[:cut or data.find(b"\n") + 1]
+        written += len(data)
+        yield data
+
+
+def generate(path, size, profile="short", compress=False, seed=DEFAULT_SEED):
+    """합성 로그 파일을 만듭니다. 쓰는 중에는 .tmp 파일에 쓰고 끝나면 이름을 바꿉니다."""
+    tmp_path = path + ".tmp"
+    try:
+        if compress:
+            f = gzip.open(tmp_path, "wb", compresslevel=GZIP_LEVEL)
+        else:
+            f = open(tmp_path, "wb")
+        with f:
+            for data in iter_batches(size, profile, seed):
+                f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def ensure_dataset(directory, size, profile="short", compress=False, seed=DEFAULT_SEED):
+    """데이터셋 파일 경로를 반환합니다. 없으면 만듭니다. (같은 이름이면 같은 내용이므로 재사용)"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, dataset_name(size, profile, compress, seed))
+    if not os.path.exists(path):
+        print(f"Generating {path} ...", flush=True)
+        generate(path, size, profile, compress, seed)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic log files.")
+    parser.add_argument("output", help="output file (.gz is compressed)")
+    parser.add_argument("--size", default="10M", help="approximate uncompressed size, e.g. 10M, 1G, 5G")
+    parser.add_argument("--profile", choices=PROFILES, default="short")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+    generate(args.output, parse_size(args.size), args.profile, args.output.lower().endswith(".gz"), args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,28 @@
+import time
+# 첫 화면까지 걸린 시간의 기준 (가져오기 시간도 포함되도록 가장 먼저 잼)
+STARTED = time.perf_counter()
+
 import sys
 import os
 from PyQt5.QtWidgets import QApplication
 from widget.main_window import MainWindow
+from widget.perf import ProfileSession, profile_directory
+
+# 첫 화면까지 걸린 시간을 출력하고 바로 끝냄 (시작 시간 측정용, 설정은 저장하지 않음)
+STARTUP_TIME_FLAG = "--startup-time"
+
+
+def print_startup_time(seconds):
+    print(f"first paint {seconds * 1000:.0f} ms", flush=True)
+    os._exit(0)
+
 
 if __name__ == "__main__":
+    # 필터 작업자 프로세스(spawn)가 빌드된 .exe에서도 동작하도록
+    # (작업자로 실행됐을 때만 필요하므로 평소에는 multiprocessing을 가져오지 않음)
+    if getattr(sys, 'frozen', False) and "--multiprocessing-fork" in sys.argv:
+        import multiprocessing
+        multiprocessing.freeze_support()
     app = QApplication(sys.argv)
 
     if getattr(sys, 'frozen', False):
@@ -22,7 +41,7 @@ if __name__ == "__main__":
         color: #e0e0e0; 
         selection-background-color: #555; /* 선택 영역 색상 */
     }
-    QLineEdit, QListWidget, QPlainTextEdit {
+    QLineEdit, QListView, QPlainTextEdit, LogView {
         background-color: #2b2b2b; 
         border: 1px solid #444; 
         border-radius: 6px; 
@@ -51,6 +70,25 @@ if __name__ == "__main__":
     QSplitter::handle:horizontal { width: 2px; }
     """)
     
-    viewer = MainWindow(base_path)
+    # 성능 분석: --profile[=폴더] 또는 LOG_VIEWER_PROFILE 환경 변수로 켜면
+    # 종료할 때 cProfile 결과와 단계별 시간 트레이스를 폴더에 저장 (버그 리포트 첨부용)
+    profile_dir = profile_directory(sys.argv, base_path)
+    session = None
+    if profile_dir is not None:
+        session = ProfileSession(profile_dir)
+        session.start()
+
+    viewer = MainWindow(base_path, started=STARTED)
+    if STARTUP_TIME_FLAG in sys.argv:
+        viewer.first_painted.connect(print_startup_time)
     viewer.show()
-    sys.exit(app.exec_())
+    # 실행 인자로 받은 파일은 설정을 불러오기 전에 바로 읽기 시작 (여러 개면 합쳐서 엶)
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith("-")]
+    if paths:
+        viewer.open_paths(paths)
+    code = app.exec_()
+    if session is not None:
+        saved = session.stop()
+        if saved:
+            print("Profile saved:", *saved)
+    sys.exit(code)
@@ -0,0 +1,10 @@
+import sys
+import multiprocessing
+from widget.batch import main
+
+if __name__ == "__main__":
+    # 필터 작업자 프로세스(spawn)가 빌드된 실행 파일에서도 동작하도록
+    multiprocessing.freeze_support()
+    # PyQt5 없이 동작 (서버/CI용)
+    # 예: python log_viewer_cli.py app.log --or ERROR --or FATAL --and modem -n
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget import batch
+
+LINES = [
+    "2024-05-01 00:00:01.000 E modem: ERROR reset 3",
+    "2024-05-01 00:00:02.000 I modem: reset done",
+    "2024-05-01 00:00:03.000 E wifi: ERROR timeout",
+    "2024-05-01 00:00:04.000 F app: FATAL crash",
+    "2024-05-01 00:00:05.000 I app: started",
+]
+
+
+class BatchTest(unittest.TestCase):
+    """헤드리스 모드의 필터 옵션, 출력 형식, 종료 코드 (grep과 같음)"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "app.log")
+        with open(self.path, "w", encoding="utf-8") as f:
+            # 마지막 줄은 줄바꿈 없이 끝남
+            f.write("\n".join(LINES))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_cli(self, *args):
+        """(종료 코드, 표준 출력 줄 목록, 표준 오류)"""
+        out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        err = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = batch.main(list(args))
+        out.flush()
+        return code, out.buffer.getvalue().decode("utf-8").splitlines(), err.getvalue()
+
+    def expect(self, args, indices):
+        code, lines, _ = self.run_cli(self.path, *args)
+        self.assertEqual((code, lines), (0 if indices else 1, [LINES[i] for i in indices]), args)
+
+    def test_terms(self):
+        self.expect(["--or", "ERROR", "--or", "FATAL"], [0, 2, 3])
+        self.expect(["--or", "ERROR", "--and", "modem"], [0])
+        self.expect(["--or", "reset", "--exclude", "done"], [0])
+        self.expect(["--exclude", "modem", "--exclude", "wifi"], [3, 4])
+        self.expect(["--or", "error", "-i", "--exclude", "MODEM"], [2])
+        self.expect(["--or", "error"], [])
+        self.expect(["--or", ""], [0, 1, 2, 3, 4])
+        self.expect([], [0, 1, 2, 3, 4])
+
+    def test_expr(self):
+        self.expect(["--expr", 'ERROR !"reset 3"'], [2])
+        self.expect(["--expr", r"/reset \d+/ | FATAL"], [0, 3])
+        self.expect(["--expr", "modem", "--expr", "time>=00:00:02"], [1])
+        self.expect(["--expr", 'time<="2024-05-01 00:00:02"'], [0, 1])
+        self.expect(["--expr", "crash", "--or", "app"], [3])
+
+    def test_config(self):
+        config = os.path.join(self.directory, "config.json")
+        with open(config, "w") as f:
+            json.dump({"or_filters": [{"term": "ERROR", "is_case_i": False, "is_checked": True},
+                                      {"term": "FATAL", "is_case_i": False, "is_checked": False}],
+                       "add_filters": []}, f)
+        self.expect(["--config", config], [0, 2])
+        self.expect(["--config", config, "--exclude", "wifi"], [0])
+
+    def test_output_format(self):
+        code, lines, _ = self.run_cli(self.path, "--or", "app", "-n")
+        self.assertEqual(code, 0)
+        self.assertEqual(lines, [f" {4:>6} | {LINES[3]}", f" {5:>6} | {LINES[4]}"])
+
+        self.assertEqual(self.run_cli(self.path, "--or", "ERROR", "-c")[:2], (0, ["2"]))
+        self.assertEqual(self.run_cli(self.path, "--or", "nothing", "-c")[:2], (1, ["0"]))
+
+        for name, read in (("out.log", open), ("out.log.gz", gzip.open)):
+            output = os.path.join(self.directory, name)
+            code, lines, _ = self.run_cli(self.path, "--or", "started", "--output", output)
+            self.assertEqual((code, lines), (0, []))
+            with read(output, "rb") as f:
+                self.assertEqual(f.read(), (LINES[4] + "\n").encode("utf-8"))
+
+    def test_merged(self):
+        other = os.path.join(self.directory, "kernel.log")
+        with open(other, "w", encoding="utf-8") as f:
+            f.write("2024-05-01 00:00:02.500 E kernel: ERROR panic\n")
+        code, lines, _ = self.run_cli(self.path, other, "--expr", "ERROR source:kernel")
+        self.assertEqual((code, lines), (0, ["2024-05-01 00:00:02.500 E kernel: ERROR panic"]))
+        code, lines, _ = self.run_cli(self.path, other, "--or", "ERROR")
+        self.assertEqual(lines, [LINES[0], "2024-05-01 00:00:02.500 E kernel: ERROR panic", LINES[2]])
+
+    def test_errors(self):
+        code, lines, err = self.run_cli(self.path, "--expr", "(ERROR")
+        self.assertEqual((code, lines), (2, []))
+        self.assertIn("Error:", err)
+
+        code, lines, err = self.run_cli(os.path.join(self.directory, "missing.log"), "--or", "ERROR")
+        self.assertEqual((code, lines), (2, []))
+        self.assertIn("Error:", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
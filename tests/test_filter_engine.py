@@ -0,0 +1,82 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget.core_logic import LogDataManager
+from widget.filter_engine import TermMatcher
+
+LINES = ["a", "bb", "", "c"]
+# 대소문자 무시 검색 결과가 str.lower()와 같아야 하는 줄 (İ, 켈빈 기호는 소문자가 ASCII가 됨)
+FOLD_LINES = ["İstanbul ok", "Kelvin 5 \u212a", "ΣΊΣΥΦΟΣ i", "plain Kid", "Привет МИР", "한글 KEY"]
+FOLD_TERMS = ["i\u0307s", "k", "ok", "σίσ", "мир", "key", "İ", "한글 k"]
+
+
+class EmptyTermTest(unittest.TestCase):
+    """빈 단어는 모든 줄에 걸려야 함 (마지막 줄바꿈 뒤를 줄로 세면 안 됨)"""
+
+    def test_matcher(self):
+        data = "".join(line + "\n" for line in LINES).encode("utf-8")
+        # 단어별 검색, 트라이 + 줄별 확인, 트라이 + 위치별 사전 확인
+        for count in (1, 20, 70):
+            keys = [("", False)] + [(f"zz{i}", i % 2 == 0) for i in range(count - 1)]
+            masks = TermMatcher(keys).match_chunk(data, len(LINES))
+            self.assertEqual(list(masks[("", False)]), [1] * len(LINES), count)
+
+    def test_manager(self):
+        directory = tempfile.mkdtemp()
+        try:
+            for name, text in (("lf.log", "\n".join(LINES) + "\n"), ("open.log", "\n".join(LINES))):
+                path = os.path.join(directory, name)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                manager = LogDataManager()
+                try:
+                    manager.load_file(path)
+                    for is_case_i in (False, True):
+                        filters = [{"term": "", "is_case_i": is_case_i}]
+                        self.assertEqual(list(manager.get_filtered_lines(filters, [])), list(range(len(LINES))), name)
+                finally:
+                    manager.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+class CaseFoldTest(unittest.TestCase):
+    """대소문자 무시 검색은 ASCII 밖 글자가 있는 줄에서도 str.lower()로 비교한 것과 같아야 함"""
+
+    def _expected(self, term):
+        return [i for i, line in enumerate(FOLD_LINES) if term.lower() in line.lower()]
+
+    def test_matcher(self):
+        data = "".join(line + "\n" for line in FOLD_LINES).encode("utf-8")
+        for count in (0, 20, 70):
+            keys = [(term, True) for term in FOLD_TERMS] + [(f"zz{i}", False) for i in range(count)]
+            masks = TermMatcher(keys).match_chunk(data, len(FOLD_LINES))
+            for term in FOLD_TERMS:
+                mask = masks.get((term, True), bytearray(len(FOLD_LINES)))
+                self.assertEqual([i for i, hit in enumerate(mask) if hit], self._expected(term), (count, term))
+
+    def test_manager(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "fold.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(FOLD_LINES) + "\n")
+            manager = LogDataManager()
+            try:
+                manager.load_file(path)
+                for term in FOLD_TERMS:
+                    filters = [{"term": term, "is_case_i": True}]
+                    self.assertEqual(list(manager.get_filtered_lines(filters, [])), self._expected(term), term)
+            finally:
+                manager.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
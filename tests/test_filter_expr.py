@@ -0,0 +1,155 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget.core_logic import LogDataManager
+from widget.filter_expr import compile_plan, filter_tree, parse, required_literal
+from widget.timestamps import parse_time_input
+
+README = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "README.md")
+
+KERNEL_LINES = [
+    "2024-05-01 00:00:00.000 E kernel: ERROR reset",
+    "2024-05-01 00:00:02.000 I kernel: link up",
+]
+APP_LINES = [
+    "2024-05-01 00:00:01.000 E app: ERROR timeout",
+    "2024-05-01 00:00:03.000 I app: started",
+]
+
+
+def expr_filters(expression):
+    """표현식 하나를 OR 목록으로 (설정 파일에 저장되는 형식)"""
+    return [{"term": expression, "kind": "expr", "is_checked": True, "is_case_i": False}]
+
+
+class SourceConditionTest(unittest.TestCase):
+    """source: 조건은 합친 뷰에서만 적용되고, 파일 하나에서는 not/OR 안에서도 결과에 영향이 없어야 함"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.kernel = self._write("kernel.log", KERNEL_LINES)
+        self.app = self._write("app.log", APP_LINES)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def _filtered(self, expression, paths):
+        manager = LogDataManager()
+        try:
+            if len(paths) > 1:
+                manager.load_files(paths)
+            else:
+                manager.load_file(paths[0])
+            return [manager.store.line(i) for i in manager.get_filtered_lines(expr_filters(expression), [])]
+        finally:
+            manager.close()
+
+    def _streamed(self, expression, path):
+        lines = []
+        tree = filter_tree(expr_filters(expression), [])
+        for first, block, mask in LogDataManager().stream_filtered(path, tree):
+            rows = block.split(b"\n")
+            lines.extend(rows[i].decode("utf-8") for i, passed in enumerate(mask) if passed)
+        return lines
+
+    def test_not_source_on_single_file(self):
+        errors = [KERNEL_LINES[0]]
+        self.assertEqual(self._filtered("ERROR !source:kernel", [self.kernel]), errors)
+        self.assertEqual(self._streamed("ERROR !source:kernel", self.kernel), errors)
+        self.assertEqual(self._filtered("!source:kernel", [self.kernel]), KERNEL_LINES)
+
+    def test_source_in_or_on_single_file(self):
+        self.assertEqual(self._filtered("ERROR | source:app", [self.kernel]), [KERNEL_LINES[0]])
+
+    def test_not_source_on_merged_view(self):
+        self.assertEqual(self._filtered("ERROR !source:kernel", [self.kernel, self.app]), [APP_LINES[0]])
+
+    def test_plan_drops_source_unless_merged(self):
+        tree = filter_tree(expr_filters("ERROR !source:kernel"), [])
+        self.assertNotIn("source", compile_plan(tree).describe())
+        self.assertIn("source", compile_plan(tree, merged=True).describe())
+
+
+class RequiredLiteralTest(unittest.TestCase):
+    """정규식 prefilter는 맞는 줄에 실제로 들어 있는 글자만 써야 함 (아니면 맞는 줄이 빠짐)"""
+
+    def test_quantifier_is_not_literal(self):
+        self.assertEqual(required_literal("a{2,500}"), "")
+        self.assertEqual(required_literal("abc{3}defg"), "defg")
+        self.assertEqual(required_literal("ab{,3}cdef"), "cdef")
+        self.assertEqual(required_literal("timeout{1}"), "timeou")
+
+    def test_escape_payload_is_not_literal(self):
+        self.assertEqual(required_literal(r"\x41bcd"), "bcd")
+        self.assertEqual(required_literal(r"\101xyz"), "xyz")
+        self.assertEqual(required_literal(r"\u00e9tude"), "tude")
+        self.assertEqual(required_literal(r"\U0001F600wxyz"), "wxyz")
+        self.assertEqual(required_literal(r"\N{LATIN SMALL LETTER A}bcd"), "bcd")
+        self.assertEqual(required_literal(r"(ab)\1cdef"), "cdef")
+        self.assertEqual(required_literal(r"json\{key"), "json{key")
+
+    def test_regex_lines_are_not_dropped(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "regex.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("aaaaa\nAbcd here\nbcd\nSxyz\n")
+            manager = LogDataManager()
+            try:
+                manager.load_file(path)
+                for expression, expected in (("/a{2,500}/", ["aaaaa"]), (r"/\x41bcd/", ["Abcd here"]),
+                                             (r"/\123xyz/", ["Sxyz"])):
+                    lines = [manager.store.line(i) for i in manager.get_filtered_lines(expr_filters(expression), [])]
+                    self.assertEqual(lines, expected, expression)
+            finally:
+                manager.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+class ReadmeExampleTest(unittest.TestCase):
+    """README의 표현식 예시는 적힌 그대로 파싱되고 필터링되어야 함"""
+
+    def setUp(self):
+        with open(README, encoding="utf-8") as f:
+            self.example = next(line.strip() for line in f if "time<=" in line)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_date_and_minutes(self):
+        self.assertEqual(parse_time_input("2024-05-01 13:00"), parse_time_input("2024-05-01 13:00:00.000"))
+        self.assertEqual(parse_time_input("2024-05-01T13:00:05.5") - parse_time_input("2024-05-01 13:00"), 5.5)
+        with self.assertRaises(ValueError):
+            parse_time_input("2024-02-30 13:00")
+
+    def test_example(self):
+        parse(self.example)
+        path = os.path.join(self.directory, "kernel.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("2024-05-01 11:00:00.000 E kernel: ERROR wifi retry 1\n"
+                    "2024-05-01 12:30:00.000 E kernel: ERROR modem Retry 3\n"
+                    "2024-05-01 12:40:00.000 E kernel: ERROR wifi link up retry 2\n"
+                    "2024-05-01 13:30:00.000 E kernel: ERROR modem retry 4\n")
+        manager = LogDataManager()
+        try:
+            manager.load_file(path)
+            self.assertEqual(list(manager.get_filtered_lines(expr_filters(self.example), [])), [1])
+        finally:
+            manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
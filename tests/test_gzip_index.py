@@ -0,0 +1,158 @@
+import gzip
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget.core_logic import LogDataManager
+from widget.gzip_index import GzipBuffer, GzipIndex, GzipReader
+from widget.index_cache import IndexCache
+from widget.parallel_filter import ParallelFilter
+
+# 체크포인트가 여러 개 생기도록 작은 간격 사용
+SPAN = 64 * 1024
+
+
+def log_bytes(count, seed=1):
+    """압축이 적당히 되는 로그 줄"""
+    rng = random.Random(seed)
+    levels = ["I", "W", "E"]
+    return "".join(f"2024-05-01 00:00:{i % 60:02d}.000 {rng.choice(levels)} app: value={rng.randrange(10 ** 6)}\n"
+                   for i in range(count)).encode("utf-8")
+
+
+class GzipReaderTest(unittest.TestCase):
+    """블록 경계 체크포인트로 끝까지 읽기, 저장했다 다시 읽은 색인으로 임의 위치 읽기"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data = log_bytes(20000)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, blob):
+        path = os.path.join(self.directory, "test.log.gz")
+        with open(path, "wb") as f:
+            f.write(blob)
+        return path
+
+    def _check(self, blob, data):
+        path = self._write(blob)
+        index = GzipIndex(SPAN)
+        reader = GzipReader(path, index)
+        try:
+            self.assertEqual(reader.read(), data)
+        finally:
+            reader.close()
+        self.assertEqual(index.size, len(data))
+
+        reader = GzipReader(path, GzipIndex.from_bytes(index.to_bytes()))
+        try:
+            rng = random.Random(2)
+            for _ in range(30):
+                start = rng.randrange(len(data))
+                reader.seek(start)
+                self.assertEqual(reader.read(5000), data[start:start + 5000])
+        finally:
+            reader.close()
+        return index
+
+    def test_levels(self):
+        for level in (1, 6, 9):
+            self.assertGreater(len(self._check(gzip.compress(self.data, level), self.data)), 1)
+
+    def test_stored_and_flushed_blocks(self):
+        noise = random.Random(3).randbytes(200000)
+        data = self.data[:300000] + noise + self.data[300000:]
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        parts = []
+        for i in range(0, len(data), 50000):
+            parts.append(compressor.compress(data[i:i + 50000]))
+            parts.append(compressor.flush(zlib.Z_FULL_FLUSH if i % 100000 else zlib.Z_SYNC_FLUSH))
+        parts.append(compressor.flush())
+        self._check(b"".join(parts), data)
+
+    def test_multiple_members(self):
+        half = len(self.data) // 2
+        blob = gzip.compress(self.data[:half]) + gzip.compress(self.data[half:]) + b"\x00" * 16
+        self._check(blob, self.data)
+
+    def test_truncated_and_corrupt(self):
+        blob = gzip.compress(self.data)
+        reader = GzipReader(self._write(blob[:len(blob) // 2]))
+        with self.assertRaises(EOFError):
+            reader.read()
+        reader.close()
+
+        corrupt = bytearray(blob)
+        corrupt[-6] ^= 1
+        reader = GzipReader(self._write(bytes(corrupt)))
+        with self.assertRaises(OSError):
+            reader.read()
+        reader.close()
+
+    def test_buffer(self):
+        path = self._write(gzip.compress(self.data))
+        index = GzipIndex(SPAN)
+        reader = GzipReader(path, index)
+        reader.read()
+        reader.close()
+        buf = GzipBuffer(path, index)
+        try:
+            self.assertEqual(len(buf), len(self.data))
+            for start, stop in ((0, 10), (SPAN * 3 + 5, SPAN * 3 + 400), (100, len(self.data)), (len(self.data) - 3, len(self.data) + 9)):
+                self.assertEqual(buf[start:stop], self.data[start:stop])
+        finally:
+            buf.close()
+
+
+class GzipIndexCacheTest(unittest.TestCase):
+    """다시 여는 .gz는 색인 캐시의 줄 오프셋과 체크포인트로 풀어 쓰지 않고 읽어야 함"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data = log_bytes(20000)
+        self.path = os.path.join(self.directory, "app.log.gz")
+        with open(self.path, "wb") as f:
+            f.write(gzip.compress(self.data))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _manager(self):
+        cache = IndexCache(os.path.join(self.directory, "cache"))
+        return LogDataManager(ParallelFilter("serial"), index_cache=cache)
+
+    def test_reopen_uses_checkpoints(self):
+        lines = self.data.decode("utf-8").splitlines()
+        filters = [{"term": "value=1", "is_case_i": False}]
+        manager = self._manager()
+        try:
+            manager.load_file(self.path)
+            self.assertTrue(manager.store.spilled)
+            expected = manager.get_filtered_lines(filters, [])
+        finally:
+            manager.close()
+
+        manager = self._manager()
+        try:
+            manager.load_file(self.path)
+            self.assertIsInstance(manager.store._buf, GzipBuffer)
+            self.assertEqual(manager.line_count, len(lines))
+            for i in (0, len(lines) // 2, len(lines) - 1):
+                self.assertEqual(manager.get_line(i), lines[i])
+            self.assertEqual(manager.get_filtered_lines(filters, []), expected)
+            self.assertEqual(list(manager.get_filtered_lines([{"term": "W app", "is_case_i": True}], [])),
+                             [i for i, line in enumerate(lines) if " w app" in line.lower()])
+        finally:
+            manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import gzip
+import io
+import os
+import random
+import shutil
+import struct
+import sys
+import tarfile
+import tempfile
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget.core_logic import open_log_source, open_merged_source
+from widget.gzip_index import GzipIndex, GzipReader
+from widget.index_cache import IndexCache, file_key
+from widget.line_store import LineIndexer
+
+# 체크포인트가 여러 개 생기도록 작은 간격 사용
+SPAN = 64 * 1024
+
+_rng = random.Random(1)
+DATA = b"".join(f"2024-05-01 00:00:{i % 60:02d}.000 I app: value={_rng.randrange(10 ** 6)}\n".encode()
+                for i in range(30000))
+
+
+def offsets_of(data):
+    indexer = LineIndexer()
+    indexer.feed(data)
+    return indexer.finish(), indexer.max_line_length
+
+
+class IndexCacheTest(unittest.TestCase):
+    """색인 캐시 파일 저장/읽기, 바뀐 파일 거부, .gz 체크포인트 함께 저장"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = IndexCache(os.path.join(self.directory, "cache"))
+        self.path = self._write("app.log", DATA)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def _entry_file(self, path):
+        return os.path.join(self.cache.directory, file_key(path)[0] + ".idx")
+
+    def test_round_trip(self):
+        offsets, longest = offsets_of(DATA)
+        times = ("iso8601", array("d", [1.0, 2.5]), True)
+        terms = {("value=1", False): (0b1010, 4), ("APP", True): (0, 30000)}
+        self.assertTrue(self.cache.save(self.path, offsets, longest, times, terms))
+
+        with open(self._entry_file(self.path), "rb") as f:
+            magic, header_size = struct.unpack("<8sI", f.read(12))
+        self.assertEqual(magic, b"LVIDX001")
+        self.assertGreater(header_size, 0)
+
+        entry = self.cache.load(self.path)
+        self.assertEqual(entry.offsets(), offsets)
+        self.assertEqual((entry.line_count, entry.max_line_length), (len(offsets) - 1, longest))
+        self.assertEqual(entry.times(), times)
+        self.assertIsNone(entry.checkpoints())
+        self.assertEqual(sorted(entry.term_keys()), sorted(terms))
+        for key, value in terms.items():
+            self.assertEqual(entry.term_bits(key), value)
+        self.assertIsNone(entry.term_bits(("other", False)))
+
+    def test_rejects_changed_file(self):
+        offsets, longest = offsets_of(DATA)
+        self.assertTrue(self.cache.save(self.path, offsets, longest))
+        self.assertIsNotNone(self.cache.load(self.path))
+
+        # 수정 시각만 바뀌어도 다른 파일로 봄
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(self.cache.load(self.path))
+
+        self.assertTrue(self.cache.save(self.path, offsets, longest))
+        with open(self.path, "ab") as f:
+            f.write(b"appended\n")
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(self.cache.load(self.path))
+        # 색인된 크기와 파일 크기가 다르면 저장하지 않음
+        self.assertFalse(self.cache.save(self.path, offsets, longest))
+
+    def test_rejects_foreign_entry(self):
+        offsets, longest = offsets_of(DATA)
+        self.assertTrue(self.cache.save(self.path, offsets, longest))
+        entry_file = self._entry_file(self.path)
+
+        # 다른 파일의 항목이 이 파일의 이름으로 놓여 있으면 (머리글의 키/크기가 다름) 거부
+        other = self._write("other.log", b"x\n")
+        self.assertTrue(self.cache.save(other, *offsets_of(b"x\n")))
+        shutil.copyfile(self._entry_file(other), entry_file)
+        self.assertIsNone(self.cache.load(self.path))
+
+        with open(entry_file, "r+b") as f:
+            f.write(b"LVIDX000")
+        self.assertIsNone(self.cache.load(self.path))
+
+    def test_gzip_checkpoints(self):
+        path = self._write("app.log.gz", gzip.compress(DATA))
+        index = GzipIndex(SPAN)
+        reader = GzipReader(path, index)
+        try:
+            offsets, longest = offsets_of(reader.read())
+        finally:
+            reader.close()
+        # 줄 오프셋은 풀어낸 내용 기준 (압축 파일 크기와는 다름)
+        self.assertTrue(self.cache.save(path, offsets, longest, checkpoints=index))
+        self.assertFalse(self.cache.save(path, offsets[:-1], longest, checkpoints=index))
+
+        entry = self.cache.load(path)
+        self.assertEqual(entry.offsets(), offsets)
+        restored = GzipIndex.from_bytes(entry.checkpoints())
+        self.assertEqual((restored.size, len(restored)), (len(DATA), len(index)))
+        self.assertGreater(len(restored), 2)
+
+        # 저장해 둔 체크포인트에서 임의 줄 읽기
+        reader = GzipReader(path, restored)
+        try:
+            for line in (0, 1, 12345, 25000, len(offsets) - 2):
+                start, end = offsets[line], offsets[line + 1]
+                reader.seek(start)
+                self.assertEqual(reader.read(end - start), DATA[start:end])
+        finally:
+            reader.close()
+
+    def test_cache_key(self):
+        # 일반 파일과 .gz는 사용자가 연 파일, 아카이브 멤버와 합친 뷰는 캐시하지 않음
+        gz = self._write("app.log.gz", gzip.compress(DATA))
+        tar = os.path.join(self.directory, "logs.tar.gz")
+        with tarfile.open(tar, "w:gz") as archive:
+            info = tarfile.TarInfo("app.log")
+            info.size = len(DATA)
+            archive.addfile(info, io.BytesIO(DATA))
+
+        for path, expected in ((self.path, self.path), (gz, gz), (tar, None)):
+            source = open_log_source(path)
+            try:
+                self.assertEqual(source.cache_path, expected, path)
+            finally:
+                source.close()
+        source = open_log_source(gz)
+        try:
+            self.assertIsNone(source.path)
+            self.assertIsInstance(source.checkpoints, GzipIndex)
+        finally:
+            source.close()
+        merged = open_merged_source([self.path, gz])
+        try:
+            self.assertIsNone(merged.cache_path)
+        finally:
+            merged.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget.core_logic import LogDataManager
+from widget.line_store import LineIndexer, LineStore
+
+
+def index(data, piece):
+    """data를 piece 바이트씩 나눠 색인한 (오프셋 목록, 가장 긴 줄 길이)"""
+    indexer = LineIndexer()
+    for i in range(0, len(data), piece):
+        indexer.feed(data[i:i + piece])
+    return list(indexer.finish()), indexer.max_line_length
+
+
+class LineIndexerTest(unittest.TestCase):
+    """덩어리를 어디서 나눠 받아도 줄 오프셋과 (줄바꿈을 뺀) 가장 긴 줄 길이가 같아야 함"""
+
+    def test_pieces(self):
+        data = b"first\nsecond line\r\n\nlast"
+        for piece in (1, 2, 3, 7, len(data)):
+            self.assertEqual(index(data, piece), ([0, 6, 19, 20, 24], 12), piece)
+
+    def test_trailing_newline(self):
+        self.assertEqual(index(b"a\nbb\n", 2), ([0, 2, 5], 2))
+        self.assertEqual(index(b"\n", 1), ([0, 1], 0))
+        self.assertEqual(index(b"", 1), ([0], 0))
+
+    def test_take(self):
+        indexer = LineIndexer()
+        indexer.feed(b"a\nb")
+        self.assertEqual(list(indexer.take()), [2])
+        indexer.feed(b"c\nd\n")
+        self.assertEqual(list(indexer.take()), [5, 7])
+        self.assertEqual(list(indexer.take()), [])
+
+
+class LineStoreTest(unittest.TestCase):
+    """줄 텍스트는 줄바꿈(\\n, \\r\\n) 없이 나오고, 범위 밖 줄 번호는 IndexError"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_line_endings(self):
+        for data in (b"one\r\ntwo\r\nthree", b"one\ntwo\r\nthree\n", b"one\r\ntwo\nthree\r\n"):
+            store = LineStore.from_bytes(data)
+            self.assertEqual(store.lines(range(len(store))), ["one", "two", "three"], data)
+
+    def test_file_without_trailing_newline(self):
+        manager = LogDataManager()
+        try:
+            manager.load_file(self._write("open.log", "한글\r\nend".encode("utf-8")))
+            self.assertEqual(manager.line_count, 2)
+            self.assertEqual(manager.get_lines([0, 1]), ["한글", "end"])
+        finally:
+            manager.close()
+
+    def test_empty_file(self):
+        manager = LogDataManager()
+        try:
+            manager.load_file(self._write("empty.log", b""))
+            self.assertEqual(manager.line_count, 0)
+            with self.assertRaises(IndexError):
+                manager.get_line(0)
+        finally:
+            manager.close()
+
+    def test_out_of_range(self):
+        store = LineStore.from_bytes(b"a\nb\n")
+        self.assertEqual(store.line(-1), "b")
+        self.assertEqual(store.line(-2), "a")
+        for i in (2, 3, -3):
+            with self.assertRaises(IndexError):
+                store.line(i)
+
+    def test_follow_partial_last_line(self):
+        # 따라가기: 줄바꿈 없는 마지막 줄을 빼 두었다가 이어 쓰인 내용과 합쳐 다시 받음
+        path = self._write("follow.log", b"a\nb")
+        manager = LogDataManager()
+        try:
+            manager.load_file(path)
+            self.assertEqual(manager.get_lines([0, 1]), ["a", "b"])
+            self.assertEqual(manager.reopen_last_line(), 1)
+            self.assertEqual(manager.line_count, 1)
+            self.assertIsNone(manager.reopen_last_line())
+
+            position = manager.store.offsets[-1]
+            indexer = LineIndexer(array("q", [position]), position)
+            with open(path, "ab") as f:
+                f.write(b"c\nd")
+            with open(path, "rb") as f:
+                f.seek(position)
+                indexer.feed(f.read())
+            self.assertEqual(manager.append_lines(indexer.take(), indexer.size, indexer.max_line_length), (1, 2))
+            self.assertEqual(manager.get_lines([0, 1]), ["a", "bc"])
+            self.assertEqual(manager.line_count, 2)
+        finally:
+            manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
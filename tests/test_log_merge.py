@@ -0,0 +1,85 @@
+import io
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget import log_merge
+from widget.core_logic import LogSource
+from widget.log_merge import MergedSource, merge_names
+
+
+def source(lines, newline=True):
+    data = "\n".join(lines).encode("utf-8") + (b"\n" if newline else b"")
+    return LogSource(io.BytesIO(data), len(data))
+
+
+def stamp(seconds, text):
+    return f"2024-05-01 00:{seconds // 60:02d}:{seconds % 60:02d}.000 {text}"
+
+
+def merge(*sources, size=1024 * 1024):
+    merged = MergedSource(list(sources), [f"s{i}" for i in range(len(sources))])
+    parts = []
+    while True:
+        data = merged.read(size)
+        if not data:
+            break
+        parts.append(data)
+    merged.close()
+    return b"".join(parts).decode("utf-8").split("\n")[:-1], list(merged.tags)
+
+
+class MergedSourceTest(unittest.TestCase):
+    """여러 원본을 시각 순서로 합치고, 같은 시각은 먼저 지정한 원본이 앞, 시각 없는 줄은 앞 줄을 따라감"""
+
+    def setUp(self):
+        # 덩어리 경계(확정 시각)를 여러 번 지나도록 작게 읽음
+        self.read_size = log_merge.MERGE_READ_SIZE
+        log_merge.MERGE_READ_SIZE = 64
+
+    def tearDown(self):
+        log_merge.MERGE_READ_SIZE = self.read_size
+
+    def test_order_and_tags(self):
+        a = [stamp(1, "a1"), stamp(4, "a4"), "  at frame", stamp(9, "a9")]
+        b = [stamp(2, "b2"), stamp(3, "b3"), stamp(10, "b10")]
+        lines, tags = merge(source(a), source(b))
+        self.assertEqual(lines, [a[0], b[0], b[1], a[1], a[2], a[3], b[2]])
+        self.assertEqual(tags, [0, 1, 1, 0, 0, 0, 1])
+
+    def test_ties_follow_source_order(self):
+        a = [stamp(5, "a"), stamp(5, "a again")]
+        b = [stamp(5, "b"), stamp(6, "b late")]
+        c = [stamp(5, "c")]
+        lines, tags = merge(source(c), source(a), source(b))
+        self.assertEqual(tags, [0, 1, 1, 2, 2])
+        self.assertEqual(lines, c + a + b)
+
+    def test_leading_lines_and_missing_newline(self):
+        # 형식은 원본마다 첫 덩어리에서 판단하므로 한 번에 읽음
+        log_merge.MERGE_READ_SIZE = self.read_size
+        a = ["banner without time", stamp(3, "a3")]
+        b = [stamp(1, "b1"), stamp(2, "b2")]
+        lines, tags = merge(source(a, newline=False), source(b))
+        self.assertEqual(lines, [a[0], b[0], b[1], a[1]])
+        self.assertEqual(tags, [0, 1, 1, 0])
+
+    def test_random(self):
+        rng = random.Random(4)
+        inputs = [sorted(rng.sample(range(3000), 300)) for _ in range(4)]
+        sources = [source([stamp(s, f"{i}:{n}") for n, s in enumerate(seconds)]) for i, seconds in enumerate(inputs)]
+        lines, tags = merge(*sources, size=500)
+        expected = sorted(((s, i, n) for i, seconds in enumerate(inputs) for n, s in enumerate(seconds)))
+        self.assertEqual(lines, [stamp(s, f"{i}:{n}") for s, i, n in expected])
+        self.assertEqual(tags, [i for _, i, _ in expected])
+
+    def test_names(self):
+        self.assertEqual(merge_names(["/x/app.log", "/y/app.log", "/y/kernel.log"]),
+                         [os.path.join("x", "app.log"), os.path.join("y", "app.log"), "kernel.log"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widget.line_store import LineStore
+from widget.timestamps import NO_TIME, TimestampIndex, detect_format, parse_time_input
+
+# 형식별 예시 줄 (모두 12:00:01.25, kernel은 부팅 후 경과 초, epoch는 2024-05-01 UTC)
+SAMPLES = {
+    "iso8601": b"2024-05-01 12:00:01.250 I app: started",
+    "logcat": b"05-01 12:00:01.250  1234  1250 I app: started",
+    "syslog": b"May  1 12:00:01 host app[12]: started",
+    "kernel": b"[   43201.250000] usb 1-1: new device",
+    "epoch": b"1714564801.25 app started",
+}
+
+
+def build(lines):
+    return LineStore.from_bytes(b"".join(line + b"\n" for line in lines))
+
+
+class DetectFormatTest(unittest.TestCase):
+    """앞쪽 줄의 절반 이상이 맞는 형식을 고르고, 없으면 None"""
+
+    def test_formats(self):
+        for name, line in SAMPLES.items():
+            fmt = detect_format([line, b"  at stack frame", b"", line])
+            self.assertEqual(fmt.name if fmt else None, name)
+
+    def test_values(self):
+        iso = detect_format([SAMPLES["iso8601"]])
+        self.assertEqual(iso.parse(SAMPLES["iso8601"]) % 86400, 12 * 3600 + 1.25)
+        self.assertEqual(detect_format([SAMPLES["kernel"]]).parse(SAMPLES["kernel"]), 43201.25)
+        self.assertEqual(detect_format([SAMPLES["epoch"]]).parse(SAMPLES["epoch"]), 1714564801.25)
+
+    def test_not_enough(self):
+        self.assertIsNone(detect_format([b"no time here", b"nor here", SAMPLES["iso8601"]]))
+        self.assertIsNone(detect_format([b"", b"  "]))
+
+
+class TimestampIndexTest(unittest.TestCase):
+    """타임스탬프 없는 줄은 앞 줄의 시각을 따르고, 오름차순 여부는 덩어리 경계까지 확인"""
+
+    def test_inherit_previous(self):
+        store = build([b"banner", b"2024-05-01 00:00:01.000 a", b"  at frame", b"2024-05-01 00:00:03.500 b"])
+        index = TimestampIndex()
+        index.extend(store)
+        base = parse_time_input("2024-05-01 00:00")
+        self.assertEqual(index.fmt.name, "iso8601")
+        self.assertEqual(list(index.times), [NO_TIME, base + 1, base + 1, base + 3.5])
+        self.assertTrue(index.monotonic)
+        self.assertEqual(index.first_time, base + 1)
+        # 시각이 1초 이상 2초 이하인 줄: 1, 2번 줄 (0번 비트 = 0번 줄)
+        self.assertEqual(index.range_bits(base + 1, base + 2, 0, 4), 0b0110)
+        self.assertEqual(index.range_bits(base + 1, base + 2, 2, 4), 0b01)
+
+    def test_no_format(self):
+        index = TimestampIndex()
+        index.extend(build([b"plain", b"text"]))
+        self.assertIsNone(index.fmt)
+        self.assertEqual(list(index.times), [NO_TIME, NO_TIME])
+        self.assertIsNone(index.first_time)
+
+    def test_monotonic(self):
+        lines = [f"2024-05-01 00:00:0{s}.000 x".encode() for s in (1, 2, 2, 5)]
+        index = TimestampIndex()
+        index.extend(build(lines))
+        self.assertTrue(index.monotonic)
+
+        index = TimestampIndex()
+        index.extend(build(lines + [b"2024-05-01 00:00:03.000 late", b"2024-05-01 00:00:09.000 y"]))
+        self.assertFalse(index.monotonic)
+        base = parse_time_input("2024-05-01 00:00")
+        self.assertEqual(index.range_bits(base + 3, base + 4, 0, 6), 0b010000)
+
+    def test_monotonic_across_extend(self):
+        # 앞 덩어리의 마지막 시각보다 이른 줄이 다음 덩어리 첫 줄이면 어긋난 것
+        lines = [b"2024-05-01 00:00:05.000 a", b"2024-05-01 00:00:06.000 b", b"2024-05-01 00:00:04.000 c"]
+        store = build(lines)
+        index = TimestampIndex()
+        index.extend(store, 2)
+        self.assertTrue(index.monotonic)
+        index.extend(store)
+        self.assertEqual(len(index), 3)
+        self.assertFalse(index.monotonic)
+
+        index.truncate(2)
+        self.assertEqual(len(index), 2)
+
+    def test_time_input(self):
+        day = parse_time_input("2024-05-01 00:00")
+        self.assertEqual(parse_time_input("12:03", day + 500), day + 12 * 3600 + 180)
+        self.assertEqual(parse_time_input("12:03:10.25"), 12 * 3600 + 190.25)
+        self.assertEqual(parse_time_input("2024-05-01 12:03:10.250"), day + 12 * 3600 + 190.25)
+        for text in ("noon", "25:99x", ""):
+            with self.assertRaises(ValueError):
+                parse_time_input(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
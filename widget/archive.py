@@ -0,0 +1,211 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .gzip_index import open_indexed
+
+# 압축을 풀어 둔 멤버 캐시의 디스크 사용 한도 (바이트)
+ARCHIVE_CACHE_BUDGET = 2 * 1024 * 1024 * 1024
+
+
+# bz2, lzma, zipfile, tarfile(과 tempfile, shutil)은 아카이브를 처음 열 때 가져옴 (시작 시간 단축)
+def _bz2_open(path, mode):
+    import bz2
+    return bz2.open(path, mode)
+
+
+def _lzma_open(path, mode):
+    import lzma
+    return lzma.open(path, mode)
+
+
+# tar 아카이브로 보는 확장자 (.tar.gz 등은 .gz보다 먼저 확인해야 함)
+TAR_OPENERS = {
+    ".tar": open,
+    # gzip은 체크포인트 색인으로 멤버 위치까지 가까운 곳에서부터 풂
+    ".tar.gz": open_indexed, ".tgz": open_indexed,
+    ".tar.bz2": _bz2_open, ".tbz2": _bz2_open, ".tbz": _bz2_open,
+    ".tar.xz": _lzma_open, ".txz": _lzma_open,
+}
+
+
+def _tar_opener(path):
+    name = path.lower()
+    for suffix, opener in TAR_OPENERS.items():
+        if name.endswith(suffix):
+            return opener
+    return None
+
+
+def archive_kind(path):
+    """여러 파일이 들어 있는 아카이브면 "zip" 또는 "tar", 아니면 None을 반환합니다."""
+    if path.lower().endswith(".zip"):
+        return "zip"
+    if _tar_opener(path) is not None:
+        return "tar"
+    return None
+
+
+class ArchiveMember:
+    """아카이브 안의 파일 하나 (압축 해제 없이 목록에서 읽은 정보)"""
+    def __init__(self, name, size, offset=0):
+        self.name = name
+        self.size = size
+        # tar: (압축 해제된) 스트림에서 내용이 시작되는 위치
+        self.offset = offset
+
+
+def list_members(path):
+    """
+    아카이브의 파일 목록을 만듭니다.
+    zip은 끝의 중앙 디렉터리만 읽고, tar는 헤더만 따라가며 내용은 건너뜁니다.
+    (압축된 tar는 중앙 디렉터리가 없어 목록을 만들 때 한 번은 끝까지 풀어야 함,
+     .tar.gz는 이때 만든 체크포인트로 이후 멤버를 열 때 처음부터 다시 풀지 않음)
+    """
+    if archive_kind(path) == "zip":
+        import zipfile
+        with zipfile.ZipFile(path, "r") as zf:
+            return [ArchiveMember(info.filename, info.file_size)
+                    for info in zf.infolist() if not info.is_dir()]
+
+    import tarfile
+    stream = _tar_opener(path)(path, "rb")
+    try:
+        with tarfile.open(fileobj=stream, mode="r:") as tf:
+            return [ArchiveMember(m.name, m.size, m.offset_data) for m in tf if m.isfile()]
+    finally:
+        stream.close()
+
+
+class _MemberReader:
+    """스트림에서 멤버 크기만큼만 읽게 하는 래퍼 (tar 멤버용)"""
+    def __init__(self, stream, size):
+        self.stream = stream
+        self.remaining = size
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size) if size else b""
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.stream.close()
+
+
+def open_member(path, member):
+    """멤버 하나의 압축 해제 스트림을 엽니다. 다른 멤버는 풀지 않습니다."""
+    if archive_kind(path) == "zip":
+        import zipfile
+        with zipfile.ZipFile(path, "r") as zf:
+            # ZipFile을 닫아도 열린 멤버 스트림은 유효함
+            return zf.open(member.name, "r")
+
+    stream = _tar_opener(path)(path, "rb")
+    try:
+        # 일반 tar는 바로 이동, 압축된 tar는 앞부분을 풀면서 이동
+        stream.seek(member.offset)
+    except Exception:
+        stream.close()
+        raise
+    return _MemberReader(stream, member.size)
+
+
+class MemberCache:
+    """
+    열어 본 아카이브 멤버의 압축 해제본을 임시 폴더에 보관하는 캐시.
+    - 한 번 끝까지 읽은 멤버는 다시 열 때 일반 파일처럼 바로 mmap합니다.
+    - 디스크 사용량이 한도를 넘으면 가장 오래 쓰지 않은 멤버부터 지웁니다(LRU).
+    - 로딩 스레드와 GUI 스레드에서 함께 쓰므로 잠금으로 보호합니다.
+    """
+    def __init__(self, budget=ARCHIVE_CACHE_BUDGET):
+        self.budget = budget
+        self._dir = None
+        self._lock = threading.Lock()
+        # 키 -> (파일 경로, 크기)
+        self._entries = OrderedDict()
+        # 아직 다 풀지 못한(로딩 중이거나 취소된) 파일 경로
+        self._pending = set()
+        # (아카이브 경로, 수정 시각) -> 멤버 목록
+        self._listings = {}
+
+    @staticmethod
+    def key(path, member):
+        return os.path.abspath(path), os.path.getmtime(path), member.name
+
+    def members(self, path):
+        """아카이브 목록 (같은 아카이브는 다시 읽지 않음)"""
+        listing_key = (os.path.abspath(path), os.path.getmtime(path))
+        with self._lock:
+            members = self._listings.get(listing_key)
+        if members is None:
+            members = list_members(path)
+            with self._lock:
+                self._listings[listing_key] = members
+        return members
+
+    def get(self, key):
+        """다 풀어 둔 멤버 파일 경로 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def reserve(self):
+        """멤버를 풀어 쓸 새 파일 경로를 만듭니다."""
+        with self._lock:
+            import tempfile
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix="log_viewer_archive_")
+            fd, path = tempfile.mkstemp(suffix=".log", dir=self._dir)
+            os.close(fd)
+            self._pending.add(path)
+            return path
+
+    def commit(self, key, path, size):
+        """멤버를 끝까지 풀었으면 캐시에 등록하고, 한도를 넘은 만큼 오래된 멤버를 지웁니다."""
+        with self._lock:
+            self._pending.discard(path)
+            old = self._entries.pop(key, None)
+            self._entries[key] = (path, size)
+            if old is not None and old[0] != path:
+                self._remove(old[0])
+            usage = sum(size for _, size in self._entries.values())
+            for old_key in list(self._entries):
+                if usage <= self.budget or old_key == key:
+                    break
+                old_path, old_size = self._entries[old_key]
+                if self._remove(old_path):
+                    del self._entries[old_key]
+                    usage -= old_size
+
+    def release(self, path):
+        """저장소가 파일을 닫을 때 호출: 끝까지 풀지 못한 파일이면 지웁니다."""
+        with self._lock:
+            if path in self._pending:
+                self._pending.discard(path)
+                self._remove(path)
+
+    def clear(self):
+        """캐시 폴더를 통째로 지웁니다. (앱 종료 시)"""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._listings.clear()
+            if self._dir is not None:
+                import shutil
+                shutil.rmtree(self._dir, ignore_errors=True)
+                self._dir = None
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError as e:
+            # Windows에서는 아직 mmap으로 열려 있으면 지울 수 없음 (다음 기회에 다시 시도)
+            print(f"Error removing cached member: {e}")
+            return False
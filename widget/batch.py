@@ -0,0 +1,135 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+from itertools import compress
+
+from .core_logic import LogDataManager
+from .filter_expr import FilterSyntaxError, compile_plan, filter_tree, parse, term_node
+
+# --output를 .gz로 지정했을 때의 압축 수준 (속도 우선)
+OUTPUT_GZIP_LEVEL = 6
+
+
+def load_filter_config(path):
+    """
+    저장된 설정 파일(.log_viewer_config.json)의 필터 트리를 읽습니다. (필터가 없으면 None)
+    트리가 없는 예전 설정은 켜져 있는 OR/AND 항목으로 만듭니다.
+    """
+    with open(path, "r") as f:
+        config = json.load(f)
+    if "filter" in config:
+        return config["filter"]
+
+    def active(items):
+        return [item for item in items if item.get("term") and item.get("is_checked", True)]
+    return filter_tree(active(config.get("or_filters", [])), active(config.get("add_filters", [])))
+
+
+def build_tree(args):
+    """설정 파일, --or/--and, --exclude, --expr 조건을 모두 만족하는 트리 (조건이 없으면 None)"""
+    parts = [load_filter_config(args.config)] if args.config else []
+
+    def terms(values):
+        return [{"term": term, "is_case_i": args.ignore_case} for term in values]
+    parts.append(filter_tree(terms(args.or_terms), terms(args.and_terms)))
+    parts += [{"op": "not", "child": term_node(term, args.ignore_case)} for term in args.exclude_terms]
+    parts += [parse(text, args.ignore_case) for text in args.expressions]
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else {"op": "and", "children": parts}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="log_viewer_cli",
+        description="Filter log files without the GUI (same filter rules as Log Viewer).")
+    parser.add_argument("files", nargs="+", help="log files or archives (several files are merged by timestamp)")
+    parser.add_argument("--or", dest="or_terms", action="append", default=[], metavar="TERM",
+                        help="OR filter term (repeatable)")
+    parser.add_argument("--and", dest="and_terms", action="append", default=[], metavar="TERM",
+                        help="AND filter term (repeatable)")
+    parser.add_argument("--exclude", dest="exclude_terms", action="append", default=[], metavar="TERM",
+                        help="drop lines containing TERM (repeatable)")
+    parser.add_argument("--expr", dest="expressions", action="append", default=[], metavar="EXPR",
+                        help='filter expression, e.g. \'ERROR (modem | wifi) !"link up" /retry \\d+/i time>=12:00\' '
+                             "(repeatable, all must match)")
+    parser.add_argument("-i", "--ignore-case", action="store_true",
+                        help="match --or/--and/--exclude/--expr terms case-insensitively")
+    parser.add_argument("--config", metavar="FILE",
+                        help="use the checked filters of a saved .log_viewer_config.json")
+    parser.add_argument("--explain", action="store_true", help="print the compiled filter plan to stderr")
+    parser.add_argument("--member", help="archive member to read (default: first file)")
+    parser.add_argument("-n", "--line-number", action="store_true", help="prefix lines like the GUI export")
+    parser.add_argument("-c", "--count", action="store_true", help="print only the number of matching lines")
+    parser.add_argument("--output", metavar="FILE", help="write to FILE instead of stdout (.gz is compressed)")
+    return parser.parse_args(argv)
+
+
+def _open_output(path):
+    if path is None:
+        return sys.stdout.buffer
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "wb", compresslevel=OUTPUT_GZIP_LEVEL)
+    return open(path, "wb")
+
+
+def main(argv=None):
+    """
+    헤드리스 모드: 파일을 덩어리 단위로 읽으며 필터를 통과한 줄(또는 개수)을 씁니다.
+    반환 값은 grep과 같음 (0: 걸린 줄 있음, 1: 없음, 2: 오류)
+    """
+    args = parse_args(argv)
+    try:
+        tree = build_tree(args)
+    except FilterSyntaxError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.explain:
+        plan = compile_plan(tree, merged=len(args.files) > 1)
+        print(f"plan: {plan.describe() if plan is not None else 'all'}", file=sys.stderr)
+    paths = args.files if len(args.files) > 1 else args.files[0]
+
+    manager = LogDataManager()
+    out = None
+    matched = 0
+    try:
+        out = _open_output(None if args.count else args.output)
+        for first, block, mask in manager.stream_filtered(paths, tree, args.member):
+            count = mask.count(1)
+            matched += count
+            if args.count or not count:
+                continue
+            if count == len(mask) and not args.line_number:
+                # 덩어리 전체가 통과하면 줄로 나누지 않고 그대로 씀
+                out.write(block)
+                continue
+            lines = block.split(b"\n")
+            if args.line_number:
+                out.write(b"".join(
+                    b" %6d | %s\n" % (first + i + 1, lines[i]) for i in compress(range(len(mask)), mask)))
+            else:
+                selected = list(compress(lines, mask))
+                selected.append(b"")
+                out.write(b"\n".join(selected))
+        if args.count:
+            out.write(b"%d\n" % matched)
+        out.flush()
+    except BrokenPipeError:
+        # | head 등으로 출력이 먼저 닫힘 (종료 시 다시 쓰다 오류가 나지 않도록 버림)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if out is not None and out is not sys.stdout.buffer:
+            out.close()
+        manager.close()
+    return 0 if matched else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
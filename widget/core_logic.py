@@ -1,10 +1,20 @@
 import json
 import os
 import re
-import gzip
-import zipfile
-import tarfile
-from io import TextIOWrapper
+from array import array
+from bisect import bisect_left, bisect_right
+from io import BytesIO
+
+from .archive import MemberCache, archive_kind, list_members, open_member
+from .filter_engine import FILTER_CHUNK_SIZE, FilterCancelled
+from .filter_expr import FilterEngine, StoreContext, compile_plan, filter_tree, resolve_time_range
+from .gzip_index import GzipIndex, GzipReader
+from .line_store import LineStore
+from .log_merge import MergedSource, merge_names
+from .match_cache import MatchCache, bits_to_indices, pack_mask
+from .parallel_filter import ParallelFilter
+from .perf import recorder
+from .timestamps import TimestampIndex
 
 class SettingsManager:
     """설정을 JSON 파일로 저장하고 불러오는 클래스"""
@@ -31,133 +41,517 @@ class SettingsManager:
         except Exception as e:
             print(f"Error saving config: {e}")
 
+class LogSource:
+    """
+    로그 원본의 바이트 스트림. 일반 파일이면 path가 있고(mmap 대상),
+    압축 파일이면 path가 None이며 읽은 내용을 임시 파일에 풀어 씁니다.
+    """
+    def __init__(self, stream, total, path=None, raw=None, spill_path=None, on_complete=None, release=None):
+        self.stream = stream
+        self.total = total          # 진행률 계산용 전체 크기
+        self.path = path
+        self._raw = raw             # 진행률 위치를 읽을 원본 파일 (.gz는 압축된 위치 기준)
+        # 아카이브 멤버: 풀어 쓸 캐시 파일, 끝까지 읽었을 때 호출할 함수, 저장소가 닫을 때 파일 정리 함수
+        self.spill_path = spill_path
+        self.on_complete = on_complete
+        self.release = release
+        # 여러 파일을 합친 원본만 사용 (원본 이름 목록, 줄마다 원본 번호)
+        self.names = None
+        self.tags = None
+        # 디스크 색인 캐시의 키가 되는 원본 파일 (사용자가 연 일반 파일과 .gz 파일, 그 외 None)
+        self.cache_path = path
+        # .gz: 읽으면서 채우는 체크포인트 색인 (GzipIndex, 색인 캐시에 함께 저장 - 캐시에서 찾으면 저장해 둔 색인)
+        self.checkpoints = None
+        self._done = 0
+
+    def read(self, size):
+        """최대 size 바이트를 읽습니다."""
+        if self.path is not None:
+            # 열 때의 크기까지만 읽음 (mmap 범위와 일치)
+            size = min(size, self.total - self._done)
+            if size <= 0:
+                return b""
+        data = self.stream.read(size)
+        self._done += len(data)
+        if not data and self.on_complete is not None and self._done == self.total:
+            # 끝까지 풀어 쓴 멤버만 캐시에 등록 (앞의 덩어리는 이미 파일에 쓰인 상태)
+            on_complete, self.on_complete = self.on_complete, None
+            on_complete()
+        return data
+
+    @property
+    def position(self):
+        """진행률 계산용 현재 위치 (total 기준)"""
+        if self._raw is not None:
+            return self._raw.tell()
+        return self._done
+
+    def close(self):
+        self.stream.close()
+        if self._raw is not None:
+            self._raw.close()
+
+
+def open_log_source(path, member=None, cache=None):
+    """
+    파일 확장자를 보고 로그 원본을 엽니다.
+    .zip, .tar(.gz/.tgz/.bz2/.xz)는 멤버 하나(member, 없으면 첫 파일)만 풀어 읽고,
+    .gz는 압축을 해제하는 스트림, 그 외는 일반 파일로 엽니다.
+    cache: 풀어 둔 멤버를 재사용할 MemberCache (없으면 매번 새로 풂)
+    """
+    kind = archive_kind(path)
+    if kind is not None:
+        members = cache.members(path) if cache is not None else list_members(path)
+        if not members:
+            return _message_source(f"Error: {kind.upper()} file contains no files.\n")
+        target = next((m for m in members if m.name == member), members[0])
+        return _member_source(path, target, cache)
+
+    # 파일 확장자 확인 (.tar.gz는 위에서 아카이브로 처리됨)
+    _, ext = os.path.splitext(path)
+
+    if ext == '.gz':
+        # 읽으면서 체크포인트 색인을 채움 (색인 캐시에 줄 오프셋과 함께 저장)
+        reader = GzipReader(path)
+        total = os.fstat(reader.raw.fileno()).st_size
+        source = LogSource(reader, total, raw=reader.raw)
+        # 색인 캐시는 압축 파일로 찾음 (줄 오프셋은 풀어낸 내용 기준)
+        source.cache_path = path
+        source.checkpoints = reader.index
+        return source
+
+    f = open(path, 'rb')
+    return LogSource(f, os.fstat(f.fileno()).st_size, path=path)
+
+
+def cached_offsets(source, index_cache):
+    """
+    디스크 색인 캐시에 저장해 둔 같은 파일의 (줄 오프셋, 최대 줄 길이). 없으면 None.
+    일반 파일과 .gz 파일이 해당합니다. (아카이브 멤버, 합친 뷰는 캐시하지 않음)
+    .gz는 저장해 둔 체크포인트 색인을 source.checkpoints에 넣어, 저장소가 내용을 다시 풀어 쓰지 않게 합니다.
+    """
+    if index_cache is None or source.cache_path is None:
+        return None
+    entry = index_cache.load(source.cache_path)
+    if entry is None:
+        return None
+    try:
+        if source.checkpoints is not None:
+            data = entry.checkpoints()
+            if data is None:
+                return None
+            source.checkpoints = GzipIndex.from_bytes(data)
+        return entry.offsets(), entry.max_line_length
+    except (OSError, ValueError) as e:
+        print(f"Error reading index cache: {e}")
+        return None
+
+
+def open_merged_source(paths):
+    """여러 파일을 타임스탬프 순서로 합쳐 읽는 원본을 엽니다."""
+    sources = []
+    try:
+        for path in paths:
+            sources.append(open_log_source(path))
+        return MergedSource(sources, merge_names(paths))
+    except Exception:
+        for source in sources:
+            source.close()
+        raise
+
+
+def _member_source(path, member, cache):
+    """아카이브 멤버의 원본. 캐시에 풀어 둔 파일이 있으면 일반 파일처럼 엽니다."""
+    if cache is None:
+        return LogSource(open_member(path, member), member.size)
+
+    key = cache.key(path, member)
+    cached = cache.get(key)
+    if cached is not None:
+        f = open(cached, 'rb')
+        source = LogSource(f, os.fstat(f.fileno()).st_size, path=cached)
+        # 풀어 둔 파일은 세션이 끝나면 지워지므로 색인 캐시에 남기지 않음
+        source.cache_path = None
+        return source
+
+    spill_path = cache.reserve()
+    try:
+        stream = open_member(path, member)
+    except Exception:
+        cache.release(spill_path)
+        raise
+    return LogSource(stream, member.size, spill_path=spill_path,
+                     on_complete=lambda: cache.commit(key, spill_path, member.size),
+                     release=cache.release)
+
+
+def _message_source(message):
+    data = message.encode("utf-8")
+    return LogSource(BytesIO(data), len(data))
+
+
+def error_lines(path, e):
+    """로딩 실패 시 뷰어에 보여줄 오류 메시지 줄"""
+    return [
+        f"Error: Failed to read file.\n",
+        f"File: {path}\n",
+        f"Details: {e}\n"
+    ]
+
+
 class LogDataManager:
     """로그 파일의 원본 데이터를 관리하고 필터링하는 클래스"""
-    def __init__(self):
-        self.lines = []
+    def __init__(self, parallel=None, index_cache=None):
+        # 원본 라인은 문자열 리스트가 아닌 mmap + 줄 오프셋 색인으로 보관
+        self.store = LineStore()
+        # 필터 실행 방식 (serial/process/auto, 기본값은 환경 변수 LOG_VIEWER_FILTER_MODE)
+        self.parallel = parallel if parallel is not None else ParallelFilter()
+        # (단어, 대소문자 무시) 항목별 매칭 비트맵 캐시
+        self.match_cache = MatchCache(parallel=self.parallel)
+        # 열어 본 아카이브 멤버의 압축 해제본 (멤버를 바꿔 열 때 재사용)
+        self.member_cache = MemberCache()
+        # 여러 파일을 합친 뷰에서 숨긴 원본 번호
+        self.hidden_sources = set()
+        # 줄별 타임스탬프 색인 (처음 시간 범위 필터를 쓸 때 만듦)과 시간 범위 (시작, 끝) 초
+        self.time_index = TimestampIndex()
+        self.time_range = None
+        # 다시 여는 파일의 색인을 재사용하는 디스크 캐시 (IndexCache, 없으면 사용 안 함)
+        self.index_cache = index_cache
+        # 현재 저장소의 캐시 항목을 찾아본 결과 (찾을 때의 줄 수, 항목 또는 None)
+        self._index_entry = None
+        # 마지막으로 컴파일한 필터 (트리 JSON, 실행 계획) - 로딩 중 덩어리마다 다시 컴파일하지 않도록
+        self._plan = None
+
+    @property
+    def line_count(self):
+        return len(self.store)
+
+    def get_line(self, index):
+        """원본 인덱스(0-based)의 줄을 디코딩해 반환합니다."""
+        return self.store.line(index)
 
-    # def load_file(self, path):
-    #     """파일을 읽어 원본 라인을 저장합니다."""
-    #     try:
-    #         with open(path, "r", encoding="utf-8", errors='ignore') as f:
-    #             self.lines = f.readlines()
-    #         return True
-    #     except Exception as e:
-    #         print(f"Error loading log file: {e}")
-    #         self.lines = []
-    #         return False
+    def get_lines(self, indices):
+        """여러 원본 인덱스의 줄을 디코딩해 반환합니다."""
+        return self.store.lines(indices)
 
-    def load_file(self, path):
+    def set_store(self, store):
+        """새 저장소로 교체하고 이전 저장소를 닫습니다. (백그라운드 로딩 시작 시 사용)"""
+        self.save_index()
+        old_store, self.store = self.store, store
+        old_store.close()
+        self._index_entry = None
+        self.match_cache.reset(self._cached_term_bits if self.index_cache is not None else None)
+        self.hidden_sources = set()
+        self.time_index = TimestampIndex()
+        self.time_range = None
+
+    def _cached_entry(self):
+        """현재 저장소(끝까지 읽은 일반 파일, .gz 파일)의 디스크 캐시 항목, 없으면 None"""
+        store = self.store
+        n = len(store)
+        if self._index_entry is None or self._index_entry[0] != n:
+            # 로딩 중에는 줄 수가 캐시 항목과 같아질 때까지 다시 찾음
+            entry = None
+            if self.index_cache is not None and store.cache_path is not None and n:
+                entry = self.index_cache.load(store.cache_path)
+                if entry is not None and entry.line_count != n:
+                    entry = None
+            self._index_entry = (n, entry)
+        return self._index_entry[1]
+
+    def _cached_term_bits(self, key):
+        entry = self._cached_entry()
+        if entry is None:
+            return None
+        try:
+            return entry.term_bits(key)
+        except (OSError, ValueError) as e:
+            print(f"Error reading index cache: {e}")
+            return None
+
+    def load_cached_times(self):
+        """타임스탬프 색인이 비어 있으면 디스크 캐시에 저장해 둔 색인으로 채웁니다."""
+        if len(self.time_index):
+            return False
+        entry = self._cached_entry()
+        try:
+            times = entry.times() if entry is not None else None
+        except (OSError, ValueError) as e:
+            print(f"Error reading index cache: {e}")
+            times = None
+        if times is None:
+            return False
+        self.time_index.restore(*times)
+        return True
+
+    def save_index(self):
         """
-        파일을 읽어 원본 라인을 저장합니다.
-        .gz, .zip 확장자를 감지하여 압축을 해제합니다.
+        현재 저장소의 줄 오프셋, 타임스탬프, 단어 비트맵을 디스크 캐시에 저장합니다.
+        끝까지 읽은 일반 파일과 .gz 파일만 저장하고, 캐시에 이미 있는 내용뿐이면 다시 쓰지 않습니다.
         """
-        try:
-            # 파일 확장자 확인
-            _, ext = os.path.splitext(path)
-
-            if ext == '.gz':
-                with gzip.open(path, 'rt', encoding='utf-8', errors='ignore') as f:
-                    self.lines = f.readlines()
-            
-            elif ext == '.zip':
-                with zipfile.ZipFile(path, 'r') as zf:
-                    file_list = zf.namelist()
-                    if not file_list:
-                        self.lines = ["Error: ZIP file is empty.\n"]
-                        return True
-                    
-                    first_file_name = file_list[0]
-                    
-                    with TextIOWrapper(zf.open(first_file_name, 'r'), 
-                                      encoding='utf-8', errors='ignore') as f:
-                        self.lines = f.readlines()
-                        
-                    self.lines.insert(0, f"[Info: Loaded '{first_file_name}' from {os.path.basename(path)}]\n")
-            
-            elif ext == '.tar':
-                with tarfile.open(path, 'r:*') as tf:
-                    members = tf.getmembers()
-                    
-                    file_members = [m for m in members if m.isfile()]
-                    
-                    if not file_members:
-                        self.lines = ["Error: TAR file contains no files.\n"]
-                        return True
-                        
-                    first_file_member = file_members[0]
-                    first_file_name = first_file_member.name
-                    
-                    file_obj = tf.extractfile(first_file_member)
-                    if file_obj is None:
-                         raise Exception(f"Failed to extract file {first_file_name} from tar.")
-
-                    with TextIOWrapper(file_obj, 
-                                      encoding='utf-8', errors='ignore') as f:
-                        self.lines = f.readlines()
-                        
-                    self.lines.insert(0, f"[Info: Loaded '{first_file_name}' from {os.path.basename(path)}]\n")
+        store = self.store
+        n = len(store)
+        if self.index_cache is None or store.cache_path is None or not n:
+            return
+        entry = self._cached_entry()
+        terms = {key: (bits, covered) for key, bits, covered in self.match_cache.items() if covered == n}
+        times = None
+        index = self.time_index
+        if len(index) == n and index.fmt is not None:
+            times = (index.fmt.name, index.times, index.monotonic)
 
-            else:
-                with open(path, "r", encoding="utf-8", errors='ignore') as f:
-                    self.lines = f.readlines()
-                    
+        if entry is not None:
+            saved = set(entry.term_keys())
+            has_times = entry.header.get("times") is not None
+            if set(terms) <= saved and (times is None or has_times):
+                return
+            try:
+                # 이번에 쓰지 않은 예전 항목도 유지
+                for key in saved - set(terms):
+                    terms[key] = entry.term_bits(key)
+                if times is None and has_times:
+                    times = entry.times()
+            except (OSError, ValueError) as e:
+                print(f"Error reading index cache: {e}")
+        self.index_cache.save(store.cache_path, store.offsets, store.max_line_length, times, terms, store.checkpoints)
+
+    def close(self):
+        """저장소, 캐시, 필터 작업자 프로세스를 정리합니다. (앱 종료 시, 색인은 디스크 캐시에 저장)"""
+        self.set_store(LineStore())
+        self.parallel.shutdown()
+        self.member_cache.clear()
+
+    def append_lines(self, offsets, size, max_line_length=0):
+        """
+        로딩 중 새로 색인된 줄을 저장소에 추가합니다.
+        반환: 추가된 줄의 원본 인덱스 범위 (start, stop)
+        """
+        start = self.line_count
+        self.store.extend(offsets, size, max_line_length)
+        return start, self.line_count
+
+    def reopen_last_line(self):
+        """
+        줄바꿈 없이 끝난 마지막 줄을 색인에서 빼고 그 줄 번호를 반환합니다. (없으면 None)
+        따라가기 모드에서 그 줄에 이어 쓰이는 내용을 완성된 한 줄로 다시 받기 위해 사용합니다.
+        """
+        if not self.store.drop_unterminated_line():
+            return None
+        self.match_cache.truncate(self.line_count)
+        self.time_index.truncate(self.line_count)
+        return self.line_count
+
+    def load_file(self, path, member=None):
+        """
+        파일을 끝까지 색인해 원본 라인 저장소를 만듭니다. (동기 로딩)
+        일반 텍스트는 mmap으로 열고, .gz, .zip, .tar는 임시 파일로 풀어 색인합니다.
+        member: 아카이브에서 열 멤버 이름 (없으면 첫 파일)
+        """
+        try:
+            with recorder.phase("load") as stats:
+                self._load_file(path, member)
+                stats.update(lines=self.line_count, bytes=self.store.offsets[-1])
             return True
         
         except Exception as e:
             # 오류 발생 시, 오류 메시지를 뷰어에 표시
             print(f"Error loading log file: {e}")
-            self.lines = [
-                f"Error: Failed to read file.\n",
-                f"File: {path}\n",
-                f"Details: {e}\n"
-            ]
+            self.set_store(LineStore.from_lines(error_lines(path, e)))
             # 오류 메시지를 뷰어에 보여줘야 하므로 True 반환
             return True
 
-    def get_filtered_lines(self, or_filters, and_filters):
-        """필터 규칙에 따라 원본 라인을 필터링하여 반환합니다."""
-        if not or_filters and not and_filters:
-            # 필터가 없으면 전체 라인을 (인덱스, 텍스트)로 반환
-            return list(enumerate(self.lines))
-
-        filtered_data = []
-        for idx, line in enumerate(self.lines):
-            line_text = line.rstrip("\n")
-            
-            # AND 조건: 필터 모두 맞아야 통과
-            and_passed = True
-            for f_data in and_filters:
-                term = f_data["term"]
-                is_case_i = f_data["is_case_i"]
-                
-                if is_case_i:
-                    if not term.lower() in line_text.lower():
-                        and_passed = False
-                        break
-                else:
-                    if not term in line_text:
-                        and_passed = False
-                        break
-            
-            if not and_passed: continue
-
-            or_passed = False
-            # OR 조건: 필터 중 하나라도 맞으면 통과
-            for f_data in or_filters:
-                term = f_data["term"]
-                is_case_i = f_data["is_case_i"]
-                
-                if is_case_i:
-                    if term.lower() in line_text.lower():
-                        or_passed = True
-                        break
+    def _load_file(self, path, member):
+        source = open_log_source(path, member, self.member_cache)
+        try:
+            cached = cached_offsets(source, self.index_cache)
+            if cached is None:
+                store = LineStore.from_source(source)
+            else:
+                # 전에 연 파일: 읽지 않고 저장해 둔 줄 오프셋을 씀 (.gz는 체크포인트에서 필요한 부분만 풂)
+                offsets, max_line_length = cached
+                store = LineStore.for_source(source)
+                store.extend(offsets[1:], offsets[-1], max_line_length)
+            self.set_store(store)
+        finally:
+            source.close()
+
+    def load_files(self, paths):
+        """여러 파일을 타임스탬프 순서로 합쳐 하나의 저장소로 색인합니다. (동기 로딩)"""
+        try:
+            with recorder.phase("load") as stats:
+                source = open_merged_source(paths)
+                try:
+                    self.set_store(LineStore.from_source(source))
+                finally:
+                    source.close()
+                stats.update(lines=self.line_count, bytes=self.store.offsets[-1])
+            return True
+
+        except Exception as e:
+            print(f"Error loading log file: {e}")
+            self.set_store(LineStore.from_lines(error_lines(", ".join(paths), e)))
+            return True
+
+    @property
+    def source_names(self):
+        """합친 뷰의 원본 이름 목록 (파일 하나면 빈 목록)"""
+        return self.store.source_names or []
+
+    def stream_filtered(self, path, tree, member=None):
+        """
+        저장소를 만들지 않고 파일을 덩어리 단위로 읽으며 필터를 적용합니다. (헤드리스 모드, 메모리 사용량 일정)
+        path가 경로 목록이면 타임스탬프 순서로 합친 내용을 읽습니다.
+        tree: 필터 표현식 트리 (filter_expr, None이면 모든 줄). GUI와 같은 실행 계획을 쓰므로 결과가 같습니다.
+        반환: (덩어리 첫 줄 번호, 줄바꿈으로 끝나는 덩어리 바이트, 줄마다 통과 여부 마스크)를 차례로 돌려주는 제너레이터
+        """
+        if isinstance(path, (list, tuple)):
+            source = open_merged_source(path)
+        else:
+            # 끝까지 풀어 쓰지 않으므로 멤버 캐시는 쓰지 않음
+            source = open_log_source(path, member)
+        engine = FilterEngine(compile_plan(tree, bool(source.names)), source.names, source.tags)
+        try:
+            first = 0
+            rest = b""
+            while True:
+                data = source.read(FILTER_CHUNK_SIZE)
+                if data:
+                    cut = data.rfind(b"\n") + 1
+                    if not cut:
+                        rest += data
+                        continue
+                    block, rest = rest + data[:cut], data[cut:]
+                elif rest:
+                    # 줄바꿈 없이 끝난 마지막 줄
+                    block, rest = rest + b"\n", b""
                 else:
-                    if term in line_text:
-                        or_passed = True
-                        break
-            
-            if or_passed:
-                filtered_data.append((idx, line))
-        
-        return filtered_data
+                    break
+                line_count = block.count(b"\n")
+                yield first, block, engine.match_chunk(block, line_count, first)
+                first += line_count
+        finally:
+            source.close()
+
+    def set_source_visible(self, index, visible):
+        """합친 뷰에서 원본 하나를 보이거나 숨깁니다. (다시 합치지 않고 다음 필터 계산에 반영)"""
+        if visible:
+            self.hidden_sources.discard(index)
+        else:
+            self.hidden_sources.add(index)
+
+    def get_source_bits(self, start, stop, table=None):
+        """
+        [start, stop) 범위에서 숨기지 않은 원본의 줄 비트셋 (0번 비트 = start 줄)
+        table: 원본 번호마다 포함 여부(0/1)를 담은 256바이트 표 (없으면 숨기지 않은 원본)
+        """
+        if table is None:
+            table = bytes(0 if i in self.hidden_sources else 1 for i in range(256))
+        return pack_mask(self.store.source_tags[start:stop].tobytes().translate(table))
+
+    def get_filtered_lines(self, or_filters, and_filters, start=0, stop=None):
+        """
+        필터 규칙에 따라 통과한 원본 라인의 인덱스(0-based, 오름차순)를 반환합니다.
+        start, stop으로 원본 줄 범위를 지정하면 그 범위만 반환합니다. (로딩 중 새 덩어리)
+        단어별 비트맵 캐시를 쓰므로, 이미 본 단어를 켜고 끄는 것은 비트 연산만 합니다.
+        """
+        stop = self.line_count if stop is None else stop
+        with recorder.phase("filter", lines=stop - start) as stats:
+            lines = self.bits_to_lines(self.get_filtered_bits(or_filters, and_filters, start, stop), start, stop)
+            stats["matched"] = len(lines)
+        return lines
+
+    def get_filtered_bits(self, or_filters, and_filters, start=0, stop=None, cancelled=None):
+        """
+        [start, stop) 범위에서 필터를 통과한 줄의 비트셋 (0번 비트 = start 줄)을 반환합니다.
+        필터가 없으면 (모든 줄 통과) None을 반환합니다.
+        cancelled: 덩어리마다 확인하는 중단 여부 함수 (True면 FilterCancelled, 백그라운드 재계산용)
+        """
+        stop = self.line_count if stop is None else stop
+        bits = self._filter_bits(or_filters, and_filters, start, stop, cancelled)
+        if self.hidden_sources and self.store.source_tags is not None and start < stop:
+            # 숨긴 원본의 줄은 필터 결과와 관계없이 제외
+            visible = self.get_source_bits(start, stop)
+            bits = visible if bits is None else bits & visible
+        if self.time_range is not None and start < stop:
+            within = self.get_time_bits(*self.time_range, start, stop, cancelled)
+            bits = within if bits is None else bits & within
+        return bits
+
+    def set_time_range(self, time_range):
+        """시간 범위 필터 (시작, 끝) 초를 설정합니다. None이면 해제합니다."""
+        self.time_range = time_range
+
+    def get_time_bits(self, t0, t1, start, stop, cancelled=None):
+        """
+        [start, stop) 범위에서 시각이 t0~t1인 줄의 비트셋 (0번 비트 = start 줄)
+        색인이 모자라면 새 줄만 이어서 색인하고, 범위는 이진 탐색으로 구합니다.
+        """
+        self._extend_times(stop, cancelled)
+        return self.time_index.range_bits(t0, t1, start, stop)
+
+    def get_time_text_bits(self, t_from, t_to, start, stop, cancelled=None):
+        """get_time_bits()와 같지만 시각을 입력한 텍스트로 받습니다. (표현식의 시간 조건, 시각만 쓰면 로그 첫 날짜)"""
+        self._extend_times(stop, cancelled)
+        t0, t1 = resolve_time_range(t_from, t_to, self.time_index.first_time)
+        return self.time_index.range_bits(t0, t1, start, stop)
+
+    def _extend_times(self, stop, cancelled=None):
+        if len(self.time_index) < stop:
+            self.load_cached_times()
+        if len(self.time_index) < stop and not self.time_index.extend(self.store, stop, cancelled, self.parallel):
+            # 덩어리 단위로 추가되므로 멈춘 곳까지의 색인은 다음에 그대로 이어 씀
+            raise FilterCancelled()
+
+    def compile_filters(self, or_filters, and_filters):
+        """
+        OR/AND 목록을 표현식 트리로 묶어 실행 계획으로 컴파일합니다. (필터가 없으면 None)
+        목록이 바뀌지 않았으면 이전 계획을 그대로 씁니다.
+        """
+        tree = filter_tree(or_filters, and_filters)
+        merged = bool(self.source_names)
+        # 원본 조건은 합친 뷰에서만 계획에 남으므로 뷰 종류도 키에 포함
+        key = (json.dumps(tree, sort_keys=True), merged)
+        if self._plan is None or self._plan[0] != key:
+            self._plan = (key, compile_plan(tree, merged))
+        return self._plan[1]
+
+    def _filter_bits(self, or_filters, and_filters, start, stop, cancelled=None):
+        plan = self.compile_filters(or_filters, and_filters)
+        if plan is None:
+            return None
+        if start >= stop:
+            return 0
+        return plan.bits(StoreContext(self, plan, start, stop, cancelled))
+
+    @staticmethod
+    def bits_to_lines(bits, start, stop):
+        """get_filtered_bits()의 결과를 원본 인덱스 목록으로 바꿉니다."""
+        if bits is None:
+            # 필터가 없으면 범위 내 전체 라인의 인덱스를 반환
+            return range(start, stop)
+        if not bits:
+            return array("q")
+        return bits_to_indices(bits, stop - start, start)
+
+    def get_term_bits(self, term, is_case_i):
+        """단어가 들어 있는 줄의 비트셋 (전체 파일, 0번 비트 = 첫 줄)"""
+        key = (term, is_case_i)
+        return self.get_term_bitmaps([key])[key]
+
+    def get_term_bitmaps(self, keys):
+        """여러 (단어, 대소문자 무시) 항목의 비트셋 {항목: 비트셋} (캐시에 없는 항목은 한 번의 훑기로 함께 계산)"""
+        return self.match_cache.bitmaps(self.store, keys)
+
+    @staticmethod
+    def find_next_line(lines, current, forward=True):
+        """
+        정렬된 줄 번호 배열에서 current 다음(이전) 줄을 이진 탐색으로 찾습니다.
+        끝에 닿으면 반대쪽 끝의 줄을 반환합니다. (없으면 -1)
+        """
+        if not lines:
+            return -1
+        if forward:
+            i = bisect_right(lines, current)
+            return lines[i] if i < len(lines) else lines[0]
+        i = bisect_left(lines, current)
+        return lines[i - 1] if i else lines[-1]
@@ -0,0 +1,220 @@
+import re
+from functools import lru_cache
+
+# 필터 검사 시 한 번에 읽는 덩어리 크기 (소문자 사본과 함께 캐시에 머무르도록 작게)
+FILTER_CHUNK_SIZE = 4 * 1024 * 1024
+# 단어가 이보다 적으면 단어마다 bytes.find로 훑는 편이 정규식 대체(|)보다 빠름
+MAX_SEPARATE_NEEDLES = 16
+# 단어가 이보다 적으면 걸린 줄에서 단어마다 다시 찾는 편이 위치별 사전 확인보다 빠름
+MAX_LINE_CHECK_NEEDLES = 64
+
+
+def _byte_safe(term):
+    """대소문자 무시 검색을 bytes.lower()(ASCII만 변환)로 처리해도 되는 단어인지 확인합니다."""
+    return all(ord(c) < 128 or c.lower() == c.upper() for c in term)
+
+
+@lru_cache(maxsize=None)
+def _fold_traps():
+    """
+    소문자로 바꾸면 ASCII나 대소문자 없는 글자가 되는 ASCII 밖 글자들의 UTF-8 (İ -> i̇, K(켈빈) -> k).
+    이런 글자가 있는 줄에서는 bytes.lower()로 찾은 결과가 str.lower()와 달라집니다.
+    """
+    return tuple(c.encode("utf-8") for c in map(chr, range(128, 0x110000))
+                 if c.lower() != c and not all(ord(x) >= 128 and x.lower() != x.upper() for x in c.lower()))
+
+
+def _bytes_fold_exact(data):
+    """덩어리를 bytes.lower()로 바꿔 찾아도 str.lower()와 결과가 같은지 확인합니다."""
+    return data.isascii() or not any(trap in data for trap in _fold_traps())
+
+
+def literal_pattern(needles):
+    """
+    여러 리터럴(바이트 또는 문자열)을 공통 접두사로 묶은 트라이 형태의 정규식 하나로 컴파일합니다.
+    단순 'a|b|c' 대체보다 분기 시도가 적어 여러 단어를 한 번에 찾을 때 빠릅니다.
+    """
+    needles = list(needles)
+    trie = {}
+    for needle in needles:
+        node = trie
+        for i in range(len(needle)):
+            node = node.setdefault(needle[i:i + 1], {})
+        node[None] = True
+    # 정규식 조각도 단어와 같은 형식(문자열/바이트)으로 씀
+    if needles and isinstance(needles[0], str):
+        empty, bar, group, close = "", "|", "(?:", ")"
+    else:
+        empty, bar, group, close = b"", b"|", b"(?:", b")"
+
+    def build(node):
+        # 가지가 하나뿐인 구간은 반복문으로 이어 붙여 재귀 깊이를 줄임
+        parts = []
+        while len(node) == 1 and None not in node:
+            (c, node), = node.items()
+            parts.append(re.escape(c))
+        if None in node:
+            # 더 짧은 단어가 이미 끝났다면 그 위치는 걸린 것이므로 긴 단어는 볼 필요 없음
+            return empty.join(parts)
+        alts = [re.escape(c) + build(child) for c, child in sorted(node.items())]
+        parts.append(alts[0] if len(alts) == 1 else group + bar.join(alts) + close)
+        return empty.join(parts)
+
+    return re.compile(build(trie))
+
+
+class FilterCancelled(Exception):
+    """더 새로운 필터 요청이 와서 계산을 중간에 멈춤 (캐시에는 다 계산된 항목만 남음)"""
+
+
+def needle_finders(needles):
+    """
+    바이트 단어 목록을 find(hay, pos) -> 시작 위치(-1: 없음) 함수 목록으로 바꿉니다.
+    단어가 적으면 단어별 bytes.find(C 구현 고속 검색), 많으면 트라이 정규식 하나를 씁니다.
+    """
+    needles = list(dict.fromkeys(needles))
+    if len(needles) <= MAX_SEPARATE_NEEDLES:
+        return [lambda hay, pos, needle=needle: hay.find(needle, pos) for needle in needles]
+
+    search = literal_pattern(needles).search
+
+    def find(hay, pos):
+        m = search(hay, pos)
+        return -1 if m is None else m.start()
+    return [find]
+
+
+def scan_lines(find, hay, newline, on_hit):
+    """
+    find가 걸린 줄마다 on_hit(줄 번호, 줄 시작, 줄 끝)을 호출합니다.
+    걸린 줄의 나머지는 건너뛰고, 줄 번호는 지나온 줄바꿈 수로 셉니다.
+    빈 단어처럼 길이 0으로 걸리는 경우 모든 줄이 걸리고, 마지막 줄바꿈 뒤(줄 없음)는 세지 않습니다.
+    """
+    size = len(hay)
+    pos = line = last = 0
+    while True:
+        s = find(hay, pos)
+        if s < 0 or s >= size:
+            break
+        ls = hay.rfind(newline, 0, s) + 1
+        le = hay.find(newline, s)
+        if le < 0:
+            le = size
+        line += hay.count(newline, last, ls)
+        last = ls
+        on_hit(line, ls, le)
+        pos = le + 1
+
+
+class TermMatcher:
+    """
+    여러 (단어, 대소문자 무시) 항목을 원본 바이트 덩어리에서 한 번에 검사해
+    항목별 줄 마스크(줄마다 0/1)를 만드는 매처.
+    - 대소문자 무시 단어는 소문자 사본(low)에서 찾습니다.
+    - 단어가 많으면 모든 단어를 소문자 사본에서 트라이 정규식 하나로 훑고, 걸린 줄에서만 각 단어를 다시 확인합니다.
+      단어가 아주 많으면 (가져온 단어 목록) 걸린 위치마다 그 자리에서 시작하는 단어를 (단어 길이별) 사전에서 찾습니다.
+    """
+    def __init__(self, keys, fold_bytes=True):
+        self.keys = list(dict.fromkeys(keys))
+        # ASCII가 아닌 대소문자 글자가 있는 대소문자 무시 단어는 디코딩한 텍스트에서 검사
+        # (fold_bytes가 False면 대소문자 무시 단어를 모두 텍스트에서 검사)
+        self.text_keys = [k for k in self.keys if k[1] and not (fold_bytes and _byte_safe(k[0]))]
+        text_set = set(self.text_keys)
+        byte_keys = [k for k in self.keys if k not in text_set]
+        self.folds_bytes = len(self.text_keys) < sum(1 for k in self.keys if k[1])
+        self._text_matcher = None
+
+        # (항목, 찾을 바이트, 소문자 사본에서 찾는지)
+        self.needles = [
+            (key, (key[0].lower() if key[1] else key[0]).encode("utf-8"), key[1])
+            for key in byte_keys
+        ]
+        self.needs_lower = any(ci for _, _, ci in self.needles)
+        self.combined = None
+        if len(self.needles) > MAX_SEPARATE_NEEDLES:
+            self.needs_lower = True
+            self.search = literal_pattern([needle.lower() for _, needle, _ in self.needles]).search
+            # 소문자 단어 -> [(항목, 원래 단어, 대소문자 무시)], 확인할 단어 길이 목록
+            self.by_lower = {}
+            for key, needle, ci in self.needles:
+                self.by_lower.setdefault(needle.lower(), []).append((key, needle, ci))
+            self.lengths = sorted({len(needle) for needle in self.by_lower})
+            self.combined = True
+
+    def match_chunk(self, data, line_count, low=None):
+        """
+        줄 경계에 맞춘 바이트 덩어리를 검사해 {항목: bytearray 마스크}를 반환합니다.
+        덩어리에서 한 번도 걸리지 않은 항목은 빠집니다. (단어가 많을 때 빈 마스크를 만들지 않도록)
+        low: 같은 덩어리의 소문자 사본 (없으면 필요할 때 여기서 만듦)
+        """
+        if self.folds_bytes and not _bytes_fold_exact(data):
+            # İ처럼 bytes.lower()가 바꾸지 못하는 글자가 있는 덩어리는 대소문자 무시 단어를 모두 텍스트에서 검사
+            if self._text_matcher is None:
+                self._text_matcher = TermMatcher(self.keys, fold_bytes=False)
+            return self._text_matcher.match_chunk(data, line_count)
+
+        masks = {}
+        if self.needs_lower and low is None:
+            low = data.lower()
+
+        if self.combined is not None:
+            self._scan_combined(data, low, line_count, masks)
+        else:
+            for key, needle, ci in self.needles:
+                self._scan_one(key, needle, low if ci else data, b"\n", line_count, masks)
+
+        if self.text_keys:
+            # str.lower()는 줄바꿈을 만들거나 없애지 않으므로 줄 번호는 그대로 유지됨
+            text = data.decode("utf-8", errors="ignore").lower()
+            for key in self.text_keys:
+                self._scan_one(key, key[0].lower(), text, "\n", line_count, masks)
+        return masks
+
+    def _scan_combined(self, data, low, line_count, masks):
+        search, by_lower, lengths = self.search, self.by_lower, self.lengths
+
+        def find(hay, pos):
+            m = search(hay, pos)
+            return -1 if m is None else m.start()
+
+        def mark(key, line):
+            mask = masks.get(key)
+            if mask is None:
+                mask = masks[key] = bytearray(line_count)
+            mask[line] = 1
+
+        if len(self.needles) <= MAX_LINE_CHECK_NEEDLES:
+            needles = [(key, needle, low if ci else data) for key, needle, ci in self.needles]
+
+            def on_hit(line, ls, le):
+                for key, needle, hay in needles:
+                    if hay.find(needle, ls, le) >= 0:
+                        mark(key, line)
+            scan_lines(find, low, b"\n", on_hit)
+            return
+
+        def on_hit(line, ls, le):
+            # 줄 안에서 단어가 시작하는 위치마다 길이별로 사전에서 찾음 (겹친 단어도 모두)
+            m = search(low, ls, le)
+            while m is not None:
+                p = m.start()
+                for length in lengths:
+                    if p + length > le:
+                        break
+                    for key, needle, ci in by_lower.get(low[p:p + length], ()):
+                        if ci or data[p:p + length] == needle:
+                            mark(key, line)
+                m = search(low, p + 1, le)
+        scan_lines(find, low, b"\n", on_hit)
+
+    @staticmethod
+    def _scan_one(key, needle, hay, newline, line_count, masks):
+        mask = None
+
+        def on_hit(line, ls, le):
+            nonlocal mask
+            if mask is None:
+                mask = masks[key] = bytearray(line_count)
+            mask[line] = 1
+        scan_lines(lambda h, pos: h.find(needle, pos), hay, newline, on_hit)
+
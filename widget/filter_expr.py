@@ -0,0 +1,749 @@
+import re
+
+from .filter_engine import FilterCancelled, TermMatcher, FILTER_CHUNK_SIZE, scan_lines
+from .match_cache import bits_to_indices, pack_mask, unpack_bits
+from .timestamps import NO_TIME, detect_format, parse_time_input
+
+# 필터 항목 종류: 그대로 찾는 단어 / 정규식 / 표현식 (그룹, NOT, 정규식, 시간/원본 조건)
+FILTER_KINDS = ("text", "regex", "expr")
+
+# 조건 하나를 검사하는 대략의 상대 비용 (실행 순서를 정할 때 사용)
+# 단어는 모든 단어를 한 번에 훑은 비트맵끼리의 비트 연산뿐이고, 정규식은 후보 줄마다 파이썬에서 검사함
+TERM_COST = 1
+SOURCE_COST = 2
+TIME_COST = 4
+REGEX_COST = 50
+# 통과 비율을 미리 알 수 없는 조건의 추정값
+DEFAULT_SELECTIVITY = 0.5
+# 후보 줄이 전체의 이 비율 이하면 정규식을 덩어리 전체가 아닌 후보 줄에만 돌림
+REGEX_SPARSE_RATIO = 1 / 32
+# 이보다 짧은 글자열은 거의 모든 줄에 있어 정규식 앞의 prefilter로 쓰지 않음
+MIN_PREFILTER_LENGTH = 3
+
+_popcount = getattr(int, "bit_count", lambda bits: bin(bits).count("1"))
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<lparen>\() | (?P<rparen>\)) |
+        (?P<and>&&?) | (?P<or>\|\|?) | (?P<not>!) |
+        "(?P<string>(?:[^"\\]|\\.)*)" |
+        /(?P<regex>(?:[^/\\]|\\.)*)/(?P<flags>[a-z]*) |
+        (?P<word>[^\s()"&|!]+)
+    )""", re.X)
+_KEYWORDS = {"and", "or", "not"}
+# time>=값, time<=값, source:이름 (값은 바로 뒤에 따옴표로 써도 됨)
+_FIELD = re.compile(r"(time)(>=|<=)(.*)|(source):(.*)", re.S)
+
+
+class FilterSyntaxError(ValueError):
+    """필터 표현식이나 정규식이 잘못되었을 때"""
+
+
+def _tokens(text):
+    pos = 0
+    tokens = []
+    while True:
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            if text[pos:].strip():
+                rest = text[pos:].lstrip()
+                if rest[0] == '"':
+                    raise FilterSyntaxError("Unterminated quote")
+                if rest[0] == "/":
+                    raise FilterSyntaxError("Unterminated regex (write /pattern/)")
+                raise FilterSyntaxError(f"Unexpected text: {rest[:20]!r}")
+            return tokens
+        kind = m.lastgroup
+        if kind == "flags":
+            kind = "regex"
+        value = m.group(kind)
+        if kind == "word" and value.lower() in _KEYWORDS:
+            kind = value.lower()
+        elif kind == "word" and value.startswith("/"):
+            raise FilterSyntaxError("Unterminated regex (write /pattern/, quote paths)")
+        elif kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value)
+        elif kind == "regex":
+            value = (value, m.group("flags"))
+        tokens.append((kind, value))
+        pos = m.end()
+
+
+def term_node(term, is_case_i=False):
+    return {"op": "term", "term": term, "is_case_i": is_case_i}
+
+
+def regex_node(pattern, is_case_i=False):
+    """정규식 조건 (잘못된 정규식이면 FilterSyntaxError)"""
+    try:
+        re.compile(pattern, re.I if is_case_i else 0)
+    except re.error as e:
+        raise FilterSyntaxError(f"Invalid regex /{pattern}/: {e}") from None
+    return {"op": "regex", "pattern": pattern, "is_case_i": is_case_i}
+
+
+def time_node(start=None, end=None):
+    """시간 조건 (start 이상, end 이하, 입력 형식은 시간 범위 입력과 같음)"""
+    for text in (start, end):
+        if text is not None:
+            try:
+                parse_time_input(text)
+            except ValueError as e:
+                raise FilterSyntaxError(str(e)) from None
+    return {"op": "time", "from": start, "to": end}
+
+
+def _field_node(word, value):
+    m = _FIELD.fullmatch(word)
+    if m is None:
+        return None
+    if value is None:
+        value = m.group(3) if m.group(1) else m.group(5)
+    if not value:
+        raise FilterSyntaxError(f"Missing value after {word!r}")
+    if m.group(4):
+        return {"op": "source", "name": value}
+    return time_node(start=value) if m.group(2) == ">=" else time_node(end=value)
+
+
+class _Parser:
+    """
+    expr := and (("or" | "|") and)*
+    and  := unary (("and" | "&")? unary)*      -- 나란히 쓰면 AND
+    unary := ("not" | "!") unary | "(" expr ")" | "단어 구" | /정규식/i | time>=값 | time<=값 | source:이름 | 단어
+    """
+    def __init__(self, tokens, is_case_i):
+        self.tokens = tokens
+        self.pos = 0
+        self.is_case_i = is_case_i
+
+    def peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise FilterSyntaxError("Empty expression")
+        node = self.parse_or()
+        if self.pos < len(self.tokens):
+            raise FilterSyntaxError(f"Unexpected {self.tokens[self.pos][1]!r}")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == "or":
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else {"op": "or", "children": children}
+
+    def parse_and(self):
+        children = [self.parse_unary()]
+        while self.peek() not in (None, "or", "rparen"):
+            if self.peek() == "and":
+                self.take()
+            children.append(self.parse_unary())
+        return children[0] if len(children) == 1 else {"op": "and", "children": children}
+
+    def parse_unary(self):
+        kind = self.peek()
+        if kind is None:
+            raise FilterSyntaxError("Unexpected end of expression")
+        kind, value = self.take()
+        if kind == "not":
+            return {"op": "not", "child": self.parse_unary()}
+        if kind == "lparen":
+            node = self.parse_or()
+            if self.peek() != "rparen":
+                raise FilterSyntaxError("Missing ')'")
+            self.take()
+            return node
+        if kind == "string":
+            if not value:
+                raise FilterSyntaxError("Empty quoted term")
+            return term_node(value, self.is_case_i)
+        if kind == "regex":
+            pattern, flags = value
+            if set(flags) - {"i"}:
+                raise FilterSyntaxError(f"Unknown regex flag in /{pattern}/{flags} (only i)")
+            return regex_node(pattern, self.is_case_i or "i" in flags)
+        if kind == "word":
+            following = None
+            if value.endswith((">=", "<=", ":")) and self.peek() == "string":
+                following = self.take()[1]
+            return _field_node(value, following) or term_node(value, self.is_case_i)
+        raise FilterSyntaxError(f"Unexpected {value!r}")
+
+
+def parse(text, is_case_i=False):
+    """
+    필터 표현식을 트리(dict)로 바꿉니다. (잘못된 표현식이면 FilterSyntaxError)
+    예: ERROR (modem | wifi) !"link up" /retry \\d+/i time>=12:00 source:kernel
+    is_case_i: 단어와 정규식의 기본 대소문자 무시 여부
+    """
+    return _Parser(_tokens(text), is_case_i).parse()
+
+
+def item_tree(item):
+    """필터 목록의 항목 하나({"term", "is_case_i", "kind"})를 트리로 바꿉니다."""
+    term, is_case_i = item["term"], item.get("is_case_i", False)
+    kind = item.get("kind", "text")
+    if kind == "regex":
+        return regex_node(term, is_case_i)
+    if kind == "expr":
+        return parse(term, is_case_i)
+    return term_node(term, is_case_i)
+
+
+def filter_tree(or_filters, and_filters):
+    """
+    OR 목록과 AND 목록을 트리 하나로 묶습니다: (OR 항목 중 하나) AND (AND 항목 모두)
+    필터가 없으면 None (모든 줄 통과). AND만 있으면 아무 줄도 통과하지 않습니다. (기존 동작)
+    잘못된 항목(직접 고친 설정 파일 등)은 건너뜁니다.
+    """
+    if not or_filters and not and_filters:
+        return None
+
+    def trees(items):
+        result = []
+        for item in items:
+            try:
+                result.append(item_tree(item))
+            except FilterSyntaxError as e:
+                print(f"Error in filter {item.get('term')!r}: {e}")
+        return result
+    return {"op": "and", "children": [{"op": "or", "children": trees(or_filters)}] + trees(and_filters)}
+
+
+# --- 트리 -> 실행 계획 ---
+
+def _rank_and(node, ctx):
+    # AND: 비용 대비 많이 걸러내는(통과 비율이 낮은) 조건부터
+    rest = 1 - node.selectivity(ctx)
+    return node.cost / rest if rest > 0 else float("inf")
+
+
+def _rank_or(node, ctx):
+    # OR: 비용 대비 많이 통과시키는 조건부터
+    passed = node.selectivity(ctx)
+    return node.cost / passed if passed > 0 else float("inf")
+
+
+class _Constant:
+    cost = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def selectivity(self, ctx):
+        return 1.0 if self.value else 0.0
+
+    def evaluate(self, ctx, cand):
+        return cand if self.value else 0
+
+    def describe(self):
+        return "all" if self.value else "none"
+
+
+class _Term:
+    cost = TERM_COST
+
+    def __init__(self, key):
+        self.key = key
+
+    def selectivity(self, ctx):
+        return ctx.fraction(self.key)
+
+    def evaluate(self, ctx, cand):
+        return ctx.term_bits(self.key) & cand
+
+    def describe(self):
+        term, is_case_i = self.key
+        return f"{term!r}{'/i' if is_case_i else ''}"
+
+
+class _Regex:
+    """정규식 조건: 정규식에 꼭 들어가는 글자열(prefilter)이 있으면 그 단어가 걸린 줄만 정규식으로 검사"""
+    cost = REGEX_COST
+
+    def __init__(self, pattern, is_case_i):
+        self.pattern = pattern
+        # 줄 하나 안에서만 맞도록 (^, $는 줄 경계)
+        self.regex = re.compile(pattern, re.M | (re.I if is_case_i else 0))
+        literal = required_literal(pattern, is_case_i)
+        self.prefilter = (literal, is_case_i) if len(literal) >= MIN_PREFILTER_LENGTH else None
+
+    def selectivity(self, ctx):
+        # prefilter를 이미 계산해 두었으면 그 비율이 상한
+        fraction = ctx.fraction(self.prefilter, known_only=True) if self.prefilter else None
+        return DEFAULT_SELECTIVITY if fraction is None else fraction
+
+    def evaluate(self, ctx, cand):
+        if self.prefilter is not None:
+            cand &= ctx.term_bits(self.prefilter)
+        return ctx.regex_bits(self.regex, cand) if cand else 0
+
+    def describe(self):
+        hint = f" (prefilter {self.prefilter[0]!r})" if self.prefilter else ""
+        return f"/{self.pattern}/{'i' if self.regex.flags & re.I else ''}{hint}"
+
+
+class _Time:
+    cost = TIME_COST
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    def selectivity(self, ctx):
+        return DEFAULT_SELECTIVITY
+
+    def evaluate(self, ctx, cand):
+        return ctx.time_bits(self.start, self.end) & cand
+
+    def describe(self):
+        return f"time[{self.start or ''}..{self.end or ''}]"
+
+
+class _Source:
+    cost = SOURCE_COST
+
+    def __init__(self, name):
+        self.name = name
+
+    def selectivity(self, ctx):
+        return ctx.source_fraction(self.name)
+
+    def evaluate(self, ctx, cand):
+        return ctx.source_bits(self.name) & cand
+
+    def describe(self):
+        return f"source:{self.name!r}"
+
+
+class _Not:
+    def __init__(self, child):
+        self.child = child
+        self.cost = child.cost
+
+    def selectivity(self, ctx):
+        return 1 - self.child.selectivity(ctx)
+
+    def evaluate(self, ctx, cand):
+        # 자식은 후보 중 걸린 줄만 돌려주므로 XOR = 후보 중 걸리지 않은 줄
+        return cand ^ self.child.evaluate(ctx, cand)
+
+    def describe(self):
+        return f"not {self.child.describe()}"
+
+
+class _And:
+    def __init__(self, children):
+        self.children = children
+        self.cost = sum(child.cost for child in children)
+
+    def selectivity(self, ctx):
+        result = 1.0
+        for child in self.children:
+            result *= child.selectivity(ctx)
+        return result
+
+    def evaluate(self, ctx, cand):
+        for child in sorted(self.children, key=lambda child: _rank_and(child, ctx)):
+            cand = child.evaluate(ctx, cand)
+            if not cand:
+                # 남은 줄이 없으면 나머지 조건은 검사하지 않음
+                break
+        return cand
+
+    def describe(self):
+        return "(" + " AND ".join(child.describe() for child in self.children) + ")"
+
+
+class _Or:
+    def __init__(self, children):
+        self.children = children
+        self.cost = sum(child.cost for child in children)
+
+    def selectivity(self, ctx):
+        rest = 1.0
+        for child in self.children:
+            rest *= 1 - child.selectivity(ctx)
+        return 1 - rest
+
+    def evaluate(self, ctx, cand):
+        matched = 0
+        for child in sorted(self.children, key=lambda child: _rank_or(child, ctx)):
+            # 이미 걸린 줄은 다음 조건에서 다시 검사하지 않음
+            hit = child.evaluate(ctx, cand)
+            matched |= hit
+            cand ^= hit
+            if not cand:
+                break
+        return matched
+
+    def describe(self):
+        return "(" + " OR ".join(child.describe() for child in self.children) + ")"
+
+
+class FilterPlan:
+    """
+    컴파일한 필터 트리. bits(ctx)로 범위의 통과 줄 비트셋을 구합니다.
+    - 단어 조건은 term_keys로 모아 한 번의 훑기로 미리 계산합니다.
+      정규식의 prefilter(prefilter_keys)는 그 정규식을 실제로 검사할 때 계산합니다.
+    - AND/OR는 실행할 때 (비용, 실제 통과 비율)로 순서를 정하고, 남은 후보가 없으면 멈춥니다.
+    - 정규식과 시간 조건은 앞 조건을 통과한 후보 줄에만 적용됩니다.
+    - 합친 뷰가 아니면 (merged=False) 원본 조건은 계획에서 뺍니다. (not이나 OR 안에 있어도 결과에 영향 없음)
+    """
+    def __init__(self, tree, merged=False):
+        self.term_keys = []
+        self.prefilter_keys = []
+        self.uses_time = False
+        self.merged = merged
+        root = self._compile(tree)
+        # 원본 조건만 있던 트리는 모든 줄을 통과시킴
+        self.root = _Constant(True) if root is None else root
+        self.term_keys = list(dict.fromkeys(self.term_keys))
+        self.prefilter_keys = list(dict.fromkeys(self.prefilter_keys))
+
+    def bits(self, ctx):
+        return self.root.evaluate(ctx, ctx.all)
+
+    def describe(self):
+        return self.root.describe()
+
+    def _compile(self, node):
+        """노드를 컴파일합니다. 뺀 조건(합친 뷰가 아닌 원본 조건)이면 None"""
+        op = node["op"]
+        if op == "term":
+            key = (node["term"], node.get("is_case_i", False))
+            self.term_keys.append(key)
+            return _Term(key)
+        if op == "regex":
+            result = _Regex(node["pattern"], node.get("is_case_i", False))
+            if result.prefilter is not None:
+                self.prefilter_keys.append(result.prefilter)
+            return result
+        if op == "time":
+            self.uses_time = True
+            return _Time(node.get("from"), node.get("to"))
+        if op == "source":
+            return _Source(node["name"]) if self.merged else None
+        if op == "not":
+            child = self._compile(node["child"])
+            if child is None:
+                return None
+            if isinstance(child, _Not):
+                return child.child
+            if isinstance(child, _Constant):
+                return _Constant(not child.value)
+            return _Not(child)
+        if op in ("and", "or"):
+            group = _And if op == "and" else _Or
+            # AND에서는 "모두", OR에서는 "없음"이 결과에 영향 없음
+            neutral = op == "and"
+            children = []
+            dropped = False
+            for child in (self._compile(c) for c in node["children"]):
+                if child is None:
+                    dropped = True
+                elif isinstance(child, group):
+                    children.extend(child.children)
+                elif isinstance(child, _Constant):
+                    if child.value != neutral:
+                        return child
+                else:
+                    children.append(child)
+            if not children:
+                # 뺀 조건만 있던 묶음은 묶음째로 뺌
+                return None if dropped else _Constant(neutral)
+            return children[0] if len(children) == 1 else group(children)
+        raise FilterSyntaxError(f"Unknown filter node: {op!r}")
+
+
+def compile_plan(tree, merged=False):
+    """
+    트리를 실행 계획으로 컴파일합니다. 트리가 None(필터 없음)이면 None.
+    merged: 여러 파일을 합친 뷰인지 (아니면 source: 조건을 뺌)
+    """
+    return None if tree is None else FilterPlan(tree, merged)
+
+
+_REGEX_META = set(".^$*+?{}[]()|\\")
+# (?i), (?x:...) 등 글자 해석을 바꾸는 인라인 플래그
+_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux-]+[:)]")
+# 반복 횟수 지정 {m}, {m,}, {,n}, {m,n} (그 외의 {는 sre가 글자로 읽음)
+_QUANTIFIER = re.compile(r"\{(?:\d+(?:,\d*)?|,\d*)\}")
+# 이스케이프 뒤에 오는 부호 값 (\x41, \u00e9, \U0001f600, \N{...}, 8진수, 역참조 번호)
+_ESCAPE_PAYLOAD = {
+    "x": re.compile(r"[0-9a-fA-F]{0,2}"),
+    "u": re.compile(r"[0-9a-fA-F]{0,4}"),
+    "U": re.compile(r"[0-9a-fA-F]{0,8}"),
+    "N": re.compile(r"(?:\{[^}]*\})?"),
+}
+_ESCAPE_DIGITS = re.compile(r"\d{0,2}")
+
+
+def required_literal(pattern, is_case_i=False):
+    """
+    정규식이 맞으려면 줄에 꼭 들어 있어야 하는 가장 긴 글자열 (없으면 "").
+    그룹 안, 선택(|), 반복으로 빠질 수 있는 글자는 보지 않는 보수적인 추출입니다.
+    """
+    if "|" in pattern.replace("\\|", "") or _INLINE_FLAGS.search(pattern):
+        return ""
+    runs = [""]
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        literal = None
+        if c == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            i += 2
+            # \d, \n 같은 영숫자 이스케이프는 글자 하나가 아님
+            if not nxt.isalnum():
+                literal = nxt
+            elif nxt in _ESCAPE_PAYLOAD:
+                # 부호 값까지 건너뜀 (\x41의 41이 글자로 남지 않게)
+                i = _ESCAPE_PAYLOAD[nxt].match(pattern, i).end()
+            elif nxt.isdigit():
+                # 8진수 이스케이프, 역참조 번호
+                i = _ESCAPE_DIGITS.match(pattern, i).end()
+        elif c == "[":
+            # 문자 클래스는 끝까지 건너뜀
+            j = i + 1
+            if j < len(pattern) and pattern[j] == "^":
+                j += 1
+            if j < len(pattern) and pattern[j] == "]":
+                j += 1
+            while j < len(pattern) and pattern[j] != "]":
+                j += 2 if pattern[j] == "\\" else 1
+            i = j + 1
+        elif c in "()":
+            depth += 1 if c == "(" else -1
+            i += 1
+        elif c == "{" and _QUANTIFIER.match(pattern, i):
+            # 반복 횟수는 통째로 건너뜀 (앞 글자는 아래에서 이미 뺌)
+            i = _QUANTIFIER.match(pattern, i).end()
+        elif c in _REGEX_META:
+            i += 1
+        else:
+            literal = c
+            i += 1
+
+        if literal is not None and depth == 0 and not (is_case_i and not literal.isascii()):
+            if i < len(pattern) and (pattern[i] in "*?" or _QUANTIFIER.match(pattern, i)):
+                # 0번 반복될 수 있는 글자는 빠짐
+                runs.append("")
+            else:
+                runs[-1] += literal
+                if i < len(pattern) and pattern[i] == "+":
+                    runs.append("")
+        else:
+            runs.append("")
+    return max(runs, key=len)
+
+
+# --- 실행 문맥 ---
+
+def regex_mask(regex, text, line_count):
+    """줄바꿈으로 나뉜 텍스트에서 정규식이 걸린 줄의 0/1 마스크 (덩어리 전체를 C 수준으로 훑음)"""
+    mask = bytearray(line_count)
+    search = regex.search
+
+    def find(hay, pos):
+        m = search(hay, pos)
+        return -1 if m is None else m.start()
+
+    def on_hit(line, ls, le):
+        # 여러 줄에 걸친 일치(\s가 줄바꿈에 맞는 경우 등)는 그 줄 안에서 다시 확인
+        if line < line_count and search(text, ls, le):
+            mask[line] = 1
+    scan_lines(find, text, "\n", on_hit)
+    return mask
+
+
+def _decode(data):
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n")
+
+
+def _source_table(names, name):
+    wanted = name.lower()
+    return bytes(1 if i < len(names) and wanted in names[i].lower() else 0 for i in range(256))
+
+
+class StoreContext:
+    """
+    LogDataManager 저장소의 [start, stop) 줄 범위에서 계획을 실행하는 문맥.
+    비트셋의 0번 비트 = start 줄
+    cancelled: 덩어리마다 확인하는 중단 여부 함수 (True면 FilterCancelled, 백그라운드 재계산용)
+    """
+    def __init__(self, manager, plan, start, stop, cancelled=None):
+        self.manager = manager
+        self.cancelled = cancelled
+        self.start = start
+        self.stop = stop
+        self.n = stop - start
+        self.all = (1 << self.n) - 1
+        self._fractions = {}
+        self._terms = {}
+        if plan.term_keys:
+            for key, bits in manager.match_cache.bitmaps(manager.store, plan.term_keys, cancelled).items():
+                self._terms[key] = (bits >> start) & self.all
+
+    def term_bits(self, key):
+        bits = self._terms.get(key)
+        if bits is None:
+            # prefilter: 필요할 때 계산 (단어별 비트맵 캐시에 남으므로 다음에는 바로 씀)
+            bits = self.manager.match_cache.bitmaps(self.manager.store, [key], self.cancelled)[key]
+            bits = self._terms[key] = (bits >> self.start) & self.all
+        return bits
+
+    def fraction(self, key, known_only=False):
+        """범위에서 단어가 걸린 줄의 비율 (known_only면 아직 계산하지 않은 단어는 None)"""
+        if known_only and key not in self._terms:
+            return None
+        result = self._fractions.get(key)
+        if result is None:
+            result = self._fractions[key] = _popcount(self.term_bits(key)) / self.n if self.n else 0.0
+        return result
+
+    def regex_bits(self, regex, cand):
+        store, start = self.manager.store, self.start
+        count = _popcount(cand)
+        if count <= self.n * REGEX_SPARSE_RATIO:
+            # 후보가 적으면 후보 줄만 하나씩 검사
+            search = regex.search
+            hits = bytearray(self.n)
+            for i in bits_to_indices(cand, self.n):
+                if search(store.line(start + i)):
+                    hits[i] = 1
+            return pack_mask(hits)
+        masks = []
+        for first, end, data in store.iter_chunks(start, self.stop, FILTER_CHUNK_SIZE):
+            if self.cancelled is not None and self.cancelled():
+                raise FilterCancelled()
+            masks.append(regex_mask(regex, _decode(data), end - first))
+        return pack_mask(b"".join(masks)) & cand
+
+    def time_bits(self, t_from, t_to):
+        return self.manager.get_time_text_bits(t_from, t_to, self.start, self.stop, self.cancelled)
+
+    def source_fraction(self, name):
+        names = self.manager.source_names
+        if not names:
+            return 1.0
+        return sum(1 for source in names if name.lower() in source.lower()) / len(names)
+
+    def source_bits(self, name):
+        names = self.manager.source_names
+        if not names:
+            # 합친 뷰가 아니면 원본 조건은 적용하지 않음
+            return self.all
+        return self.manager.get_source_bits(self.start, self.stop, _source_table(names, name))
+
+
+class _ChunkContext:
+    """FilterEngine이 바이트 덩어리 하나에서 계획을 실행하는 문맥 (0번 비트 = 덩어리 첫 줄)"""
+    def __init__(self, engine, data, line_count, first, low):
+        self.engine = engine
+        self.data = data
+        self.first = first
+        self.n = line_count
+        self.all = (1 << line_count) - 1
+        self._text = None
+        self._terms = {}
+        if engine.matcher is not None:
+            for key, mask in engine.matcher.match_chunk(data, line_count, low).items():
+                self._terms[key] = pack_mask(mask)
+        self.times = engine.chunk_times(data, line_count) if engine.plan.uses_time else None
+
+    def term_bits(self, key):
+        # 덩어리에서 한 번도 걸리지 않은 단어는 매처 결과에 없음
+        return self._terms.get(key, 0)
+
+    def fraction(self, key, known_only=False):
+        return _popcount(self.term_bits(key)) / self.n if self.n else 0.0
+
+    def regex_bits(self, regex, cand):
+        if self._text is None:
+            self._text = _decode(self.data)
+        return pack_mask(regex_mask(regex, self._text, self.n)) & cand
+
+    def time_bits(self, t_from, t_to):
+        t0, t1 = self.engine.time_bounds(t_from, t_to)
+        return pack_mask(bytes(t0 <= t <= t1 for t in self.times))
+
+    def source_fraction(self, name):
+        names = self.engine.source_names
+        if not names:
+            return 1.0
+        return sum(1 for source in names if name.lower() in source.lower()) / len(names)
+
+    def source_bits(self, name):
+        names, tags = self.engine.source_names, self.engine.source_tags
+        if not names or tags is None:
+            return self.all
+        return pack_mask(tags[self.first:self.first + self.n].tobytes().translate(_source_table(names, name)))
+
+
+class FilterEngine:
+    """
+    컴파일한 계획을 (저장소 없이) 줄 경계에 맞춘 바이트 덩어리마다 실행하는 엔진. (헤드리스 모드)
+    덩어리는 파일 앞에서부터 차례로 넘겨야 합니다. (타임스탬프 없는 줄이 앞 줄의 시각을 이어받음)
+    source_names, source_tags: 여러 파일을 합쳐 읽을 때의 원본 이름과 줄별 원본 번호
+    """
+    def __init__(self, plan, source_names=None, source_tags=None):
+        self.plan = plan
+        self.source_names = source_names
+        self.source_tags = source_tags
+        # 덩어리는 한 번만 보므로 prefilter도 단어와 함께 한 번에 훑음
+        keys = plan.term_keys + plan.prefilter_keys if plan is not None else []
+        self.matcher = TermMatcher(keys) if keys else None
+        # 시간 조건용: 감지한 형식, 직전 줄의 시각, 첫 시각 (시각만 입력한 조건의 날짜 기준)
+        self.fmt = None
+        self.detected = False
+        self.last_time = NO_TIME
+        self.first_time = None
+        self._bounds = {}
+
+    def match_chunk(self, data, line_count, first=0, low=None):
+        """덩어리를 검사해 줄마다 통과 여부(0/1)를 담은 bytearray를 반환합니다. first: 덩어리 첫 줄 번호"""
+        if self.plan is None:
+            return bytearray(b"\x01") * line_count
+        ctx = _ChunkContext(self, data, line_count, first, low)
+        return unpack_bits(self.plan.bits(ctx), line_count)
+
+    def chunk_times(self, data, line_count):
+        lines = data.split(b"\n", line_count)[:line_count]
+        if not self.detected:
+            self.fmt = detect_format(lines)
+            self.detected = True
+        if self.fmt is None:
+            return [self.last_time] * line_count
+        times = self.fmt.parse_lines(lines, self.last_time)
+        if times:
+            self.last_time = times[-1]
+            if self.first_time is None:
+                self.first_time = next((t for t in times if t != NO_TIME), None)
+        return times
+
+    def time_bounds(self, t_from, t_to):
+        key = (t_from, t_to)
+        bounds = self._bounds.get(key)
+        if bounds is None:
+            bounds = resolve_time_range(t_from, t_to, self.first_time)
+            if self.first_time is not None:
+                # 시각만 입력한 조건의 날짜는 첫 시각을 본 뒤에 확정
+                self._bounds[key] = bounds
+        return bounds
+
+
+def resolve_time_range(t_from, t_to, reference):
+    """시간 조건의 입력(없으면 열린 쪽)을 초 단위 (시작, 끝)으로 바꿉니다. (시각만 입력하면 reference의 날짜)"""
+    start = parse_time_input(t_from, reference) if t_from else NO_TIME
+    end = parse_time_input(t_to, reference) if t_to else float("inf")
+    return start, end
@@ -0,0 +1,420 @@
+import os
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+
+# 체크포인트 간격 (압축 해제된 바이트 기준) - 임의 위치로 이동할 때 최대 이만큼만 새로 풂
+CHECKPOINT_SPAN = 4 * 1024 * 1024
+# 체크포인트마다 저장하는 직전 해제 내용 크기 (deflate가 거슬러 참조하는 최대 거리)
+WINDOW_SIZE = 32 * 1024
+# 한 번에 읽는 압축 데이터 크기
+READ_SIZE = 64 * 1024
+# 블록을 풀 때 한 번에 넣는 압축 데이터 크기 (블록 끝 비트를 찾을 때 이 안에서만 다시 풂)
+FEED_SIZE = 4 * 1024
+# GzipBuffer가 기억하는 페이지 크기와 수 (화면에 보이는 줄, 줄 이동)
+PAGE_SIZE = 256 * 1024
+MAX_PAGES = 32
+# 기억해 두는 파일별 색인 수 (같은 세션에서 다시 여는 .tar.gz)
+MAX_SHARED_INDEXES = 16
+
+# gzip 머리글 플래그
+_FHCRC, _FEXTRA, _FNAME, _FCOMMENT = 2, 4, 8, 16
+# 저장 형식: 전체 해제 크기, 체크포인트마다 (해제 위치, 압축 위치, 비트 위치, 압축한 창 크기) + 창
+_SIZE = struct.Struct("<Q")
+_POINT = struct.Struct("<QQBI")
+_TRUNCATED = "Compressed file ended before the end-of-stream marker was reached"
+
+
+def _end_bit(decomp, last):
+    """
+    블록이 마지막 바이트 last의 몇 번째 비트에서 끝나는지 (1~8) 찾습니다.
+    decomp: last 직전까지 넣은 압축 해제기 - 뒤쪽 비트를 0과 1로 바꿔 넣어도 똑같이 끝나면 거기서 끝난 것
+    (바꾼 비트가 블록 안쪽이면 다른 부호가 되어 결과가 달라지거나 잘못된 부호 오류가 남)
+    """
+    for bits in range(1, 8):
+        keep = (1 << bits) - 1
+        low, high = decomp.copy(), decomp.copy()
+        try:
+            out = low.decompress(bytes((last & keep,)))
+            if low.eof and high.decompress(bytes((last | (0xFF ^ keep),))) == out and high.eof:
+                return bits
+        except zlib.error:
+            pass
+    return 8
+
+
+class GzipIndex:
+    """
+    gzip 스트림의 압축 해제 체크포인트 목록 (zran 방식).
+    체크포인트 = (해제된 위치, 압축 파일 위치, 그 바이트 안의 비트 위치, 직전 WINDOW_SIZE 바이트 창)
+    deflate 블록이 시작하는 곳에서만 만들고, 창을 사전(zdict)으로 준 raw deflate 해제기로 그 블록부터 다시 풉니다.
+    모두 바이트라 디스크 색인 캐시에 저장해 두고 다음에 열 때 그대로 씁니다. (to_bytes/from_bytes)
+    """
+    def __init__(self, span=CHECKPOINT_SPAN):
+        self.span = span
+        self._lock = threading.Lock()
+        self._positions = []
+        # (해제 위치, 압축 위치, 비트 위치, zlib으로 압축한 창)
+        self._points = []
+        # 끝까지 읽었으면 전체 해제 크기
+        self.size = None
+
+    def __len__(self):
+        return len(self._points)
+
+    def offer(self, position, raw_position, bits, window):
+        """
+        블록 시작 위치가 마지막 체크포인트보다 충분히 뒤면 새 체크포인트를 추가합니다.
+        window: 그 위치 직전의 해제 내용 (최대 WINDOW_SIZE, 멤버 처음이면 b"")
+        """
+        last = self._positions[-1] if self._positions else 0
+        if self.size is not None or position < last + self.span:
+            return
+        point = (position, raw_position, bits, zlib.compress(window, 1))
+        with self._lock:
+            if not self._positions or position >= self._positions[-1] + self.span:
+                self._positions.append(position)
+                self._points.append(point)
+
+    def nearest(self, position):
+        """position 이하에서 가장 가까운 체크포인트 (해제 위치, 압축 위치, 비트 위치, 창), 없으면 None"""
+        with self._lock:
+            i = bisect_right(self._positions, position) - 1
+            if i < 0:
+                return None
+            position, raw_position, bits, window = self._points[i]
+        return position, raw_position, bits, zlib.decompress(window)
+
+    def to_bytes(self):
+        """디스크 캐시에 저장할 바이트 (끝까지 읽은 색인만)"""
+        with self._lock:
+            points = list(self._points)
+        parts = [_SIZE.pack(self.size)]
+        for position, raw_position, bits, window in points:
+            parts.append(_POINT.pack(position, raw_position, bits, len(window)))
+            parts.append(window)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """to_bytes()로 저장한 색인을 읽습니다."""
+        index = cls()
+        if len(data) < _SIZE.size:
+            raise ValueError("Truncated gzip checkpoint index")
+        index.size, = _SIZE.unpack_from(data)
+        at = _SIZE.size
+        while at < len(data):
+            if at + _POINT.size > len(data):
+                raise ValueError("Truncated gzip checkpoint index")
+            position, raw_position, bits, length = _POINT.unpack_from(data, at)
+            at += _POINT.size
+            index._positions.append(position)
+            index._points.append((position, raw_position, bits, data[at:at + length]))
+            at += length
+        return index
+
+
+class GzipReader:
+    """
+    체크포인트 색인을 쓰는 gzip 읽기 스트림 (gzip.GzipFile 대신 사용).
+    deflate 블록을 하나씩 풀어 블록 경계의 (바이트, 비트) 위치를 알아내며, 순서대로 읽는 동안 색인을 채웁니다.
+    seek()는 가장 가까운 앞쪽 체크포인트에서 다시 풉니다. 여러 gzip 멤버를 이어 붙인 파일도 읽습니다.
+    """
+    def __init__(self, path, index=None):
+        self.raw = open(path, "rb")
+        self.index = index if index is not None else GzipIndex()
+        # 최근에 읽은 압축 데이터 (압축 파일 위치 _data_pos부터)
+        self._data = b""
+        self._data_pos = 0
+        self._restore(None)
+
+    def _restore(self, point):
+        """체크포인트(None이면 파일 처음)에서 다시 풀기 시작합니다."""
+        self._in_member = point is not None
+        self._out, self._byte, self._bit, self._window = point if point is not None else (0, 0, 0, b"")
+        # 멤버 처음부터 풀 때만 CRC 확인 (체크포인트에서 시작하면 앞부분 내용을 모름)
+        self._crc = None
+        self._member_start = self._out
+        self._pos = self._out
+        self._buf = b""
+        self._buf_pos = 0
+        self._eof = False
+
+    def _raw_at(self, offset, size):
+        """압축 파일의 [offset, offset + size) 바이트 (파일 끝이면 짧음)"""
+        start = offset - self._data_pos
+        if start < 0 or start + size > len(self._data):
+            self.raw.seek(offset)
+            self._data = self.raw.read(max(size, READ_SIZE))
+            self._data_pos = offset
+            start = 0
+        return self._data[start:start + size]
+
+    def _shifted(self, offset, size):
+        """offset 바이트의 _bit 비트부터 시작하는 압축 데이터 size 바이트 (비트 위치를 바이트 경계로 당김)"""
+        if not self._bit:
+            return self._raw_at(offset, size)
+        data = self._raw_at(offset, size + 1)
+        return (int.from_bytes(data, "little") >> self._bit).to_bytes(len(data), "little")[:size]
+
+    def _start_member(self):
+        """다음 gzip 멤버의 머리글을 읽습니다. 파일이 끝났으면 False."""
+        while True:
+            # 멤버 사이(와 파일 끝)의 0 채움은 건너뜀
+            data = self._raw_at(self._byte, READ_SIZE)
+            if not data:
+                return False
+            rest = data.lstrip(b"\x00")
+            self._byte += len(data) - len(rest)
+            if rest:
+                break
+        head = self._raw_at(self._byte, 10)
+        if len(head) < 10:
+            raise EOFError(_TRUNCATED)
+        if head[:2] != b"\x1f\x8b":
+            raise OSError(f"Not a gzipped file ({head[:2]!r})")
+        if head[2] != 8:
+            raise OSError("Unknown compression method")
+        flags = head[3]
+        at = self._byte + 10
+        if flags & _FEXTRA:
+            at += 2 + int.from_bytes(self._raw_at(at, 2), "little")
+        for flag in (_FNAME, _FCOMMENT):
+            while flags & flag:
+                data = self._raw_at(at, READ_SIZE)
+                if not data:
+                    raise EOFError(_TRUNCATED)
+                end = data.find(b"\x00")
+                at += len(data) if end < 0 else end + 1
+                if end >= 0:
+                    break
+        if flags & _FHCRC:
+            at += 2
+        self._byte, self._bit = at, 0
+        self._window = b""
+        self._crc = 0
+        self._member_start = self._out
+        self._in_member = True
+        return True
+
+    def _end_member(self):
+        """멤버 끝의 CRC와 크기를 확인하고 다음 멤버 위치로 넘어갑니다."""
+        if self._bit:
+            self._byte += 1
+            self._bit = 0
+        trailer = self._raw_at(self._byte, 8)
+        if len(trailer) < 8:
+            raise EOFError(_TRUNCATED)
+        crc, size = struct.unpack("<II", trailer)
+        if self._crc is not None and (crc != self._crc or size != (self._out - self._member_start) & 0xFFFFFFFF):
+            raise OSError("CRC check failed")
+        self._byte += 8
+        self._in_member = False
+
+    def _block(self):
+        """deflate 블록 하나를 풀어 (해제 내용, 마지막 블록 여부)를 반환하고 다음 블록 위치로 넘어갑니다."""
+        head = self._shifted(self._byte, 1)
+        if not head:
+            raise EOFError(_TRUNCATED)
+        final, kind = head[0] & 1, (head[0] >> 1) & 3
+        if kind == 0:
+            # 저장 블록: 머리 3비트 뒤 바이트 경계부터 길이, 길이의 보수, 내용
+            at = self._byte + (self._bit + 3 + 7) // 8
+            head = self._raw_at(at, 4)
+            if len(head) < 4:
+                raise EOFError(_TRUNCATED)
+            length, check = struct.unpack("<HH", head)
+            if length != check ^ 0xFFFF:
+                raise zlib.error("Error -3 while decompressing data: invalid stored block lengths")
+            out = self._raw_at(at + 4, length)
+            if len(out) < length:
+                raise EOFError(_TRUNCATED)
+            self._byte, self._bit = at + 4 + length, 0
+        elif kind == 3:
+            raise zlib.error("Error -3 while decompressing data: invalid block type")
+        else:
+            out = self._inflate()
+        return out, final
+
+    def _inflate(self):
+        """
+        허프만 부호 블록 하나를 풉니다. 블록의 마지막 블록 표시(BFINAL)를 켜서 넣으면 zlib이 그 블록 끝에서 멈추고,
+        마지막으로 쓴 바이트의 몇 번째 비트에서 끝났는지는 _end_bit()로 알아냅니다.
+        """
+        if self._window:
+            decomp = zlib.decompressobj(-zlib.MAX_WBITS, zdict=self._window)
+        else:
+            decomp = zlib.decompressobj(-zlib.MAX_WBITS)
+        parts = []
+        fed = 0
+        while not decomp.eof:
+            data = self._shifted(self._byte + fed, FEED_SIZE)
+            if not data:
+                raise EOFError(_TRUNCATED)
+            if not fed:
+                data = bytes((data[0] | 1,)) + data[1:]
+            before = decomp.copy()
+            parts.append(decomp.decompress(data))
+            fed += len(data)
+        # 이번에 넣은 덩어리에서 블록이 끝나는 바이트
+        last = len(data) - len(decomp.unused_data) - 1
+        before.decompress(data[:last])
+        end = self._bit + (fed - len(data) + last) * 8 + _end_bit(before, data[last])
+        self._byte += end // 8
+        self._bit = end % 8
+        return b"".join(parts)
+
+    def _fill(self):
+        """다음 deflate 블록을 풀어 _buf를 채웁니다. 더 읽을 내용이 없으면 False."""
+        while not self._eof:
+            if not self._in_member and not self._start_member():
+                self._eof = True
+                self.index.size = self._out
+                break
+            # 블록 경계에서만 체크포인트를 만듦
+            self.index.offer(self._out, self._byte, self._bit, self._window)
+            out, final = self._block()
+            self._out += len(out)
+            if self._crc is not None:
+                self._crc = zlib.crc32(out, self._crc)
+            if len(out) >= WINDOW_SIZE:
+                self._window = out[-WINDOW_SIZE:]
+            else:
+                self._window = (self._window + out)[-WINDOW_SIZE:]
+            if final:
+                self._end_member()
+            if out:
+                self._buf = out
+                self._buf_pos = 0
+                return True
+        return False
+
+    def read(self, size=-1):
+        parts = []
+        while size < 0 or size > 0:
+            if self._buf_pos >= len(self._buf) and not self._fill():
+                break
+            end = len(self._buf) if size < 0 else min(len(self._buf), self._buf_pos + size)
+            part = self._buf[self._buf_pos:end]
+            self._buf_pos = end
+            self._pos += len(part)
+            if size > 0:
+                size -= len(part)
+            parts.append(part)
+        return b"".join(parts)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """해제된 위치로 이동합니다. 가까운 체크포인트가 있으면 거기서부터 풉니다."""
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence != os.SEEK_SET:
+            raise ValueError("GzipReader supports only SEEK_SET and SEEK_CUR")
+        point = self.index.nearest(offset)
+        if offset < self._pos or (point is not None and point[0] > self._pos):
+            self._restore(point)
+        # 버퍼에 남은 부분 안이면 위치만 옮김
+        skip = offset - self._pos
+        if skip <= len(self._buf) - self._buf_pos:
+            self._buf_pos += skip
+            self._pos = offset
+        else:
+            while self._pos < offset and self.read(min(offset - self._pos, READ_SIZE * 16)):
+                pass
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def close(self):
+        self.raw.close()
+
+
+class GzipBuffer:
+    """
+    끝까지 색인한 gzip 파일을 바이트 버퍼처럼 읽는 래퍼 (LineStore가 mmap 대신 사용: len(buf), buf[a:b]).
+    읽는 부분만 가까운 체크포인트에서 풀며, 화면에 보이는 줄은 최근 페이지에서 가져옵니다.
+    큰 범위(필터, 내보내기)는 따로 연 스트림으로 이어서 풀어 페이지 읽기와 위치를 빼앗지 않습니다.
+    """
+    def __init__(self, path, index):
+        self.path = path
+        self.index = index
+        self._page_lock = threading.Lock()
+        self._stream_lock = threading.Lock()
+        # 페이지 번호 -> 해제된 내용 (LRU)
+        self._pages = OrderedDict()
+        self._page_reader = None
+        self._stream = None
+
+    def __len__(self):
+        return self.index.size
+
+    def __getitem__(self, key):
+        start, stop, _ = key.indices(self.index.size)
+        if stop <= start:
+            return b""
+        if stop - start > PAGE_SIZE:
+            with self._stream_lock:
+                if self._stream is None:
+                    self._stream = GzipReader(self.path, self.index)
+                self._stream.seek(start)
+                return self._stream.read(stop - start)
+        first = start // PAGE_SIZE
+        with self._page_lock:
+            data = b"".join(self._page(i) for i in range(first, (stop - 1) // PAGE_SIZE + 1))
+        return data[start - first * PAGE_SIZE:stop - first * PAGE_SIZE]
+
+    def _page(self, number):
+        page = self._pages.pop(number, None)
+        if page is None:
+            if self._page_reader is None:
+                self._page_reader = GzipReader(self.path, self.index)
+            self._page_reader.seek(number * PAGE_SIZE)
+            page = self._page_reader.read(PAGE_SIZE)
+        self._pages[number] = page
+        while len(self._pages) > MAX_PAGES:
+            self._pages.popitem(last=False)
+        return page
+
+    def copy(self):
+        """같은 색인을 쓰는 새 버퍼 (다른 스레드용 저장소, LineStore.snapshot())"""
+        return GzipBuffer(self.path, self.index)
+
+    def close(self):
+        for reader in (self._page_reader, self._stream):
+            if reader is not None:
+                reader.close()
+        self._page_reader = self._stream = None
+        self._pages.clear()
+
+
+_shared_lock = threading.Lock()
+_shared_indexes = OrderedDict()
+
+
+def shared_index(path):
+    """같은 파일(경로, 크기, 수정 시각)이면 세션 동안 같은 체크포인트 색인을 돌려줍니다."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _shared_lock:
+        index = _shared_indexes.pop(key, None)
+        if index is None:
+            index = GzipIndex()
+        _shared_indexes[key] = index
+        while len(_shared_indexes) > MAX_SHARED_INDEXES:
+            _shared_indexes.popitem(last=False)
+        return index
+
+
+def open_indexed(path, mode="rb"):
+    """공유 색인을 쓰는 GzipReader를 엽니다. (gzip.open 대신 사용, .tar.gz 멤버 이동)"""
+    if mode != "rb":
+        raise ValueError("open_indexed supports only 'rb'")
+    return GzipReader(path, shared_index(path))
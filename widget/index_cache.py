@@ -0,0 +1,209 @@
+import json
+import os
+import struct
+from array import array
+
+# 색인 캐시 폴더 이름 (설정 파일과 같은 위치)
+INDEX_CACHE_DIR = ".log_viewer_cache"
+# 캐시 폴더 전체 크기 한도 (바이트)
+INDEX_CACHE_BUDGET = 1024 * 1024 * 1024
+# 파일 식별 해시에 쓰는 앞/뒤 내용 크기
+SAMPLE_SIZE = 64 * 1024
+
+# 파일 머리: 형식 표시(8바이트) + 머리글(JSON) 길이
+_MAGIC = b"LVIDX001"
+_PREFIX = struct.Struct("<8sI")
+
+
+def file_key(path):
+    """
+    파일 식별 키: 절대 경로, 크기, 수정 시각과 앞/뒤 SAMPLE_SIZE 바이트 내용의 해시.
+    반환: (키, 크기)
+    """
+    import hashlib
+    st = os.stat(path)
+    h = hashlib.sha1(f"{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}".encode("utf-8", "surrogateescape"))
+    with open(path, "rb") as f:
+        h.update(f.read(SAMPLE_SIZE))
+        if st.st_size > SAMPLE_SIZE:
+            f.seek(max(SAMPLE_SIZE, st.st_size - SAMPLE_SIZE))
+            h.update(f.read(SAMPLE_SIZE))
+    return h.hexdigest(), st.st_size
+
+
+class IndexEntry:
+    """
+    캐시 파일 하나. 열 때는 머리글만 읽고, 각 부분(줄 오프셋, 타임스탬프, 단어 비트맵, .gz 체크포인트)은
+    필요할 때 그 부분만 읽습니다.
+    """
+    def __init__(self, path, header, data_start):
+        self.path = path
+        self.header = header
+        self._data_start = data_start
+        # (단어, 대소문자 무시) -> (계산된 줄 수, 위치, 크기) - 처음 찾을 때 만듦
+        self._terms = None
+
+    @property
+    def line_count(self):
+        return self.header["line_count"]
+
+    @property
+    def max_line_length(self):
+        return self.header["max_line_length"]
+
+    def _read(self, start, size):
+        with open(self.path, "rb") as f:
+            f.seek(self._data_start + start)
+            data = f.read(size)
+        if len(data) != size:
+            raise ValueError(f"Truncated index cache file: {self.path}")
+        return data
+
+    def offsets(self):
+        """줄 시작 오프셋 배열 (LineStore.offsets와 같은 형식)"""
+        offsets = array("q")
+        offsets.frombytes(self._read(*self.header["offsets"]))
+        return offsets
+
+    def times(self):
+        """(타임스탬프 형식 이름, 줄별 시각 배열, 오름차순 여부), 없으면 None"""
+        times = self.header.get("times")
+        if times is None:
+            return None
+        values = array("d")
+        values.frombytes(self._read(times["start"], times["size"]))
+        return times["format"], values, times["monotonic"]
+
+    def checkpoints(self):
+        """.gz 파일의 체크포인트 색인 (GzipIndex.to_bytes() 형식), 없으면 None"""
+        checkpoints = self.header.get("checkpoints")
+        if checkpoints is None:
+            return None
+        return self._read(*checkpoints)
+
+    def term_keys(self):
+        return [(term, is_case_i) for term, is_case_i, *_ in self.header["terms"]]
+
+    def term_bits(self, key):
+        """(단어, 대소문자 무시) 항목의 (비트셋, 계산된 줄 수), 없으면 None"""
+        if self._terms is None:
+            self._terms = {(term, is_case_i): (covered, start, size)
+                           for term, is_case_i, covered, start, size in self.header["terms"]}
+        found = self._terms.get(tuple(key))
+        if found is None:
+            return None
+        covered, start, size = found
+        return int.from_bytes(self._read(start, size), "little"), covered
+
+
+class IndexCache:
+    """
+    파일별 색인을 캐시 폴더에 (키.idx) 저장해 두고, 같은 파일을 다시 열 때 읽기/줄 나누기/필터링을 건너뜁니다.
+    파일은 [형식 표시, 머리글 길이][머리글 JSON][각 부분의 원본 바이트] 형식이며,
+    폴더 크기가 한도를 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다(LRU, 파일 수정 시각 기준).
+    """
+    def __init__(self, directory, budget=INDEX_CACHE_BUDGET):
+        self.directory = directory
+        self.budget = budget
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + ".idx")
+
+    def load(self, path):
+        """파일의 캐시 항목(IndexEntry)을 반환합니다. 없거나 파일이 바뀌었으면 None."""
+        try:
+            key, size = file_key(path)
+            entry_path = self._entry_path(key)
+            if not os.path.exists(entry_path):
+                return None
+            with open(entry_path, "rb") as f:
+                magic, header_size = _PREFIX.unpack(f.read(_PREFIX.size))
+                if magic != _MAGIC:
+                    return None
+                header = json.loads(f.read(header_size).decode("utf-8"))
+            if header.get("key") != key or header.get("size") != size:
+                return None
+            # 최근에 쓴 항목으로 표시
+            os.utime(entry_path)
+            return IndexEntry(entry_path, header, _PREFIX.size + header_size)
+        except (OSError, ValueError) as e:
+            print(f"Error reading index cache: {e}")
+            return None
+
+    def save(self, path, offsets, max_line_length, times=None, terms=None, checkpoints=None):
+        """
+        파일의 색인을 저장합니다. 파일 크기가 색인된 크기와 다르면 (읽는 동안 바뀜) 저장하지 않습니다.
+        times: (형식 이름, 줄별 시각 배열, 오름차순 여부)
+        terms: {(단어, 대소문자 무시): (비트셋, 계산된 줄 수)}
+        checkpoints: .gz 파일의 체크포인트 색인 (GzipIndex) - 줄 오프셋은 풀어낸 내용 기준이므로
+                     파일 크기 대신 끝까지 풀어낸 크기와 비교 (끝까지 풀지 않았으면 저장하지 않음)
+        """
+        try:
+            key, size = file_key(path)
+            if (size if checkpoints is None else checkpoints.size) != offsets[-1]:
+                return False
+            parts = []
+            position = 0
+
+            def add(data):
+                nonlocal position
+                parts.append(data)
+                position += len(data)
+                return position - len(data), len(data)
+
+            header = {
+                "key": key,
+                "path": os.path.abspath(path),
+                "size": size,
+                "line_count": len(offsets) - 1,
+                "max_line_length": max_line_length,
+                "offsets": add(offsets.tobytes()),
+                "terms": [],
+            }
+            if times is not None:
+                fmt_name, values, monotonic = times
+                start, length = add(values.tobytes())
+                header["times"] = {"format": fmt_name, "monotonic": monotonic, "start": start, "size": length}
+            if checkpoints is not None:
+                header["checkpoints"] = add(checkpoints.to_bytes())
+            for (term, is_case_i), (bits, covered) in (terms or {}).items():
+                # 마지막으로 걸린 줄까지만 저장 (뒤쪽 0은 읽을 때 그대로 0, 안 걸린 단어는 0바이트)
+                data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+                header["terms"].append([term, is_case_i, covered, *add(data)])
+
+            encoded = json.dumps(header).encode("utf-8")
+            os.makedirs(self.directory, exist_ok=True)
+            # 다 쓴 뒤 이름을 바꿔, 쓰다 만 파일을 읽는 일이 없게 함
+            import tempfile
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_PREFIX.pack(_MAGIC, len(encoded)))
+                    f.write(encoded)
+                    for data in parts:
+                        f.write(data)
+                os.replace(tmp_path, self._entry_path(key))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+            self._evict(key)
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Error writing index cache: {e}")
+            return False
+
+    def _evict(self, keep):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".idx"):
+                continue
+            st = os.stat(os.path.join(self.directory, name))
+            entries.append((st.st_mtime, st.st_size, name))
+        usage = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if usage <= self.budget:
+                break
+            if name == keep + ".idx":
+                continue
+            os.remove(os.path.join(self.directory, name))
+            usage -= size
@@ -0,0 +1,294 @@
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from .gzip_index import GzipBuffer
+
+# 색인/필터링 시 한 번에 읽는 바이트 크기
+CHUNK_SIZE = 16 * 1024 * 1024
+
+_INC = (1).__add__
+
+
+class LineIndexer:
+    """바이트 덩어리를 순서대로 받아 줄 시작 오프셋 배열을 만드는 클래스"""
+    def __init__(self, offsets=None, size=0):
+        # offsets[i] = i번째 줄의 시작 바이트, 마지막 원소는 다음 줄이 시작될 위치
+        self.offsets = offsets if offsets is not None else array("q", [0])
+        self.size = size
+        self.max_line_length = 0
+
+    def feed(self, data):
+        """이어지는 바이트를 받아, 줄바꿈으로 끝난 줄들의 오프셋을 추가합니다."""
+        base = self.size
+        self.size += len(data)
+
+        cut = data.rfind(b"\n") + 1
+        if not cut:
+            return
+        parts = data[:cut].split(b"\n")
+        parts.pop()  # 마지막 줄바꿈 뒤의 빈 조각
+
+        lengths = list(map(len, parts))
+        # 첫 조각은 이전 덩어리에서 넘어온 미완성 줄과 이어집니다.
+        first = base + lengths[0] - self.offsets[-1]
+        self.max_line_length = max(self.max_line_length, first, max(lengths))
+
+        ends = accumulate(map(_INC, lengths), initial=base)
+        next(ends)
+        self.offsets.extend(ends)
+
+    def finish(self):
+        """줄바꿈 없이 끝난 마지막 줄을 닫습니다."""
+        if self.offsets[-1] < self.size:
+            self.max_line_length = max(self.max_line_length, self.size - self.offsets[-1])
+            self.offsets.append(self.size)
+        return self.offsets
+
+    def take(self):
+        """마지막으로 take()한 이후 추가된 오프셋만 떼어 반환합니다. (점진적 로딩용)"""
+        new_offsets = self.offsets[1:]
+        self.offsets = array("q", [self.offsets[-1]])
+        return new_offsets
+
+
+class LineStore:
+    """
+    로그 원본을 바이트 버퍼(mmap, bytes 또는 GzipBuffer)와 줄 오프셋 배열로 보관합니다.
+    줄 텍스트는 화면 표시/필터/내보내기 시점에만 디코딩합니다.
+    """
+    def __init__(self, buf=b"", offsets=None, max_line_length=0, file=None, spilled=False, path=None,
+                 release=None, source_names=None, source_tags=None, cache_path=None, checkpoints=None):
+        self._buf = buf
+        self._file = file
+        # True면 압축 해제 내용을 임시 파일(_file)에 풀어 쓰는 중
+        self.spilled = spilled
+        # 내용이 담긴 파일 경로 (다른 프로세스가 직접 열어 읽을 수 있음, 메모리 저장소는 None)
+        self.path = path
+        # 닫을 때 임시 파일을 지우는 대신 호출할 함수 (아카이브 멤버 캐시가 파일을 관리)
+        self._release = release
+        # 여러 파일을 합친 저장소: 원본 이름 목록, 줄마다 원본 번호 (array('B'))
+        self.source_names = source_names
+        self.source_tags = source_tags
+        # 디스크 색인 캐시의 키가 되는 원본 파일 (사용자가 연 일반 파일과 .gz 파일, 그 외 None)
+        self.cache_path = cache_path
+        # .gz의 체크포인트 색인 (GzipIndex, 색인을 캐시에 저장할 때 함께 넘김)
+        self.checkpoints = checkpoints
+        self.offsets = offsets if offsets is not None else array("q", [0])
+        self.max_line_length = max_line_length
+
+    # --- 생성 ---
+
+    @classmethod
+    def from_bytes(cls, data):
+        """메모리의 바이트로 저장소를 만듭니다."""
+        indexer = LineIndexer()
+        indexer.feed(data)
+        return cls(data, indexer.finish(), indexer.max_line_length)
+
+    @classmethod
+    def from_lines(cls, lines):
+        """(오류 메시지 등) 짧은 문자열 리스트로 저장소를 만듭니다."""
+        return cls.from_bytes("".join(lines).encode("utf-8"))
+
+    @classmethod
+    def for_source(cls, source):
+        """
+        아직 색인되지 않은 빈 저장소를 만듭니다. 내용은 extend()로 채워집니다.
+        일반 파일은 원본을 mmap으로 열고, 압축 원본은 임시 파일에 풀어 씁니다.
+        디스크 캐시에 체크포인트가 있던 .gz는 풀어 쓰지 않고 읽는 부분만 가까운 체크포인트에서 풉니다.
+        """
+        if source.path is None and source.checkpoints is not None and source.checkpoints.size is not None:
+            return cls(GzipBuffer(source.cache_path, source.checkpoints),
+                       cache_path=source.cache_path, checkpoints=source.checkpoints)
+        if source.spill_path is not None:
+            # 아카이브 멤버: 캐시 파일에 바로 풀어 씀 (끝까지 읽으면 다음에 그대로 재사용)
+            return cls(file=open(source.spill_path, "w+b"), spilled=True, path=source.spill_path,
+                       release=source.release)
+        if source.path is None:
+            # 필터 작업자 프로세스도 열 수 있도록 이름 있는 임시 파일 사용 (close()에서 삭제)
+            # (tempfile은 압축 원본을 처음 열 때 가져옴 - 시작 시간 단축)
+            import tempfile
+            fd, path = tempfile.mkstemp(prefix="log_viewer_", suffix=".tmp")
+            return cls(file=os.fdopen(fd, "w+b"), spilled=True, path=path,
+                       source_names=source.names, source_tags=source.tags,
+                       cache_path=source.cache_path, checkpoints=source.checkpoints)
+
+        f = open(source.path, "rb")
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                # 빈 파일도 핸들은 유지 (이어 쓰이는 내용을 extend()로 다시 mmap)
+                return cls(file=f, path=source.path, cache_path=source.cache_path)
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        return cls(buf, file=f, path=source.path, cache_path=source.cache_path)
+
+    @classmethod
+    def from_source(cls, source):
+        """원본 스트림을 끝까지 읽으며 색인한 저장소를 만듭니다. (동기 로딩)"""
+        store = cls.for_source(source)
+        try:
+            indexer = LineIndexer()
+            while True:
+                data = source.read(CHUNK_SIZE)
+                if not data:
+                    break
+                store.spill(data)
+                indexer.feed(data)
+            store.extend(indexer.finish()[1:], indexer.size, indexer.max_line_length)
+        except Exception:
+            store.close()
+            raise
+        return store
+
+    def spill(self, data):
+        """압축 원본이면 풀어낸 바이트를 임시 파일 끝에 씁니다. (로딩 스레드에서 호출)"""
+        if self.spilled:
+            self._file.write(data)
+            self._file.flush()
+
+    def extend(self, offsets, size, max_line_length=0):
+        """새로 색인된 줄 오프셋을 추가하고, 파일이 커졌으면 다시 mmap합니다. (임시 파일, 따라가기 모드)"""
+        if self._file is not None and size > len(self._buf):
+            if isinstance(self._buf, mmap.mmap):
+                self._buf.close()
+            self._buf = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        self.offsets.extend(offsets)
+        self.max_line_length = max(self.max_line_length, max_line_length)
+
+    def snapshot(self):
+        """
+        다른 스레드에서 읽을 수 있는, 현재 색인된 범위까지의 저장소를 만듭니다.
+        원본 파일을 따로 mmap하므로 이 저장소가 다시 mmap되거나 닫혀도 영향이 없습니다.
+        (줄 오프셋 배열은 공유하며, 뒤에 추가만 되므로 앞부분은 그대로 유효)
+        """
+        size = self.offsets[-1]
+        if isinstance(self._buf, GzipBuffer):
+            # 같은 체크포인트 색인으로 따로 풀어 읽음
+            return LineStore(self._buf.copy(), self.offsets, self.max_line_length)
+        if not isinstance(self._buf, mmap.mmap) or self.path is None or size == 0:
+            return LineStore(self._buf, self.offsets, self.max_line_length)
+        f = open(self.path, "rb")
+        try:
+            buf = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        return LineStore(buf, self.offsets, self.max_line_length, file=f, path=self.path)
+
+    def drop_unterminated_line(self):
+        """
+        마지막 줄이 줄바꿈 없이 끝났다면 색인에서 빼고 True를 반환합니다.
+        (따라가기 모드에서 이어 쓰이는 줄을 완성된 뒤 다시 색인하기 위해 사용)
+        """
+        if len(self) and self._buf[self.offsets[-1] - 1:self.offsets[-1]] != b"\n":
+            self.offsets.pop()
+            return True
+        return False
+
+    def close(self):
+        """mmap과 파일 핸들을 닫습니다."""
+        if isinstance(self._buf, (mmap.mmap, GzipBuffer)):
+            self._buf.close()
+        self._buf = b""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.spilled and self._release is not None:
+            self._release(self.path)
+        elif self.spilled and self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                print(f"Error removing temp file: {e}")
+        self.path = None
+        self.offsets = array("q", [0])
+
+    # --- 조회 ---
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def line(self, index):
+        """한 줄을 디코딩해 (줄바꿈 없이) 반환합니다. (음수는 뒤에서부터, 범위 밖이면 IndexError)"""
+        o = self.offsets
+        if index < 0:
+            index += len(o) - 1
+        if not 0 <= index < len(o) - 1:
+            raise IndexError("line index out of range")
+        data = self._buf[o[index]:o[index + 1]]
+        return data.decode("utf-8", errors="ignore").rstrip("\r\n")
+
+    def lines(self, indices):
+        """여러 줄을 디코딩해 리스트로 반환합니다."""
+        return [self.line(i) for i in indices]
+
+    def byte_range(self, start, stop):
+        """[start, stop) 줄 범위의 바이트 위치를 반환합니다."""
+        return self.offsets[start], self.offsets[stop]
+
+    def read(self, a, b):
+        """[a, b) 바이트 위치의 원본 바이트를 반환합니다."""
+        return self._buf[a:b]
+
+    def raw(self, start, stop):
+        """[start, stop) 줄 범위의 원본 바이트를 반환합니다."""
+        a, b = self.byte_range(start, stop)
+        return self._buf[a:b]
+
+    def iter_chunks(self, start=0, stop=None, chunk_size=CHUNK_SIZE):
+        """[start, stop) 줄 범위를 줄 경계에 맞춘 (첫 줄 번호, 끝 줄 번호, 바이트) 덩어리로 돌려줍니다."""
+        o = self.offsets
+        stop = len(self) if stop is None else stop
+        line = start
+        while line < stop:
+            end = bisect_right(o, o[line] + chunk_size, line + 1, stop + 1) - 1
+            if end <= line:
+                end = line + 1  # 덩어리보다 긴 한 줄
+            yield line, end, self._buf[o[line]:o[end]]
+            line = end
+
+    def iter_lines(self, start=0, stop=None, chunk_size=CHUNK_SIZE):
+        """(줄 번호, 텍스트)를 덩어리 단위로 디코딩하며 순서대로 돌려줍니다."""
+        for first, end, data in self.iter_chunks(start, stop, chunk_size):
+            text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n")
+            yield from zip(range(first, end), text.split("\n"))
+
+
+class CaseFoldShadow:
+    """
+    저장소 내용을 bytes.lower()로 바꾼 사본 (임시 파일 mmap).
+    ASCII만 바꾸므로 길이가 같아 원본의 줄 오프셋을 그대로 씁니다.
+    대소문자 무시 단어를 찾을 때마다 원본을 다시 소문자로 바꾸지 않기 위해 사용합니다.
+    """
+    def __init__(self):
+        import tempfile
+        self._file = tempfile.TemporaryFile()
+        self._buf = b""
+        self.size = 0
+
+    def sync(self, store):
+        """저장소에 새로 색인된 부분까지 사본을 이어 씁니다."""
+        end = store.offsets[-1]
+        if end <= self.size:
+            return
+        for start in range(self.size, end, CHUNK_SIZE):
+            self._file.write(store.read(start, min(end, start + CHUNK_SIZE)).lower())
+        self._file.flush()
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._buf = mmap.mmap(self._file.fileno(), end, access=mmap.ACCESS_READ)
+        self.size = end
+
+    def read(self, a, b):
+        return self._buf[a:b]
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._buf = b""
+        self._file.close()
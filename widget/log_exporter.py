@@ -0,0 +1,160 @@
+import os
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 한 번에 읽고 쓰는 최대 크기
+EXPORT_CHUNK_SIZE = 16 * 1024 * 1024
+# 이보다 긴 연속 구간만 커널 안에서 복사 (짧은 구간은 시스템 호출 비용이 더 큼)
+ZERO_COPY_MIN = 256 * 1024
+# gzip으로 내보낼 때의 압축 수준 (속도 우선)
+EXPORT_GZIP_LEVEL = 6
+
+
+def line_runs(rows):
+    """오름차순 원본 인덱스(range 또는 배열)를 연속된 [start, stop) 구간들로 묶어 돌려줍니다."""
+    if isinstance(rows, range):
+        if rows:
+            yield rows.start, rows.stop
+        return
+    start = prev = None
+    for line in rows:
+        if prev is None or line != prev + 1:
+            if start is not None:
+                yield start, prev + 1
+            start = line
+        prev = line
+    if start is not None:
+        yield start, prev + 1
+
+
+def _zero_copy_methods():
+    """이 OS에서 쓸 수 있는 커널 복사 함수들 (우선순위 순)"""
+    methods = []
+    if hasattr(os, "copy_file_range"):
+        methods.append(lambda src, dst, offset, count: os.copy_file_range(src, dst, count, offset))
+    if hasattr(os, "sendfile"):
+        methods.append(lambda src, dst, offset, count: os.sendfile(dst, src, offset, count))
+    return methods
+
+
+class ExportWorker(QThread):
+    """
+    필터된 뷰의 줄을 원본 바이트에서 바로 파일로 내보내는 스레드.
+    - 줄 텍스트를 디코딩하거나 전체를 메모리에 모으지 않고, 연속된 줄 구간 단위로 씁니다.
+    - 줄 번호 없이 내보내는 긴 구간은 copy_file_range/sendfile로 커널 안에서 복사합니다.
+      (지원하지 않는 OS나 파일 시스템이면 mmap에서 읽어 씀)
+    - gzip이면 쓰면서 바로 압축합니다.
+    취소되거나 실패하면 쓰던 파일을 지웁니다.
+    """
+    # 진행률 (0~100)
+    progress = pyqtSignal(int)
+    # (끝까지 썼는지, 오류 메시지)
+    export_finished = pyqtSignal(bool, str)
+
+    def __init__(self, store, rows, path, line_numbers=False, compress=False):
+        """
+        store: 이 스레드 전용 저장소 (LineStore.snapshot(), 끝나면 닫음)
+        rows: 내보낼 원본 줄 번호 (range 또는 오름차순 배열, 내보내는 동안 바뀌지 않아야 함)
+        """
+        super().__init__()
+        self.store = store
+        self.rows = rows
+        self.path = path
+        self.line_numbers = line_numbers
+        self.compress = compress
+        self._methods = _zero_copy_methods()
+
+    def cancel(self):
+        self.requestInterruption()
+        self.wait()
+
+    def run(self):
+        completed, error = False, ""
+        try:
+            with open(self.path, "wb") as f:
+                if self.compress:
+                    import gzip
+                    with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=EXPORT_GZIP_LEVEL) as out:
+                        completed = self._write(out, None)
+                else:
+                    completed = self._write(f, f)
+        except Exception as e:
+            error = str(e)
+            print(f"Error exporting log: {e}")
+        finally:
+            self.store.close()
+            if not completed:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+            self.export_finished.emit(completed, error)
+
+    def _write(self, out, raw):
+        """
+        줄 구간을 순서대로 씁니다. 중간에 취소되면 False를 반환합니다.
+        raw: 커널 복사에 쓸 (압축하지 않는) 출력 파일, 없으면 항상 일반 쓰기
+        """
+        store = self.store
+        src = None
+        if raw is not None and not self.line_numbers and store.path is not None and self._methods:
+            src = open(store.path, "rb")
+        try:
+            total = max(1, len(self.rows))
+            done = percent = 0
+            for start, stop in line_runs(self.rows):
+                if self.isInterruptionRequested():
+                    return False
+                if self.line_numbers:
+                    for first, end, data in store.iter_chunks(start, stop, EXPORT_CHUNK_SIZE):
+                        out.write(_numbered(first, data))
+                        if self.isInterruptionRequested():
+                            return False
+                else:
+                    a, b = store.byte_range(start, stop)
+                    if src is not None and b - a >= ZERO_COPY_MIN:
+                        out.flush()
+                        a += self._zero_copy(src.fileno(), raw.fileno(), a, b - a)
+                    for pos in range(a, b, EXPORT_CHUNK_SIZE):
+                        out.write(store.read(pos, min(b, pos + EXPORT_CHUNK_SIZE)))
+                        if self.isInterruptionRequested():
+                            return False
+                done += stop - start
+                if done * 100 // total != percent:
+                    percent = done * 100 // total
+                    self.progress.emit(percent)
+            return True
+        finally:
+            if src is not None:
+                src.close()
+
+    def _zero_copy(self, src, dst, offset, count):
+        """
+        src 파일의 [offset, offset + count) 바이트를 dst 파일의 현재 위치에 커널 안에서 복사하고,
+        복사한 바이트 수를 반환합니다. 실패한 방법은 이후 다시 시도하지 않습니다. (나머지는 호출자가 씀)
+        """
+        done = 0
+        while done < count and self._methods:
+            try:
+                n = self._methods[0](src, dst, offset + done, min(count - done, EXPORT_CHUNK_SIZE))
+            except OSError:
+                n = 0
+            if n <= 0:
+                # 이 파일 시스템에서 지원하지 않음 - 다음 방법으로
+                self._methods.pop(0)
+                continue
+            done += n
+            if self.isInterruptionRequested():
+                break
+        return done
+
+
+def _numbered(first, data):
+    """덩어리의 줄마다 화면과 같은 줄 번호(" {n:>6} | ")를 붙입니다. (원본 바이트, 줄바꿈 유지)"""
+    lines = data.split(b"\n")
+    last = lines.pop()
+    result = b"".join(b" %6d | %s\n" % (first + i + 1, line) for i, line in enumerate(lines))
+    if last:
+        # 줄바꿈 없이 끝난 파일의 마지막 줄
+        result += b" %6d | %s" % (first + len(lines) + 1, last)
+    return result
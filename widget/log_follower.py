@@ -0,0 +1,85 @@
+import os
+from array import array
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from .line_store import LineIndexer
+
+# 파일 크기를 확인하는 주기 (ms)
+FOLLOW_INTERVAL = 500
+# 한 번에 읽는 최대 바이트 (한꺼번에 많이 쌓였으면 나눠 읽어 UI가 멈추지 않게 함)
+FOLLOW_READ_SIZE = 4 * 1024 * 1024
+
+
+def _file_id(st):
+    return st.st_dev, st.st_ino
+
+
+class LogFollower(QObject):
+    """
+    열려 있는 로그 파일 끝에 추가되는 내용을 주기적으로 읽는 감시자 (tail -f).
+    파일 크기만 확인하므로 파일이 아무리 커져도 새로 추가된 바이트만 읽습니다.
+    줄바꿈으로 끝난 줄만 보내고, 쓰는 중인 마지막 줄은 완성될 때까지 기다립니다.
+    """
+    # (새 줄 오프셋, 읽은 바이트 위치, 최대 줄 길이) - LogLoader.chunk_loaded와 같은 형식
+    lines_appended = pyqtSignal(object, int, int)
+    # 파일이 잘렸거나(truncate) 다른 파일로 바뀐(rotate) 경우 - 처음부터 다시 읽어야 함
+    file_reset = pyqtSignal()
+
+    def __init__(self, path, position, parent=None):
+        """position: 이미 색인된 바이트 위치 (줄 경계)"""
+        super().__init__(parent)
+        self.path = path
+        self._file = open(path, "rb")
+        self._file_id = _file_id(os.fstat(self._file.fileno()))
+        self.indexer = LineIndexer(array("q", [position]), position)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(FOLLOW_INTERVAL)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        """감시를 멈추고 파일을 닫습니다."""
+        self.timer.stop()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def poll(self):
+        """파일 상태를 확인하고, 추가된 바이트가 있으면 읽어 색인합니다."""
+        if self._file is None:
+            return
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            # 로테이션 도중 잠시 파일이 없을 수 있으므로 다음 확인까지 기다림
+            return
+
+        position = self.indexer.size
+        if _file_id(st) != self._file_id or st.st_size < position:
+            # 다른 파일로 바뀌었거나 내용이 잘림
+            self.stop()
+            self.file_reset.emit()
+            return
+        if st.st_size == position:
+            return
+
+        try:
+            self._file.seek(position)
+            data = self._file.read(min(st.st_size - position, FOLLOW_READ_SIZE))
+        except OSError as e:
+            print(f"Error reading log file: {e}")
+            return
+        if not data:
+            return
+
+        self.indexer.feed(data)
+        offsets = self.indexer.take()
+        if len(offsets):
+            self.lines_appended.emit(offsets, self.indexer.size, self.indexer.max_line_length)
+        if self.indexer.size < st.st_size:
+            # 아직 읽을 내용이 남았으면 다음 주기를 기다리지 않고 이어서 읽음
+            QTimer.singleShot(0, self.poll)
@@ -0,0 +1,139 @@
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .archive import archive_kind, list_members
+from .core_logic import open_log_source, open_merged_source, cached_offsets, error_lines
+from .line_store import LineStore, LineIndexer
+from .perf import recorder
+
+# 첫 화면을 바로 보여주기 위해 첫 덩어리는 작게 읽음
+FIRST_CHUNK_SIZE = 256 * 1024
+LOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class LogLoader(QThread):
+    """로그 파일을 백그라운드에서 덩어리 단위로 읽어 색인하는 스레드"""
+    # 아카이브면 (멤버 목록, 여는 멤버 이름) - 저장소보다 먼저 보냄
+    members_listed = pyqtSignal(object, str)
+    # 색인 전의 빈 저장소 (GUI 스레드가 LogDataManager에 연결)
+    store_ready = pyqtSignal(object)
+    # (새 줄 오프셋, 누적 바이트 크기, 최대 줄 길이)
+    chunk_loaded = pyqtSignal(object, int, int)
+    # 진행률 (0~100)
+    progress = pyqtSignal(int)
+    # 취소 여부
+    load_finished = pyqtSignal(bool)
+
+    def __init__(self, path, member=None, cache=None, index_cache=None):
+        """
+        path: 파일 경로 (경로 목록이면 타임스탬프 순서로 합쳐 읽음)
+        member: 아카이브에서 열 멤버 이름 (없으면 첫 파일)
+        cache: 풀어 둔 멤버를 재사용할 MemberCache
+        index_cache: 전에 연 파일의 줄 오프셋을 재사용할 IndexCache
+        """
+        super().__init__()
+        self.path = path
+        self.member = member
+        self.cache = cache
+        self.index_cache = index_cache
+
+    def cancel(self):
+        """로딩을 중단하고 스레드가 끝날 때까지 기다립니다."""
+        self.requestInterruption()
+        self.wait()
+
+    def run(self):
+        try:
+            if isinstance(self.path, (list, tuple)):
+                source = open_merged_source(self.path)
+            else:
+                if archive_kind(self.path) is not None:
+                    # 목록은 압축 해제 없이 읽음 (같은 아카이브는 캐시에서 재사용)
+                    members = self.cache.members(self.path) if self.cache is not None else list_members(self.path)
+                    names = [m.name for m in members]
+                    member = self.member if self.member in names else (names[0] if names else "")
+                    self.members_listed.emit(members, member)
+                    self.member = member
+                source = open_log_source(self.path, self.member, self.cache)
+            # 캐시에서 .gz 체크포인트를 찾은 뒤 저장소를 만듦 (있으면 풀어 쓰지 않는 저장소)
+            cached = cached_offsets(source, self.index_cache)
+            store = LineStore.for_source(source)
+        except Exception as e:
+            # 오류 발생 시, 오류 메시지를 뷰어에 표시
+            print(f"Error loading log file: {e}")
+            path = ", ".join(self.path) if isinstance(self.path, (list, tuple)) else self.path
+            self.store_ready.emit(LineStore.from_lines(error_lines(path, e)))
+            self.load_finished.emit(False)
+            return
+
+        self.store_ready.emit(store)
+
+        if cached is not None:
+            # 전에 연 파일: 읽지 않고 저장해 둔 줄 오프셋을 한 덩어리로 보냄
+            source.close()
+            offsets, max_line_length = cached
+            self.chunk_loaded.emit(offsets[1:], offsets[-1], max_line_length)
+            self.progress.emit(100)
+            self.load_finished.emit(False)
+            return
+
+        indexer = LineIndexer()
+        chunk_size = FIRST_CHUNK_SIZE
+        # 성능 표시용: 읽기(압축 원본은 압축 해제 포함)와 색인에 든 시간
+        read_time = index_time = 0.0
+        stage = "decompress" if source.path is None else "read"
+        try:
+            while not self.isInterruptionRequested():
+                started = time.perf_counter()
+                data = source.read(chunk_size)
+                read_time += time.perf_counter() - started
+                if not data:
+                    break
+                # 압축 원본이면 임시 파일에 먼저 쓰고(flush) 나서 색인 결과를 보냄
+                started = time.perf_counter()
+                store.spill(data)
+                indexer.feed(data)
+                index_time += time.perf_counter() - started
+                self.chunk_loaded.emit(indexer.take(), indexer.size, indexer.max_line_length)
+                if source.total:
+                    self.progress.emit(min(100, source.position * 100 // source.total))
+                chunk_size = LOAD_CHUNK_SIZE
+        except Exception as e:
+            # 읽은 부분까지는 그대로 표시
+            print(f"Error loading log file: {e}")
+        finally:
+            source.close()
+            recorder.record(stage, read_time, bytes=indexer.size)
+            recorder.record("index", index_time, bytes=indexer.size)
+
+        # 줄바꿈 없이 끝난 마지막 줄
+        indexer.finish()
+        self.chunk_loaded.emit(indexer.take(), indexer.size, indexer.max_line_length)
+        self.load_finished.emit(self.isInterruptionRequested())
+
+class TimeIndexLoader(QThread):
+    """줄별 타임스탬프 색인을 백그라운드에서 만드는 스레드"""
+    # 끝까지 색인했는지 (취소되면 False)
+    index_ready = pyqtSignal(bool)
+
+    def __init__(self, store, index, parallel=None):
+        """store: 이 스레드 전용 저장소 (LineStore.snapshot(), 끝나면 닫음)"""
+        super().__init__()
+        self.store = store
+        self.index = index
+        self.parallel = parallel
+
+    def cancel(self):
+        self.requestInterruption()
+        self.wait()
+
+    def run(self):
+        done = False
+        try:
+            done = self.index.extend(self.store, len(self.store), self.isInterruptionRequested, self.parallel)
+        except Exception as e:
+            print(f"Error indexing timestamps: {e}")
+        finally:
+            self.store.close()
+        self.index_ready.emit(done)
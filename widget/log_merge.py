@@ -0,0 +1,135 @@
+import os
+from array import array
+from bisect import bisect_right
+
+from .timestamps import detect_format
+
+# 원본마다 한 번에 읽는 크기
+MERGE_READ_SIZE = 1024 * 1024
+# 한 뷰로 합칠 수 있는 최대 파일 수 (줄마다 원본 번호를 1바이트로 보관)
+MAX_MERGE_SOURCES = 255
+
+
+class _MergeInput:
+    """합칠 원본 하나: 읽어 둔 줄과 그 타임스탬프 (덩어리 단위로 채움)"""
+    def __init__(self, source):
+        self.source = source
+        self.fmt = None
+        self.detected = False
+        self.last = float("-inf")
+        self.rest = b""
+        self.lines = []
+        self.keys = []
+        self.pos = 0
+        self.exhausted = False
+
+    def pending(self):
+        return len(self.lines) - self.pos
+
+    def fill(self):
+        """읽어 둔 줄을 다 썼으면 다음 덩어리를 읽어 줄/타임스탬프를 채웁니다."""
+        while not self.pending() and not self.exhausted:
+            data = self.source.read(MERGE_READ_SIZE)
+            if data:
+                lines = (self.rest + data).split(b"\n")
+                self.rest = lines.pop()
+            else:
+                # 줄바꿈 없이 끝난 마지막 줄
+                self.exhausted = True
+                lines = [self.rest] if self.rest else []
+                self.rest = b""
+            if not self.detected and (lines or self.exhausted):
+                # 형식은 원본마다 첫 덩어리에서 한 번만 판단 (아직 줄바꿈이 오지 않은 줄도 함께 봄)
+                self.fmt = detect_format(lines + [self.rest])
+                self.detected = True
+            if self.fmt is not None:
+                keys = self.fmt.parse_lines(lines, self.last)
+            else:
+                keys = [self.last] * len(lines)
+            if keys:
+                self.last = keys[-1]
+            self.lines, self.keys, self.pos = lines, keys, 0
+
+    def take(self, horizon, force=False):
+        """타임스탬프가 horizon 이하인 앞쪽 줄들을 꺼냅니다. (force: 없으면 한 줄이라도)"""
+        end = bisect_right(self.keys, horizon, self.pos)
+        if end == self.pos and force:
+            end = self.pos + 1
+        lines, keys = self.lines[self.pos:end], self.keys[self.pos:end]
+        self.pos = end
+        return lines, keys
+
+
+class MergedSource:
+    """
+    여러 로그 원본을 타임스탬프 순서로 합치는 스트림 (k-way merge).
+    원본마다 덩어리 단위로 읽으며 합치므로 파일 전체를 메모리에 올리지 않습니다.
+    - 모든 원본이 읽어 둔 범위의 마지막 시각 중 가장 이른 시각까지는 순서가 확정되므로,
+      그 앞의 줄들을 한꺼번에 안정 정렬로 합칩니다. (각 원본은 이미 정렬된 구간이라 거의 선형)
+    - 타임스탬프가 없는 줄(스택 트레이스 등)은 바로 앞 줄의 시각을 따라 함께 움직입니다.
+    - 시각이 같으면 먼저 지정한 원본의 줄이 앞에 옵니다.
+    합친 줄마다 원본 번호를 tags에 기록합니다. (LogSource와 같은 방식으로 읽음)
+    """
+    def __init__(self, sources, names):
+        if len(sources) > MAX_MERGE_SOURCES:
+            raise ValueError(f"Too many files to merge (max {MAX_MERGE_SOURCES}).")
+        self.sources = sources
+        self.names = names
+        self.total = sum(source.total for source in sources)
+        # 합친 내용은 임시 파일에 풀어 씀
+        self.path = None
+        self.spill_path = None
+        self.release = None
+        # 합친 뷰는 디스크 색인 캐시에 남기지 않음
+        self.cache_path = None
+        self.checkpoints = None
+        # 합친 n번째 줄의 원본 번호 (로딩 스레드에서 늘어남)
+        self.tags = array("B")
+        self._inputs = [_MergeInput(source) for source in sources]
+
+    def read(self, size):
+        """합친 줄을 size 바이트 이상 모아 돌려줍니다. (모든 줄은 줄바꿈으로 끝남)"""
+        parts = []
+        n = 0
+        while n < size:
+            for inp in self._inputs:
+                inp.fill()
+            active = [(i, inp) for i, inp in enumerate(self._inputs) if inp.pending()]
+            if not active:
+                break
+            # 아직 끝나지 않은 원본이 읽어 둔 마지막 시각 중 가장 이른 시각까지 확정
+            lead = min((inp for _, inp in active if not inp.exhausted), key=lambda inp: inp.keys[-1], default=None)
+            horizon = lead.keys[-1] if lead is not None else float("inf")
+
+            lines, keys, tags = [], [], bytearray()
+            for i, inp in active:
+                # 시각을 확정한 원본은 순서가 어긋난 줄이 있어도 멈추지 않도록 최소 한 줄은 꺼냄
+                taken, taken_keys = inp.take(horizon, inp is lead)
+                lines += taken
+                keys += taken_keys
+                tags += bytes([i]) * len(taken)
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            lines = [lines[k] for k in order]
+            self.tags.extend(bytes(tags[k] for k in order))
+            lines.append(b"")
+            data = b"\n".join(lines)
+            parts.append(data)
+            n += len(data)
+        return b"".join(parts)
+
+    @property
+    def position(self):
+        return sum(source.position for source in self.sources)
+
+    def close(self):
+        for source in self.sources:
+            source.close()
+
+
+def merge_names(paths):
+    """합친 뷰에 표시할 원본 이름 (같은 파일 이름이 있으면 상위 폴더까지)"""
+    names = [os.path.basename(path) for path in paths]
+    return [
+        os.path.join(os.path.basename(os.path.dirname(path)), name) if names.count(name) > 1 else name
+        for path, name in zip(paths, names)
+    ]
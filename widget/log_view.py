@@ -1,197 +1,797 @@
 # log_view.py
 import re
-from PyQt5.QtWidgets import QPlainTextEdit
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from PyQt5.QtWidgets import QAbstractScrollArea, QApplication
 from PyQt5.QtGui import (
-    QColor, QTextCharFormat, QFont, QSyntaxHighlighter,
-    QTextDocument, QTextCursor
+    QColor, QFont, QPainter, QKeySequence
 )
-from PyQt5.QtCore import Qt, QRegExp
+from PyQt5.QtCore import Qt, QEvent, QTimer
 
-# --- Highlighter 클래스 (변경 없음) ---
-class Highlighter(QSyntaxHighlighter):
-    def __init__(self, parent=None):
-        super().__init__(parent)
+from .filter_engine import literal_pattern
+from .minimap import MinimapScrollBar, bucket_edges, bin_bits, bin_sorted
+from .perf import recorder
+
+# " 123456 | " (10자)
+LINE_NUM_WIDTH = 10
+TAB_WIDTH = 4
+# 화면에 표시된 줄 텍스트 캐시 크기 (줄 수)
+ROW_CACHE_SIZE = 2000
+# 이보다 긴 줄은 보이는 열만 잘라서 그림
+LONG_LINE = 4096
+# 북마크 표시 막대 너비 (px)
+BOOKMARK_WIDTH = 4
+# 여러 파일을 합친 뷰에서 원본별 줄 번호 색
+SOURCE_COLORS = ["#4fc1ff", "#f0a30a", "#9cdc5a", "#d670d6", "#ff6b6b", "#4ec9b0", "#dcdcaa", "#c0c0ff"]
+# 스크롤바 미니맵을 다시 세기 전에 모으는 시간 (ms) - 로딩 중 덩어리마다 세지 않도록
+MINIMAP_DELAY = 200
+# 하이라이트 규칙이 이보다 많으면 규칙별 정규식 그룹 대신 후보 위치에서 단어 사전으로 확인
+MAX_PATTERN_RULES = 32
+
+
+# --- Highlighter 클래스 ---
+class Highlighter:
+    """
+    하이라이트 규칙들을 정규식 하나로 합쳐, 한 줄을 한 번만 훑어 강조 구간을 계산합니다.
+    - 소문자로 바꾼 줄에서 모든 단어의 대체(|) 하나로 후보 위치를 찾고,
+      그 위치에서만 규칙마다 (?=(?P<rN>단어N))? 로 실제로 걸렸는지 함께 확인합니다.
+    - 규칙이 많으면 (단어 목록을 가져온 경우) 후보 위치를 트라이 정규식으로 찾고,
+      그 위치에서 시작하는 단어를 (단어 길이별) 사전에서 찾습니다.
+    - 구간이 겹치면 뒤의 규칙이 앞의 규칙을 덮습니다. (우선순위 = 규칙 순서)
+    """
+    def __init__(self):
         self.highlight_rules = []
+        # 후보 위치 찾기 (소문자 텍스트용, 대소문자 구분 없는 단순 대체라 빠름)
+        self.guard = None
+        # 한 위치에서 규칙별로 걸렸는지 확인
+        self.pattern = None
+        # 소문자 변환으로 길이가 바뀌는 줄에 쓰는 (느린) 한 번 훑기 패턴
+        self.full_pattern = None
+        # 규칙이 많을 때: 소문자 단어 -> [(규칙 번호, 단어, 대소문자 무시)], 확인할 단어 길이 목록
+        self.by_lower = None
+        self.lengths = []
+        self._alternatives = []
 
     def set_rules(self, rules_list):
         """
         rules_list: [{"term": str, "color": QColor, "is_case_i": bool}, ...]
         """
         self.highlight_rules = []
+        alternatives = []
+        lowered = []
+        terms = []
         for rule in rules_list:
             term = rule["term"]
-            color = rule["color"]
-            is_case_i = rule["is_case_i"]
-            
-            fmt = QTextCharFormat()
-            fmt.setBackground(color)
-            
-            flags = re.IGNORECASE if is_case_i else 0
-            
+            if not term:
+                continue
+            # 일반 텍스트 검색 (이스케이프 처리), 대소문자 무시는 규칙별 인라인 플래그로
+            alternatives.append(f"(?i:{re.escape(term)})" if rule["is_case_i"] else re.escape(term))
+            lowered.append(re.escape(term.lower()))
+            terms.append((term, rule["is_case_i"]))
+            # 색상 객체는 규칙을 바꿀 때 한 번만 만듦
+            self.highlight_rules.append(QColor(rule["color"]))
+
+        self.guard = self.pattern = self.full_pattern = self.by_lower = None
+        self._alternatives = alternatives
+        if len(alternatives) > MAX_PATTERN_RULES:
+            # 수천 개의 그룹을 위치마다 시도하지 않도록 사전으로 확인 (한 번 훑기 패턴은 필요할 때 만듦)
+            self.by_lower = {}
+            for rule, (term, is_case_i) in enumerate(terms):
+                self.by_lower.setdefault(term.lower(), []).append((rule, term, is_case_i))
+            self.lengths = sorted({len(term) for term in self.by_lower})
+            self.guard = literal_pattern(self.by_lower)
+        elif alternatives:
+            groups = "".join(f"(?=(?P<r{i}>{alt}))?" for i, alt in enumerate(alternatives))
             try:
-                # 일반 텍스트 검색 (이스케이프 처리)
-                pattern = re.compile(re.escape(term), flags)
-                self.highlight_rules.append((pattern, fmt))
+                # 긴 단어가 먼저 시도되도록 정렬 (후보 위치만 필요하므로 순서는 결과와 무관)
+                self.guard = re.compile("|".join(sorted(set(lowered), key=len, reverse=True)))
+                self.pattern = re.compile(groups)
+                self.full_pattern = re.compile(f"(?=(?:{'|'.join(alternatives)})){groups}")
             except re.error as e:
-                print(f"Error compiling: {term} -> {e}")
-        
-        self.rehighlight()
-
-    def highlightBlock(self, text):
-        # 줄 번호 서식 (회색)
-        line_num_format = QTextCharFormat()
-        line_num_format.setForeground(QColor("#888888"))
-        # " 123456 | " (10자)
-        self.setFormat(0, 10, line_num_format)
-
-        # 하이라이트 규칙 적용
-        for pattern, fmt in self.highlight_rules:
-            for match in pattern.finditer(text):
-                start, end = match.span(0)
-                # 줄 번호 영역(0~10)은 덮어쓰지 않음
-                if start >= 10:
-                    self.setFormat(start, end - start, fmt)
+                print(f"Error compiling highlight rules: {e}")
+                self.highlight_rules = []
+                self.guard = self.pattern = self.full_pattern = None
+
+    def highlight_line(self, text):
+        """[(시작, 끝, 배경색), ...] 겹치지 않는 구간 리스트를 위치 순서대로 반환합니다."""
+        if self.guard is None:
+            return []
+
+        # 규칙마다 이전 결과가 끝난 위치 (규칙별로는 기존처럼 겹치지 않게 찾음)
+        next_pos = [0] * len(self.highlight_rules)
+        spans = []
+        for start, end, rule in self._hits(text):
+            if start >= next_pos[rule]:
+                next_pos[rule] = end
+                spans.append((start, end, rule))
+        if not spans:
+            return []
+        return self._resolve(spans)
+
+    def _hits(self, text):
+        """어느 규칙이든 시작하는 위치 순서대로, 그 위치에서 걸린 (시작, 끝, 규칙)을 돌려줍니다."""
+        low = text.lower()
+        if len(low) != len(text) or self.by_lower is None:
+            for match in self._matches(text, low):
+                for name, value in match.groupdict().items():
+                    if value:
+                        yield (*match.span(name), int(name[1:]))
+            return
+        search, by_lower, lengths = self.guard.search, self.by_lower, self.lengths
+        candidate = search(low)
+        while candidate is not None:
+            pos = candidate.start()
+            for length in lengths:
+                end = pos + length
+                if end > len(low):
+                    break
+                for rule, term, is_case_i in by_lower.get(low[pos:end], ()):
+                    if is_case_i or text.startswith(term, pos):
+                        yield pos, end, rule
+            candidate = search(low, pos + 1)
+
+    def _matches(self, text, low):
+        """어느 규칙이든 시작하는 위치마다, 규칙별 결과가 그룹에 담긴 match를 돌려줍니다."""
+        if len(low) != len(text):
+            if self.full_pattern is None:
+                groups = "".join(f"(?=(?P<r{i}>{alt}))?" for i, alt in enumerate(self._alternatives))
+                self.full_pattern = re.compile(f"(?=(?:{'|'.join(self._alternatives)})){groups}")
+            yield from self.full_pattern.finditer(text)
+            return
+        search, match_at = self.guard.search, self.pattern.match
+        candidate = search(low)
+        while candidate is not None:
+            pos = candidate.start()
+            yield match_at(text, pos)
+            candidate = search(low, pos + 1)
+
+    def _resolve(self, spans):
+        """겹치는 구간을 경계마다 잘라, 가장 뒤의 규칙 색만 남기고 같은 색의 이웃 구간은 합칩니다."""
+        points = sorted({p for start, end, _ in spans for p in (start, end)})
+        result = []
+        for a, b in zip(points, points[1:]):
+            rule = max((r for start, end, r in spans if start <= a and b <= end), default=-1)
+            if rule < 0:
+                continue
+            color = self.highlight_rules[rule]
+            if result and result[-1][1] == a and result[-1][2] is color:
+                result[-1] = (result[-1][0], b, color)
+            else:
+                result.append((a, b, color))
+        return result
 
 
 # --- LogView 클래스 ---
-class LogView(QPlainTextEdit):
-    """로그 텍스트를 표시하고 검색/하이라이트를 담당하는 뷰"""
+class LogView(QAbstractScrollArea):
+    """
+    로그 텍스트를 표시하고 검색/하이라이트를 담당하는 뷰.
+    필터링된 원본 인덱스 리스트만 들고, 화면에 보이는 줄만 디코딩해서 그립니다.
+    """
     def __init__(self):
         super().__init__()
-        self.setReadOnly(True)
-        self.setFont(QFont("Courier New", 10))
-        
-        self.highlighter = Highlighter(self.document())
-        
-        self.search_results = []
-        self.search_index = -1
-        self.last_search_term = ""
-
-        # --- [핵심 수정] 원본 줄 번호(key)와 뷰 줄 번호(value) 매핑 ---
-        self.original_to_displayed_map = {} 
-        # --- [여기까지] ---
-
-
-    # --- [핵심 수정] set_log_data 메서드 ---
-    def set_log_data(self, filtered_data):
-        """(인덱스, 라인) 리스트를 받아 줄 번호와 함께 텍스트를 설정합니다."""
-        
-        # [수정] 매핑 초기화
-        self.original_to_displayed_map.clear()
-        
-        # 1. 텍스트 조립 및 매핑 생성
-        display_lines = []
-        # 'displayed_index'는 0부터 시작하는 필터링된 뷰의 줄 번호
-        for displayed_index, (original_index, line) in enumerate(filtered_data):
-            
-            # [수정] 원본 인덱스(0-based) -> 표시된 인덱스(0-based)
-            self.original_to_displayed_map[original_index] = displayed_index
-            
-            line_text = line.rstrip("\n")
-            line_num = f"{original_index+1:>6}" # 원본 인덱스+1
-            display_lines.append(f" {line_num} | {line_text}")
-        
-        # 2. 텍스트 설정
-        self.setPlainText("\n".join(display_lines))
-        
-        # 3. 하이라이트 및 검색 상태 초기화
-        self.clear_manual_formats()
-        self.highlighter.rehighlight() # 하이라이트 재적용
-        self.search_results.clear()
-        self.search_index = -1
-    # --- [여기까지 수정] ---
+        self.highlighter = Highlighter()
+        self.line_num_color = QColor("#888888")
+        self.match_bg = QColor("#00ff00")
+        self.match_fg = QColor("#000000")
+        # 현재 결과가 아닌 나머지 검색 결과 배경
+        self.other_match_bg = QColor("#806000")
+        self.bookmark_color = QColor("#3d8eff")
+        self.source_colors = [QColor(c) for c in SOURCE_COLORS]
+
+        self.store = None
+        # 뷰의 n번째 줄 -> 원본 인덱스 (오름차순)
+        self.rows = range(0)
+        self._row_cache = {}
+        # 뷰 줄 번호 -> 하이라이트 구간 (규칙이 바뀌면 비움)
+        self._span_cache = {}
+        self._prefetch_pending = False
+        # 성능 표시용: 아직 기록하지 않은 하이라이트 계산 시간(초)과 줄 수
+        self._highlight_time = 0.0
+        self._highlight_lines = 0
+        # 가로 스크롤 범위 계산용 최대 열 수 (탭 확장으로 늘어나면 갱신)
+        self.max_columns = 0
+
+        # 선택 영역 (뷰 줄 번호, 0-based)
+        self.cursor_row = -1
+        self.anchor_row = -1
+
+        # 북마크: 원본 인덱스 (오름차순), 필터가 바뀌어도 그대로 유지
+        self.bookmarks = array("q")
+
+        # 현재 검색 결과: (뷰 줄 번호, 시작 열, 끝 열) - 탭 확장 기준, 없으면 None
+        self.current_match = None
+        # 전체 검색 결과 (lines, cols 오름차순 배열과 length를 가진 객체, 예: SearchEngine)
+        # 문서를 바꾸지 않고 그리기 단계에서 보이는 줄의 결과만 찾아 덧그림
+        self.search_matches = None
+
+        # 스크롤바 미니맵: 하이라이트/검색 결과/북마크가 몰린 구간 표시
+        self.minimap = MinimapScrollBar()
+        self.minimap.bookmark_color = self.bookmark_color
+        self.setVerticalScrollBar(self.minimap)
+        # [(단어, 대소문자 무시), ...] -> {항목: 뷰에 보이는 줄 중 단어가 들어 있는 줄의 비트셋} (MainWindow가 지정)
+        self.term_bitmaps = None
+        # 활성 하이라이트 [(단어, 대소문자 무시, 색), ...]
+        self.highlight_terms = []
+        # 구간 경계(원본 인덱스)와 층별 구간 개수 캐시 - 경계가 바뀔 때만 모두 다시 셈
+        self._minimap_edges = None
+        self._minimap_counts = {}
+        self._minimap_timer = QTimer(self)
+        self._minimap_timer.setSingleShot(True)
+        self._minimap_timer.setInterval(MINIMAP_DELAY)
+        self._minimap_timer.timeout.connect(self._update_minimap)
+
+        font = QFont("Courier New", 10)
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self._update_metrics()
+
+    # --- 데이터 설정 ---
+
+    def set_log_data(self, store, filtered_indices):
+        """원본 저장소와 필터를 통과한 원본 인덱스 리스트를 설정합니다. 보이는 줄만 다시 그립니다."""
+        self.store = store
+        self.rows = filtered_indices
+        self._clear_row_cache()
+        self.max_columns = store.max_line_length
+
+        self.cursor_row = -1
+        self.anchor_row = -1
+        self.current_match = None
+
+        self._update_scrollbars()
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self.viewport().update()
+        self._invalidate_minimap()
+
+    def extend_log_data(self, filtered_indices):
+        """로딩 중 새로 들어온 (필터를 통과한) 원본 인덱스를 뷰 끝에 추가합니다. 스크롤 위치는 유지됩니다."""
+        if not len(filtered_indices):
+            return
+        rows = self.rows
+        if isinstance(rows, range) and isinstance(filtered_indices, range) \
+                and (not rows or rows.stop == filtered_indices.start):
+            # 필터가 없으면 range 하나로 유지 (메모리 사용 없음)
+            self.rows = range(rows.start if rows else filtered_indices.start, filtered_indices.stop)
+        else:
+            if isinstance(rows, range):
+                self.rows = array("q", rows)
+            self.rows.extend(filtered_indices)
+
+        self.max_columns = max(self.max_columns, self.store.max_line_length)
+        self._update_scrollbars()
+        self.viewport().update()
+        self._invalidate_minimap()
+
+    def truncate_log_data(self, stop):
+        """원본 인덱스가 stop 이상인 줄을 뷰에서 뺍니다. (따라가기 모드에서 다시 받을 마지막 줄)"""
+        rows = self.rows
+        if isinstance(rows, range):
+            self.rows = range(rows.start, max(rows.start, min(rows.stop, stop)))
+        else:
+            del rows[bisect_left(rows, stop):]
+        self._clear_row_cache()
+        self.cursor_row = min(self.cursor_row, len(self.rows) - 1)
+        self.anchor_row = min(self.anchor_row, len(self.rows) - 1)
+        self.clear_search_highlights()
+        self._update_scrollbars()
+        self._invalidate_minimap()
+
+    def is_at_bottom(self):
+        """마지막 줄까지 스크롤되어 있는지 확인합니다."""
+        bar = self.verticalScrollBar()
+        return bar.value() >= bar.maximum()
+
+    def scroll_to_bottom(self):
+        bar = self.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def update_search_matches(self, *args):
+        """검색 결과가 늘거나 바뀌면 보이는 줄만 다시 그립니다."""
+        self.viewport().update()
+        self._invalidate_minimap("search")
 
     def update_highlight_rules(self, rules_list):
         """Highlighter에 새 규칙을 적용합니다."""
         self.highlighter.set_rules(rules_list)
+        # 보이는 줄(과 미리 계산해 둘 주변 줄)만 다시 계산됨
+        self._span_cache.clear()
+        self.viewport().update()
+        # 미니맵은 새로 추가된 단어만 세고 나머지는 캐시에서 씀
+        self.highlight_terms = [
+            (rule["term"], rule["is_case_i"], QColor(rule["color"])) for rule in rules_list if rule["term"]
+        ]
+        self._invalidate_minimap("highlight")
+
+    def row_count(self):
+        return len(self.rows)
+
+    def _clear_row_cache(self):
+        self._row_cache.clear()
+        self._span_cache.clear()
+
+    # --- 미니맵 ---
+
+    def _invalidate_minimap(self, layer=None):
+        """
+        미니맵을 잠시 뒤 다시 셉니다.
+        layer가 없으면 (뷰 줄이 바뀜) 모든 층을, 있으면 그 층만 다시 셉니다. ("highlight"는 새 단어만)
+        """
+        if layer is None:
+            self._minimap_edges = None
+            self._minimap_counts.clear()
+        elif layer != "highlight":
+            self._minimap_counts.pop(layer, None)
+        if not self._minimap_timer.isActive():
+            self._minimap_timer.start()
+
+    def _update_minimap(self):
+        """
+        층마다 구간(스크롤바 픽셀 줄)별 개수를 세어 미니맵에 넘깁니다.
+        줄을 하나씩 훑지 않고, 하이라이트는 단어 비트셋의 구간별 비트 수로,
+        검색 결과/북마크는 정렬된 배열에서 구간 경계의 이진 탐색으로 셉니다.
+        """
+        buckets = min(self.minimap.bucket_count(), self.row_count())
+        if self.store is None or buckets <= 0:
+            self.minimap.set_marks([], None, None)
+            return
+        edges = self._minimap_edges
+        if edges is None or len(edges) != buckets + 1:
+            edges = self._minimap_edges = bucket_edges(self.rows, buckets)
+            self._minimap_counts.clear()
+        counts = self._minimap_counts
+
+        highlights = []
+        if self.term_bitmaps is not None:
+            # 아직 세지 않은 단어는 한 번에 가져옴 (캐시에 없는 단어가 많아도 파일은 한 번만 훑음)
+            missing = list(dict.fromkeys(
+                (term, is_case_i) for term, is_case_i, _ in self.highlight_terms
+                if ("highlight", term, is_case_i) not in counts))
+            bitmaps = self.term_bitmaps(missing) if missing else {}
+            if bitmaps is not None:
+                for (term, is_case_i), bits in bitmaps.items():
+                    counts[("highlight", term, is_case_i)] = bin_bits(bits, edges)
+            # 세지 못한 단어 (필터 계산 중)는 다음 갱신 때 다시 셈
+            for term, is_case_i, color in self.highlight_terms:
+                key = ("highlight", term, is_case_i)
+                if key in counts:
+                    highlights.append((color, counts[key]))
+
+        matches = self.search_matches
+        if matches is not None and len(matches.lines):
+            if "search" not in counts:
+                counts["search"] = bin_sorted(matches.lines, edges)
+        else:
+            counts.pop("search", None)
+        if self.bookmarks and "bookmarks" not in counts:
+            # 필터에 가려진 북마크는 이동할 때처럼 건너뜀
+            visible = array("q", (line for line in self.bookmarks if self.row_of_line(line) >= 0))
+            counts["bookmarks"] = bin_sorted(visible, edges)
+        self.minimap.set_marks(highlights, counts.get("search"), counts.get("bookmarks") if self.bookmarks else None)
+
+    def _row_spans(self, row, text):
+        """뷰 줄의 하이라이트 구간을 (캐시해 두고) 반환합니다."""
+        spans = self._span_cache.get(row)
+        if spans is None:
+            spans = self._span_cache[row] = self._highlight(text)
+        return spans
+
+    def _highlight(self, text):
+        started = time.perf_counter()
+        spans = self.highlighter.highlight_line(text)
+        self._highlight_time += time.perf_counter() - started
+        self._highlight_lines += 1
+        return spans
+
+    def _record_highlight(self):
+        """모아 둔 하이라이트 계산 시간을 "rehighlight" 단계로 기록합니다."""
+        if self._highlight_lines:
+            recorder.record("rehighlight", self._highlight_time, lines=self._highlight_lines)
+            self._highlight_time = 0.0
+            self._highlight_lines = 0
+
+    def _row_matches(self, row):
+        """뷰 줄에 있는 검색 결과의 (시작 열, 끝 열) 리스트 (탭 확장 기준)."""
+        matches = self.search_matches
+        if matches is None or not len(matches.lines):
+            return []
+        lines, original = matches.lines, self.rows[row]
+        i = bisect_left(lines, original)
+        if i >= len(lines) or lines[i] != original:
+            return []
+        raw = self.store.line(original)
+        if "\t" not in raw:
+            raw = None
+        result = []
+        while i < len(lines) and lines[i] == original:
+            start, end = matches.cols[i], matches.cols[i] + matches.length
+            if raw is not None:
+                start, end = len(raw[:start].expandtabs(TAB_WIDTH)), len(raw[:end].expandtabs(TAB_WIDTH))
+            result.append((start, end))
+            i += 1
+        return result
+
+    def _prefetch_rows(self):
+        """화면 바로 위/아래 한 화면 분량의 줄 텍스트와 하이라이트를 미리 계산해 둡니다."""
+        self._prefetch_pending = False
+        if self.store is None or not self.rows:
+            return
+        page = self._visible_row_count()
+        first = self.verticalScrollBar().value()
+        for row in range(max(0, first - page), min(self.row_count(), first + 2 * page)):
+            if row not in self._span_cache:
+                text = self._row_text(row)
+                if len(text) <= LONG_LINE:
+                    self._row_spans(row, text)
+        self._record_highlight()
+
+    def _row_text(self, row):
+        """뷰 줄 번호의 표시 텍스트(탭 확장)를 반환합니다."""
+        text = self._row_cache.get(row)
+        if text is None:
+            if len(self._row_cache) >= ROW_CACHE_SIZE:
+                self._clear_row_cache()
+            text = self.store.line(self.rows[row]).expandtabs(TAB_WIDTH)
+            self._row_cache[row] = text
+            if len(text) > self.max_columns:
+                self.max_columns = len(text)
+                QTimer.singleShot(0, self._update_scrollbars)
+        return text
+
+    # --- 스크롤/크기 ---
+
+    def _update_metrics(self):
+        fm = self.fontMetrics()
+        self.line_height = fm.lineSpacing()
+        self.char_width = fm.horizontalAdvance("M")
+        self.text_margin = 4
+
+    def _visible_row_count(self):
+        return max(1, self.viewport().height() // self.line_height)
+
+    def _update_scrollbars(self):
+        page = self._visible_row_count()
+        vbar = self.verticalScrollBar()
+        vbar.setRange(0, max(0, self.row_count() - page))
+        vbar.setPageStep(page)
+        vbar.setSingleStep(1)
+
+        content_width = (LINE_NUM_WIDTH + self.max_columns) * self.char_width + 2 * self.text_margin
+        hbar = self.horizontalScrollBar()
+        hbar.setRange(0, max(0, content_width - self.viewport().width()))
+        hbar.setPageStep(self.viewport().width())
+        hbar.setSingleStep(self.char_width)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+        # 스크롤바 높이가 바뀌면 구간 수도 바뀜
+        self._invalidate_minimap()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self._update_metrics()
+            self._update_scrollbars()
 
-    # ... (find_next 메서드는 변경 없음) ...
-    def find_next(self, term, find_flags):
-        if term != self.last_search_term or not self.search_results:
-            self.last_search_term = term
-            self.search_results.clear()
-            self.search_index = -1
-            
-            cursor = self.document().find(term, 0, find_flags)
-            while not cursor.isNull():
-                self.search_results.append(cursor)
-                cursor = self.document().find(term, cursor, find_flags)
-        
-        if not self.search_results:
-            return 0, 0
-            
-        self.search_index = (self.search_index + 1) % len(self.search_results)
-        
-        self.clear_manual_formats() 
-        self.highlighter.rehighlight() 
-        
-        current_cursor = self.search_results[self.search_index]
-        fmt = QTextCharFormat()
-        fmt.setBackground(QColor("#00ff00"))
-        fmt.setForeground(QColor("#000000"))
-        current_cursor.mergeCharFormat(fmt)
-        self.setTextCursor(current_cursor)
-        
-        return self.search_index + 1, len(self.search_results)
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def ensure_row_visible(self, row, center=False):
+        """뷰 줄 번호가 화면에 보이도록 세로 스크롤합니다."""
+        vbar = self.verticalScrollBar()
+        page = self._visible_row_count()
+        if center:
+            vbar.setValue(row - page // 2)
+        elif row < vbar.value():
+            vbar.setValue(row)
+        elif row >= vbar.value() + page:
+            vbar.setValue(row - page + 1)
+
+    def _ensure_column_visible(self, row, start, end):
+        fm = self.fontMetrics()
+        text = self._row_text(row)
+        x0 = self.text_margin + LINE_NUM_WIDTH * self.char_width
+        left = x0 + fm.horizontalAdvance(text[:start])
+        right = x0 + fm.horizontalAdvance(text[:end])
+        hbar = self.horizontalScrollBar()
+        width = self.viewport().width()
+        if left < hbar.value() + x0:
+            hbar.setValue(left - x0)
+        elif right > hbar.value() + width:
+            hbar.setValue(right - width + self.char_width)
+
+    # --- 그리기 ---
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        palette = self.viewport().palette()
+        painter.fillRect(event.rect(), palette.base())
+        if self.store is None or not self.rows:
+            return
+
+        started = time.perf_counter()
+        fm = self.fontMetrics()
+        lh = self.line_height
+        ascent = fm.ascent()
+        width = self.viewport().width()
+        first = self.verticalScrollBar().value()
+        last = min(self.row_count(), first + self.viewport().height() // lh + 2)
+        x_num = self.text_margin - self.horizontalScrollBar().value()
+        x_text = x_num + LINE_NUM_WIDTH * self.char_width
+        sel_lo, sel_hi = sorted((self.anchor_row, self.cursor_row))
+        current = self.current_match
+        text_color = palette.text().color()
+        tags = self.store.source_tags
+
+        for row in range(first, last):
+            y = (row - first) * lh
+            if sel_lo <= row <= sel_hi and sel_lo >= 0:
+                painter.fillRect(0, y, width, lh, palette.highlight())
+            if self.is_bookmarked(self.rows[row]):
+                painter.fillRect(0, y, BOOKMARK_WIDTH, lh, self.bookmark_color)
+
+            # 1. 줄 번호 (회색, 여러 파일을 합친 뷰는 원본별 색)
+            painter.setPen(self.line_num_color if tags is None else self.source_color(tags[self.rows[row]]))
+            painter.drawText(x_num, y + ascent, f" {self.rows[row]+1:>6} | ")
+
+            text = self._row_text(row)
+
+            # 2. 긴 줄은 화면에 들어오는 열만 그림
+            col0 = 0
+            long_line = len(text) > LONG_LINE
+            if long_line:
+                col0 = max(0, (-x_text) // self.char_width - 1)
+                text = text[:col0 + width // self.char_width + 2]
+            x0 = x_text + (fm.horizontalAdvance(text[:col0]) if col0 else 0)
+            visible = text[col0:]
+
+            def x_of(col):
+                return x0 + fm.horizontalAdvance(visible[:max(0, col - col0)])
+
+            # 3. 하이라이트 배경 (긴 줄은 잘라낸 부분만 계산)
+            spans = self._highlight(text) if long_line else self._row_spans(row, text)
+            for start, end, color in spans:
+                if end <= col0:
+                    continue
+                xs = x_of(start)
+                painter.fillRect(xs, y, x_of(end) - xs, lh, color)
+
+            # 4. 모든 검색 결과 (덧그리기만 하고 원본/캐시는 바꾸지 않음)
+            for start, end in self._row_matches(row):
+                if end > col0:
+                    xs = x_of(max(start, col0))
+                    painter.fillRect(xs, y, x_of(end) - xs, lh, self.other_match_bg)
+
+            # 5. 본문
+            painter.setPen(text_color)
+            painter.drawText(x0, y + ascent, visible)
+
+            # 6. 현재 검색 결과 (초록색)
+            if current is not None and current[0] == row and current[2] > col0:
+                start, end = max(current[1], col0), current[2]
+                xs = x_of(start)
+                painter.fillRect(xs, y, x_of(end) - xs, lh, self.match_bg)
+                painter.setPen(self.match_fg)
+                painter.drawText(xs, y + ascent, visible[start - col0:end - col0])
+
+        # 성능 표시: 그리기 전체 (하이라이트 계산 포함)와 그중 하이라이트 계산
+        recorder.record("render", time.perf_counter() - started, lines=last - first)
+        self._record_highlight()
+
+        # 스크롤에 대비해 주변 줄은 이벤트 처리 후 남는 시간에 미리 계산
+        if not self._prefetch_pending:
+            self._prefetch_pending = True
+            QTimer.singleShot(0, self._prefetch_rows)
+
+    def source_color(self, index):
+        """합친 뷰에서 원본 번호의 표시 색"""
+        return self.source_colors[index % len(self.source_colors)]
+
+    # --- 선택/키보드/마우스 ---
+
+    def _row_at(self, y):
+        row = self.verticalScrollBar().value() + y // self.line_height
+        return max(0, min(row, self.row_count() - 1))
+
+    def _set_cursor_row(self, row, keep_anchor=False):
+        if not self.rows:
+            return
+        row = max(0, min(row, self.row_count() - 1))
+        self.cursor_row = row
+        if not keep_anchor or self.anchor_row < 0:
+            self.anchor_row = row
+        self.ensure_row_visible(row)
+        self.viewport().update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.rows:
+            keep = bool(event.modifiers() & Qt.ShiftModifier)
+            self._set_cursor_row(self._row_at(event.pos().y()), keep_anchor=keep)
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton and self.rows:
+            y = event.pos().y()
+            if y < 0:
+                row = self.verticalScrollBar().value() - 1
+            elif y >= self.viewport().height():
+                row = self.verticalScrollBar().value() + self._visible_row_count()
+            else:
+                row = self._row_at(y)
+            self._set_cursor_row(row, keep_anchor=True)
+        super().mouseMoveEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            self.copy_selection()
+            return
+        if event.matches(QKeySequence.SelectAll):
+            if self.rows:
+                self.anchor_row = 0
+                self.cursor_row = self.row_count() - 1
+                self.viewport().update()
+            return
+
+        keep = bool(event.modifiers() & Qt.ShiftModifier)
+        page = self._visible_row_count()
+        row = self.cursor_row if self.cursor_row >= 0 else self.verticalScrollBar().value()
+        moves = {
+            Qt.Key_Up: row - 1,
+            Qt.Key_Down: row + 1,
+            Qt.Key_PageUp: row - page,
+            Qt.Key_PageDown: row + page,
+        }
+        if event.key() == Qt.Key_F2:
+            # Ctrl+F2: 북마크 토글, F2 / Shift+F2: 다음 / 이전 북마크
+            if event.modifiers() & Qt.ControlModifier:
+                self.toggle_bookmark()
+            else:
+                self.go_to_bookmark(forward=not keep)
+        elif event.key() in moves:
+            self._set_cursor_row(moves[event.key()], keep_anchor=keep)
+        elif event.key() == Qt.Key_Home and event.modifiers() & Qt.ControlModifier:
+            self._set_cursor_row(0, keep_anchor=keep)
+        elif event.key() == Qt.Key_End and event.modifiers() & Qt.ControlModifier:
+            self._set_cursor_row(self.row_count() - 1, keep_anchor=keep)
+        else:
+            super().keyPressEvent(event)
+
+    def copy_selection(self):
+        """선택된 줄들을 (줄 번호 포함, 화면 그대로) 클립보드에 복사합니다."""
+        if self.cursor_row < 0 or not self.rows:
+            return
+        lo, hi = sorted((self.anchor_row, self.cursor_row))
+        lines = [
+            f" {self.rows[row]+1:>6} | {self.store.line(self.rows[row])}"
+            for row in range(lo, hi + 1)
+        ]
+        QApplication.clipboard().setText("\n".join(lines))
+
+    # --- 검색 ---
+
+    def row_of_line(self, original_index):
+        """원본 인덱스가 뷰에 있으면 그 뷰 줄 번호를, 없으면 -1을 반환합니다."""
+        rows = self.rows
+        if isinstance(rows, range):
+            return original_index - rows.start if original_index in rows else -1
+        row = bisect_left(rows, original_index)
+        return row if row < len(rows) and rows[row] == original_index else -1
+
+    def show_match(self, original_index, start, length):
+        """
+        검색 결과(원본 줄 번호, 시작 열, 길이)로 이동해 초록색으로 표시합니다.
+        필터에 가려진 줄이면 (전체 파일 검색) 가장 가까운 줄로 이동만 합니다.
+        """
+        row = self.row_of_line(original_index)
+        if row < 0:
+            self.current_match = None
+            if self.rows:
+                row = max(0, bisect_right(self.rows, original_index) - 1)
+                self.cursor_row = self.anchor_row = row
+                self.ensure_row_visible(row, center=True)
+            self.viewport().update()
+            return False
+
+        # 열은 원본 텍스트 기준이므로 탭 확장 후의 열로 바꿈
+        line = self.store.line(original_index)
+        start_col = len(line[:start].expandtabs(TAB_WIDTH))
+        end_col = len(line[:start + length].expandtabs(TAB_WIDTH))
+        self.current_match = (row, start_col, end_col)
+
+        self.cursor_row = self.anchor_row = row
+        self.ensure_row_visible(row)
+        self._ensure_column_visible(row, start_col, end_col)
+        self.viewport().update()
+        return True
+
+    # --- 북마크/줄 이동 ---
+
+    def current_line(self):
+        """커서가 있는 줄(없으면 화면 맨 위 줄)의 원본 인덱스. 뷰가 비어 있으면 -1."""
+        if not self.rows:
+            return -1
+        row = self.cursor_row if self.cursor_row >= 0 else self.verticalScrollBar().value()
+        return self.rows[min(row, self.row_count() - 1)]
+
+    def jump_to_line(self, original_index):
+        """뷰에 있는 원본 줄로 커서를 옮기고 화면 가운데에 보이게 합니다."""
+        row = self.row_of_line(original_index)
+        if row < 0:
+            return False
+        self.cursor_row = self.anchor_row = row
+        self.ensure_row_visible(row, center=True)
+        self.viewport().update()
+        return True
+
+    def is_bookmarked(self, original_index):
+        i = bisect_left(self.bookmarks, original_index)
+        return i < len(self.bookmarks) and self.bookmarks[i] == original_index
+
+    def toggle_bookmark(self):
+        """커서가 있는 줄의 북마크를 켜고 끕니다."""
+        original = self.current_line()
+        if original < 0:
+            return
+        i = bisect_left(self.bookmarks, original)
+        if i < len(self.bookmarks) and self.bookmarks[i] == original:
+            del self.bookmarks[i]
+        else:
+            self.bookmarks.insert(i, original)
+        self.viewport().update()
+        self._invalidate_minimap("bookmarks")
+
+    def clear_bookmarks(self):
+        self.bookmarks = array("q")
+        self.viewport().update()
+        self._invalidate_minimap("bookmarks")
+
+    def go_to_bookmark(self, forward=True):
+        """
+        현재 줄 다음(이전) 북마크로 이동합니다. 끝에 닿으면 반대쪽 끝부터 다시 찾습니다.
+        필터에 가려진 북마크는 건너뜁니다.
+        """
+        marks = self.bookmarks
+        if not marks or not self.rows:
+            return False
+        current = self.current_line()
+        count = len(marks)
+        # 이진 탐색 한 번으로 시작 위치를 찾고, 가려진 북마크만큼만 (끝에서 되돌아) 넘어감
+        if forward:
+            start, step = bisect_right(marks, current), 1
+        else:
+            start, step = bisect_left(marks, current) - 1, -1
+        for k in range(count):
+            if self.jump_to_line(marks[(start + step * k) % count]):
+                return True
+        return False
 
     # --- [핵심 수정] go_to_line 메서드 (근사치 이동 기능 포함) ---
     def go_to_line(self, original_line_num): # 1-based
         """원본 줄 번호를 받아 해당 줄로 이동합니다. 없으면 근사치로 이동합니다."""
         target_original_index = original_line_num - 1 # 0-based
-        
-        if not self.original_to_displayed_map:
+
+        if not self.rows:
             return False # 뷰가 비어있음
 
-        # 1. 정확한 줄 번호가 뷰에 있는지 확인
-        displayed_line_index = self.original_to_displayed_map.get(target_original_index)
-        
-        if displayed_line_index is None:
-            # 2. (근사치 찾기) 뷰에 없음. 타겟보다 *작은* 라인 중 가장 큰(가까운) 라인을 찾음
-            # (딕셔너리 키는 원본 인덱스이므로 정렬되어 있음)
-            closest_original_index = -1
-            for index in self.original_to_displayed_map.keys():
-                if index < target_original_index:
-                    closest_original_index = index
-                else:
-                    # 타겟보다 큰 인덱스를 만났으므로, 바로 이전 인덱스가 근사치임
-                    break
-            
-            if closest_original_index != -1:
-                # 850번 줄을 찾음
-                displayed_line_index = self.original_to_displayed_map[closest_original_index]
-            else:
-                # 3. (근사치 찾기) 타겟보다 *작은* 라인이 없음 (예: 100번 입력, 뷰는 200번부터 시작)
-                # 그냥 뷰의 *첫 번째* 라인으로 이동
-                try:
-                    first_visible_original_index = next(iter(self.original_to_displayed_map))
-                    displayed_line_index = self.original_to_displayed_map[first_visible_original_index]
-                except StopIteration:
-                    return False # 맵이 완전히 비어있음
-            
-        # 4. 해당 뷰의 줄 번호로 커서 이동
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-        cursor.movePosition(QTextCursor.NextBlock, QTextCursor.MoveAnchor, displayed_line_index)
-        
-        self.setTextCursor(cursor)
-        self.centerCursor() # 커서 위치를 뷰의 중앙으로
-        
+        # 1. 타겟 이하인 원본 인덱스 중 가장 큰(가까운) 줄을 이진 탐색으로 찾음
+        # 2. 타겟보다 작은 줄이 없으면 뷰의 첫 번째 줄로 이동
+        displayed_line_index = max(0, bisect_right(self.rows, target_original_index) - 1)
+
+        # 3. 해당 뷰의 줄 번호로 커서 이동 후 중앙 정렬
+        self.cursor_row = self.anchor_row = displayed_line_index
+        self.ensure_row_visible(displayed_line_index, center=True)
+        self.viewport().update()
+
         self.setFocus() # 뷰 활성화
-        
+
         return True
     # --- [여기까지 수정] ---
 
-    def clear_manual_formats(self):
-        """수동으로 적용된 서식(초록색 검색)을 지웁니다."""
-        null_fmt = QTextCharFormat()
-        cursor = self.textCursor()
-        cursor.select(QTextCursor.Document)
-        cursor.setCharFormat(null_fmt)
-
     def clear_search_highlights(self):
-        """검색 하이라이트를 지우고 영구 하이라이트를 복원합니다."""
-        self.clear_manual_formats()
-        self.highlighter.rehighlight()
-        self.search_results.clear()
-        self.search_index = -1
-        self.last_search_term = ""
+        """검색 하이라이트를 지웁니다. (영구 하이라이트는 그리기 단계에서 유지됨)"""
+        self.current_match = None
+        self.viewport().update()
+        self._invalidate_minimap("search")
@@ -1,23 +1,78 @@
+import os
+import time
+from array import array
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, 
-    QLineEdit, QPushButton, QFileDialog, QMessageBox, QCheckBox
+    QLineEdit, QPushButton, QFileDialog, QMessageBox, QCheckBox,
+    QProgressBar, QComboBox, QProgressDialog, QLabel, QShortcut
 )
-from PyQt5.QtCore import QFileInfo, Qt
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import QEvent, QFileInfo, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QTextDocument, QKeySequence
 
+from .archive import archive_kind
 from .core_logic import LogDataManager, SettingsManager
+from .filter_expr import filter_tree
+from .index_cache import IndexCache, INDEX_CACHE_DIR
+from .log_merge import MAX_MERGE_SOURCES
 from .log_view import LogView
+from .log_loader import LogLoader, TimeIndexLoader
+from .log_exporter import ExportWorker
+from .log_follower import LogFollower
+from .perf import recorder, hud_text, resident_memory_mb
+from .search_engine import SearchEngine
 from .side_panel import SidePanel
+from .timestamps import NO_TIME, parse_time_input
+from .update_scheduler import UpdateScheduler
+
+# 성능 표시줄 갱신 주기 (ms)와 켜고 끄는 단축키
+PERF_HUD_INTERVAL = 500
+PERF_HUD_SHORTCUT = "F12"
 
 class MainWindow(QWidget):
-    def __init__(self, base_path):
+    # 창이 처음 그려졌을 때 (시작부터 걸린 초, started를 받지 않았으면 생성부터)
+    first_painted = pyqtSignal(float)
+
+    def __init__(self, base_path, started=None):
+        """started: 앱 시작 시각 (time.perf_counter) - 첫 화면까지 걸린 시간을 잴 때 기준"""
         super().__init__()
+        self.started = time.perf_counter() if started is None else started
         self.setWindowTitle("Log Viewer")
         self.resize(1200, 700)
 
         # 1. 로직 및 설정 관리자 생성
-        self.log_data = LogDataManager()
+        # 다시 여는 파일의 색인은 설정 파일 옆의 캐시 폴더에 보관
+        self.log_data = LogDataManager(index_cache=IndexCache(os.path.join(base_path, INDEX_CACHE_DIR)))
         self.settings = SettingsManager(base_path)
+        # 현재 뷰에 표시 중인 원본 라인 인덱스
+        self.filtered_indices = range(0)
+        # 같은 내용의 비트셋 (i번째 비트 = i번째 원본 줄 표시 여부, 필터가 없으면 None)
+        self.filtered_bits = None
+        # 하이라이트 이동용: 단어별 '보이는 걸린 줄' 정렬 배열과 그 배열을 만든 (저장소, 줄 수, 필터 비트셋)
+        self.highlight_lines = {}
+        self.highlight_lines_state = None
+        # 백그라운드 로딩 스레드
+        self.loader = None
+        # 따라가기(tail -f) 모드 감시자와 현재 파일 경로 (아카이브면 열린 멤버 이름도)
+        self.follower = None
+        self.current_path = None
+        self.current_member = None
+        # 백그라운드 검색 (결과는 원본 줄 번호/열 배열로 보관)
+        self.search_engine = SearchEngine(self)
+        # 필터/하이라이트/검색 변경을 프레임마다 한 번씩 모아 처리 (큰 파일의 필터는 백그라운드에서 계산)
+        self.updates = UpdateScheduler(self.log_data, self)
+        # 필터 계산 중이라 미룬 저장소 변경 [(함수, 인자), ...] - 계산이 끝나면 순서대로 적용
+        self.deferred_updates = []
+        # 타임스탬프 색인 스레드와 색인이 끝나면 적용할 시간 범위 입력
+        self.time_indexer = None
+        self.pending_time_range = None
+        # 내보내기 스레드와 진행률 대화상자
+        self.exporter = None
+        self.export_progress = None
+        # 성능 표시용: 신호로 끝나는 작업의 (시작 시각, 대상 줄 수), 진행 중이 아니면 None
+        self.load_timing = None
+        self.search_timing = None
+        self.export_timing = None
 
         # 2. UI 위젯 생성
         self.log_view = LogView()
@@ -31,9 +86,56 @@ class MainWindow(QWidget):
         self.file_btn.setFixedWidth(30)
         self.file_btn.setFixedHeight(30)
 
+        # 아카이브 멤버 선택 (아카이브를 열었을 때만 표시)
+        self.member_box = QComboBox()
+        self.member_box.setToolTip("Archive Member")
+        self.member_box.setFixedHeight(30)
+        self.member_box.setMaxVisibleItems(30)
+        self.member_box.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.member_box.setMinimumContentsLength(30)
+        self.member_box.hide()
+
+        # 여러 파일을 합친 뷰의 원본별 표시 켜기/끄기 (합친 뷰에서만 표시)
+        self.source_bar = QWidget()
+        self.source_layout = QHBoxLayout(self.source_bar)
+        self.source_layout.setContentsMargins(0, 0, 0, 0)
+        self.source_bar.hide()
+
+        # 로딩 진행률/취소 (로딩 중에만 표시)
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setFixedWidth(150)
+        self.load_progress.setFixedHeight(30)
+        self.load_progress.hide()
+
+        self.cancel_load_btn = QPushButton("✕")
+        self.cancel_load_btn.setToolTip("Cancel Loading")
+        self.cancel_load_btn.setFixedWidth(30)
+        self.cancel_load_btn.setFixedHeight(30)
+        self.cancel_load_btn.hide()
+
+        self.follow_btn = QPushButton("⏬")
+        self.follow_btn.setToolTip("Follow (tail -f)")
+        self.follow_btn.setCheckable(True)
+        self.follow_btn.setFixedWidth(30)
+        self.follow_btn.setFixedHeight(30)
+
+        # 성능 표시줄: 단계별 마지막 소요 시간과 메모리 (F12로 켜고 끔, 프로파일링 중에는 처음부터 표시)
+        self.perf_hud = QLabel()
+        self.perf_hud.setStyleSheet("color: #9cdc5a; font-family: 'Courier New'; font-size: 9pt;")
+        self.perf_hud.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.perf_timer = QTimer(self)
+        self.perf_timer.setInterval(PERF_HUD_INTERVAL)
+        self.perf_timer.timeout.connect(self.update_perf_hud)
+        self.set_perf_hud_visible(recorder.trace is not None)
+
         # 3. UI 레이아웃 조립
         top_layout = QHBoxLayout()
         top_layout.addWidget(self.file_path_box)
+        top_layout.addWidget(self.member_box)
+        top_layout.addWidget(self.load_progress)
+        top_layout.addWidget(self.cancel_load_btn)
+        top_layout.addWidget(self.follow_btn)
         top_layout.addWidget(self.file_btn)
         
         splitter = QSplitter(Qt.Horizontal)
@@ -44,23 +146,48 @@ class MainWindow(QWidget):
 
         main_layout = QVBoxLayout(self)
         main_layout.addLayout(top_layout)
+        main_layout.addWidget(self.source_bar)
         main_layout.addWidget(splitter)
+        main_layout.addWidget(self.perf_hud)
 
         self.setLayout(main_layout)
 
         # 4. 시그널/슬롯 연결 (핵심)
         self.file_btn.clicked.connect(self.on_open_file_dialog)
         self.file_path_box.returnPressed.connect(self.on_load_from_path)
+        self.cancel_load_btn.clicked.connect(self.on_cancel_load)
+        self.follow_btn.toggled.connect(self.on_follow_toggled)
+        self.member_box.activated.connect(self.on_member_selected)
         
         # 사이드 패널의 시그널을 메인 윈도우의 슬롯에 연결
         self.side_panel.filters_updated.connect(self.on_filters_changed)
         self.side_panel.highlights_updated.connect(self.on_highlights_changed)
         self.side_panel.export_requested.connect(self.on_export_log)
         self.side_panel.search_triggered.connect(self.on_search)
-        self.side_panel.search_cleared.connect(self.log_view.clear_search_highlights)
+        self.side_panel.search_cleared.connect(self.on_search_cleared)
+        self.side_panel.go_to_line_requested.connect(self.log_view.go_to_line)
+        self.side_panel.highlight_jump_requested.connect(self.on_highlight_jump)
+        self.side_panel.time_range_requested.connect(self.on_time_range_requested)
+        self.side_panel.time_range_cleared.connect(self.on_time_range_cleared)
+        self.search_engine.count_changed.connect(self.side_panel.search_widget.set_search_count)
+        self.search_engine.match_selected.connect(self.log_view.show_match)
+        # 모든 검색 결과는 뷰가 그릴 때 엔진의 배열에서 직접 찾아 덧그림
+        self.log_view.search_matches = self.search_engine
+        self.search_engine.count_changed.connect(self.log_view.update_search_matches)
+        self.search_engine.count_changed.connect(self.on_search_progress)
+        self.updates.filter_started.connect(self.on_filter_started)
+        self.updates.filters_ready.connect(self.on_filters_ready)
+        self.updates.highlights_due.connect(self.apply_highlights)
+        self.updates.search_due.connect(self.start_search)
+        self.updates.idle.connect(self.on_updates_idle)
+        QShortcut(QKeySequence(PERF_HUD_SHORTCUT), self, self.toggle_perf_hud)
+        # 스크롤바 미니맵의 하이라이트 층은 필터와 같은 단어별 비트맵 캐시에서 셈
+        self.log_view.term_bitmaps = self.visible_term_bitmaps
 
-        # 5. 설정 불러오기
-        self.load_settings()
+        # 5. 설정 불러오기: 창을 먼저 보여주고 처음 그려진 뒤에 불러옴
+        # (실행 인자로 받은 파일은 그 사이에 이미 읽기 시작함)
+        self.settings_restored = False
+        self.log_view.viewport().installEventFilter(self)
         
         # 6. 파일 드래그, 드롭 활성화
         self.setAcceptDrops(True)
@@ -68,28 +195,259 @@ class MainWindow(QWidget):
     # --- 슬롯 메서드 ---
     
     def on_open_file_dialog(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select Log File", "", "All Files (*.*);;Text Files (*.txt)")
-        if path:
-            self.file_path_box.setText(path)
-            self.load_file(path)
+        # 여러 파일을 고르면 타임스탬프 순서로 합쳐서 엶
+        paths, _ = QFileDialog.getOpenFileNames(self, "Select Log File", "", "All Files (*.*);;Text Files (*.txt)")
+        if paths:
+            self.file_path_box.setText("; ".join(paths))
+            self.load_files(paths)
 
     def on_load_from_path(self):
-        path = self.file_path_box.text().strip()
-        if path:
-            self.load_file(path)
-            
-    def load_file(self, path):
-        """파일을 로드하고 뷰를 갱신합니다."""
+        # 세미콜론(;)으로 구분한 여러 경로는 합쳐서 엶
+        paths = [p.strip() for p in self.file_path_box.text().split(";") if p.strip()]
+        if paths:
+            self.load_files(paths)
+
+    def open_paths(self, paths):
+        """실행 인자나 다른 곳에서 받은 파일 경로들을 주소 칸에 보이고 엽니다."""
+        self.file_path_box.setText("; ".join(paths))
+        self.load_files(paths)
+
+    def load_files(self, paths):
+        """파일 하나는 그대로, 여러 개는 타임스탬프 순서로 합친 하나의 뷰로 엽니다."""
+        if len(paths) == 1:
+            self.load_file(paths[0])
+            return
+        for path in paths:
+            file_info = QFileInfo(path)
+            if not (file_info.exists() and file_info.isFile()):
+                QMessageBox.warning(self, "Error", f"File does not exist:\n{path}")
+                return
+        if len(paths) > MAX_MERGE_SOURCES:
+            QMessageBox.warning(self, "Error", f"Too many files to merge (max {MAX_MERGE_SOURCES}).")
+            return
+
+        # 합친 뷰는 따라가기/멤버 선택을 지원하지 않음
+        self.current_path = None
+        self.current_member = None
+        self.member_box.hide()
+        self._start_loader(LogLoader(list(paths)))
+
+    def load_file(self, path, member=None):
+        """
+        백그라운드 스레드에서 파일을 읽기 시작합니다. 읽은 덩어리마다 뷰가 갱신됩니다.
+        member: 아카이브에서 열 멤버 이름 (없으면 첫 파일)
+        """
         file_info = QFileInfo(path)
         if not (file_info.exists() and file_info.isFile()):
             QMessageBox.warning(self, "Error", "File does not exist.")
             return
-            
-        if self.log_data.load_file(path):
-            self.on_filters_changed()
-            self.on_highlights_changed()
+
+        self.current_path = path
+        self.current_member = member
+        if archive_kind(path) is None:
+            self.member_box.hide()
+        self._start_loader(LogLoader(path, member, self.log_data.member_cache, self.log_data.index_cache))
+
+    def _start_loader(self, loader):
+        """이전 로딩/따라가기를 멈추고 새 로딩 스레드를 시작합니다."""
+        self.stop_loading()
+        self.stop_following()
+
+        self.loader = loader
+        self.loader.members_listed.connect(self.on_members_listed)
+        self.loader.store_ready.connect(self.on_store_ready)
+        self.loader.chunk_loaded.connect(self.on_chunk_loaded)
+        self.loader.progress.connect(self.on_load_progress)
+        self.loader.load_finished.connect(self.on_load_finished)
+
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.cancel_load_btn.show()
+        self.load_timing = recorder.begin()
+        self.loader.start()
+
+    def stop_loading(self):
+        """진행 중인 로딩 스레드를 중단합니다."""
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader = None
+        self.load_progress.hide()
+        self.cancel_load_btn.hide()
+
+    def on_cancel_load(self):
+        """로딩 취소 버튼: 지금까지 읽은 부분만 표시한 채로 멈춥니다."""
+        if self.loader is not None:
+            self.loader.requestInterruption()
+
+    def _is_current_loader(self):
+        # 이전 로더가 남긴(큐에 쌓인) 시그널은 무시
+        return self.loader is not None and self.sender() is self.loader
+
+    def on_members_listed(self, members, selected):
+        """아카이브 멤버 목록을 선택 상자에 채웁니다."""
+        if not self._is_current_loader():
+            return
+        self.current_member = selected or None
+        self.member_box.clear()
+        for member in members:
+            self.member_box.addItem(f"{member.name} ({member.size:,} bytes)", member.name)
+        self.member_box.setCurrentIndex(max(0, self.member_box.findData(selected)))
+        self.member_box.setVisible(bool(members))
+
+    def on_member_selected(self, index):
+        """다른 멤버를 고르면 그 멤버만 풀어 엽니다. (이미 풀어 본 멤버는 캐시에서 바로 열림)"""
+        name = self.member_box.itemData(index)
+        if self.current_path and name != self.current_member:
+            self.load_file(self.current_path, name)
+
+    def on_store_ready(self, store):
+        """로딩 시작: 빈 저장소로 교체하고 뷰를 비웁니다."""
+        if not self._is_current_loader():
+            store.close()
+            return
+        # 이전 저장소에 대한 필터 계산과 미룬 변경은 버림
+        self.deferred_updates = []
+        self.updates.cancel()
+        self.log_data.set_store(store)
+        self.search_engine.clear()
+        # 시간 범위 필터는 파일마다 새로 지정
+        self.stop_time_indexing()
+        self.side_panel.time_range_widget.start_box.clear()
+        self.side_panel.time_range_widget.end_box.clear()
+        self.log_view.clear_bookmarks()
+        self.filtered_indices = range(0)
+        self.filtered_bits = None
+        self.log_view.set_log_data(store, self.filtered_indices)
+        self.updates.request_highlight()
+        self.update_source_bar()
+
+    def update_source_bar(self):
+        """합친 뷰면 원본별 켜기/끄기 체크박스를 (원본 색으로) 다시 만듭니다."""
+        while self.source_layout.count():
+            widget = self.source_layout.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+        names = self.log_data.source_names
+        for i, name in enumerate(names):
+            cb = QCheckBox(name)
+            cb.setChecked(True)
+            cb.setStyleSheet(f"color: {self.log_view.source_color(i).name()};")
+            cb.toggled.connect(lambda checked, index=i: self.on_source_toggled(index, checked))
+            self.source_layout.addWidget(cb)
+        self.source_layout.addStretch(1)
+        self.source_bar.setVisible(bool(names))
+
+    def on_source_toggled(self, index, visible):
+        """원본 하나 켜기/끄기: 다시 합치지 않고 보이는 줄만 다시 계산합니다."""
+        self.log_data.set_source_visible(index, visible)
+        self.on_filters_changed()
+
+    def on_chunk_loaded(self, offsets, size, max_line_length):
+        """새로 색인된 덩어리에만 현재 필터를 적용해 뷰 끝에 추가합니다."""
+        if not self._is_current_loader():
+            return
+        self._append_lines(offsets, size, max_line_length)
+
+    def _append_lines(self, offsets, size, max_line_length):
+        """새로 색인된 줄에만 현재 필터를 적용해 뷰 끝에 추가합니다. (로딩, 따라가기 공용)"""
+        if self.updates.busy or self.deferred_updates:
+            # 백그라운드 필터 계산이 같은 저장소를 읽는 중: 끝난 뒤 순서대로 추가
+            self.deferred_updates.append((self._append_lines, (offsets, size, max_line_length)))
+            return
+        start, stop = self.log_data.append_lines(offsets, size, max_line_length)
+        or_filters = self.side_panel.or_filter_manager.get_all_data()
+        and_filters = self.side_panel.and_filter_manager.get_all_data()
+        with recorder.phase("filter", lines=stop - start) as stats:
+            bits = self.log_data.get_filtered_bits(or_filters, and_filters, start, stop)
+            if bits is None:
+                self.filtered_bits = None
+            else:
+                self.filtered_bits = (self.filtered_bits or 0) | (bits << start)
+            lines = self.log_data.bits_to_lines(bits, start, stop)
+            stats["matched"] = len(lines)
+        self.log_view.extend_log_data(lines)
+        self.filtered_indices = self.log_view.rows
+
+    def on_load_progress(self, percent):
+        if self._is_current_loader():
+            self.load_progress.setValue(percent)
+
+    def on_load_finished(self, cancelled):
+        if not self._is_current_loader():
+            return
+        if self.deferred_updates:
+            # 아직 추가하지 못한 덩어리가 있으면 그 뒤에 마무리
+            self.deferred_updates.append((self._finish_loading, (self.loader, cancelled)))
         else:
-            QMessageBox.warning(self, "Error", f"Failed to load log file:\n{path}")
+            self._finish_loading(self.loader, cancelled)
+
+    def _finish_loading(self, loader, cancelled):
+        if loader is not self.loader:
+            return
+        self.loader.wait()
+        self.loader = None
+        self.load_progress.hide()
+        self.cancel_load_btn.hide()
+        # 읽기부터 화면 갱신(덩어리별 필터)까지 사용자가 기다린 시간
+        recorder.end("load", self.load_timing, lines=self.log_data.line_count, bytes=self.log_data.store.offsets[-1])
+        self.load_timing = None
+        if self.follow_btn.isChecked() and not cancelled:
+            self.start_following()
+
+    def on_follow_toggled(self, checked):
+        """따라가기 버튼: 로딩 중이면 로딩이 끝난 뒤 시작됩니다."""
+        if not checked:
+            self.stop_following()
+        elif self.loader is None and self.current_path and not self.start_following():
+            QMessageBox.information(self, "Follow", "Follow mode is only available for plain text files.")
+            self.follow_btn.setChecked(False)
+
+    def start_following(self):
+        """현재 파일 끝에 추가되는 내용을 따라가기 시작합니다. 압축 파일은 지원하지 않습니다."""
+        # 마지막 줄을 다시 색인하므로 백그라운드 필터 계산이 끝난 뒤에
+        self.updates.settle()
+        store = self.log_data.store
+        if (self.follower is not None or store.spilled or store.path is None
+                or archive_kind(self.current_path) is not None):
+            return self.follower is not None
+
+        # 줄바꿈 없이 끝난 마지막 줄은 이어 쓰일 수 있으므로 빼 두었다가 완성되면 다시 받음
+        stop = self.log_data.reopen_last_line()
+        if stop is not None:
+            self.log_view.truncate_log_data(stop)
+            self.filtered_indices = self.log_view.rows
+            if self.filtered_bits:
+                self.filtered_bits &= (1 << stop) - 1
+
+        try:
+            self.follower = LogFollower(store.path, store.offsets[-1], self)
+        except OSError as e:
+            print(f"Error following log file: {e}")
+            return False
+        self.follower.lines_appended.connect(self.on_follow_appended)
+        self.follower.file_reset.connect(self.on_follow_reset)
+        self.follower.start()
+        return True
+
+    def stop_following(self):
+        if self.follower is not None:
+            self.follower.stop()
+            self.follower.deleteLater()
+            self.follower = None
+
+    def on_follow_appended(self, offsets, size, max_line_length):
+        """파일 끝에 추가된 줄: 마지막 줄을 보고 있었다면 계속 끝을 따라 스크롤합니다."""
+        if self.sender() is not self.follower:
+            return
+        at_bottom = self.log_view.is_at_bottom()
+        self._append_lines(offsets, size, max_line_length)
+        if at_bottom:
+            self.log_view.scroll_to_bottom()
+
+    def on_follow_reset(self):
+        """파일이 잘렸거나 로테이션됨: 처음부터 다시 읽습니다. (완료 후 따라가기 재개)"""
+        if self.sender() is self.follower and self.current_path:
+            self.load_file(self.current_path)
 
     def dragEnterEvent(self, event):
         """파일을 드래그해서 창 위로 가져왔을 때 호출됩니다."""
@@ -103,46 +461,205 @@ class MainWindow(QWidget):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
             
-            try:
-                url = event.mimeData().urls()[0]
-            except IndexError:
-                return
-
-            if url.isLocalFile():
-                file_path = url.toLocalFile()
-                if file_path:
-                    self.file_path_box.setText(file_path)
-                    self.load_file(file_path)
+            # 여러 파일을 함께 드롭하면 타임스탬프 순서로 합쳐서 엶
+            paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+            paths = [path for path in paths if path]
+            if paths:
+                self.file_path_box.setText("; ".join(paths))
+                self.load_files(paths)
             else:
                 event.ignore()
         else:
             event.ignore()
 
     def on_filters_changed(self):
-        """필터가 변경되면, 로직을 호출하고 뷰를 갱신합니다."""
+        """필터가 변경되면 다음 프레임에 (이어서 바뀐 것까지 모아) 한 번만 다시 계산합니다."""
         or_filters = self.side_panel.or_filter_manager.get_all_data()
         and_filters = self.side_panel.and_filter_manager.get_all_data()
-        filtered_data = self.log_data.get_filtered_lines(or_filters, and_filters)
-        self.log_view.set_log_data(filtered_data)
-        # 필터 변경 시 하이라이트도 다시 적용해야 함
-        self.on_highlights_changed()
+        self.updates.request_filter(or_filters, and_filters)
+
+    def on_filter_started(self, plan):
+        if plan is not None and plan.uses_time and self.time_indexer is not None:
+            # 시간 조건은 같은 타임스탬프 색인을 쓰므로 백그라운드 색인이 끝날 때까지 기다림
+            self.time_indexer.wait()
+
+    def on_filters_ready(self, bits, rows):
+        """필터 결과를 뷰에 반영합니다."""
+        self.filtered_bits = bits
+        self.filtered_indices = rows
+        self.log_view.set_log_data(self.log_data.store, self.filtered_indices)
+        # 필터된 뷰를 검색한 결과는 더 이상 맞지 않음
+        if self.search_engine.query is not None and not self.search_engine.query[2]:
+            self.search_engine.clear()
+            self.side_panel.search_widget.set_search_count(0, 0)
+
+    def on_updates_idle(self):
+        """백그라운드 필터 계산이 끝남: 그동안 미룬 저장소 변경을 순서대로 적용합니다."""
+        updates, self.deferred_updates = self.deferred_updates, []
+        for func, args in updates:
+            func(*args)
 
     def on_highlights_changed(self):
+        """하이라이트 변경: 다음 프레임에 (필터 결과와 함께) 한 번만 적용합니다."""
+        self.updates.request_highlight()
+
+    def apply_highlights(self):
         """하이라이트가 변경되면, 뷰의 하이라이터를 갱신합니다."""
         active_highlights = self.side_panel.hl_manager.get_all_data()
         self.log_view.update_highlight_rules(active_highlights)
 
-    def on_search(self, term, find_flags):
-        """검색 신호를 받아 뷰에서 검색을 실행하고, 결과를 패널에 알립니다."""
-        index, total = self.log_view.find_next(term, find_flags)
-        self.side_panel.search_widget.set_search_count(index, total)
+    def on_search(self, term, find_flags, whole_file):
+        """
+        검색 신호: 같은 조건이면 다음/이전 결과로 이동하고, 아니면 (필터 결과가 반영된 뒤) 백그라운드 검색을 시작합니다.
+        찾은 수는 검색 도중에도 패널에 계속 갱신됩니다.
+        """
+        case_sensitive = bool(find_flags & QTextDocument.FindCaseSensitively)
+        if self.search_engine.query == (term, case_sensitive, whole_file):
+            self.search_engine.step(not find_flags & QTextDocument.FindBackward)
+            return
+        self.updates.request_search((term, case_sensitive, whole_file))
+
+    def start_search(self, args):
+        term, case_sensitive, whole_file = args
+        if self.search_engine.query == args:
+            return
+        self.log_view.clear_search_highlights()
+        lines = self.log_data.line_count if whole_file else len(self.filtered_indices)
+        self.search_timing = (recorder.begin(), lines)
+        self.search_engine.search(
+            self.log_data.store, self.filtered_indices, term, case_sensitive, whole_file)
+
+    def on_search_progress(self, index, total, finished):
+        """검색이 끝나면 걸린 시간을 기록합니다. (이후 결과 이동은 기록하지 않음)"""
+        if finished and self.search_timing is not None:
+            started, lines = self.search_timing
+            self.search_timing = None
+            recorder.end("search", started, lines=lines, matched=total)
+
+    def on_highlight_jump(self, term, is_case_i, forward):
+        """하이라이트 단어가 들어 있는, 현재 뷰에 보이는 다음(이전) 줄로 이동합니다."""
+        current = self.log_view.current_line()
+        if current < 0:
+            return
+        self.updates.settle()
+        line = self.log_data.find_next_line(self.visible_term_lines(term, is_case_i), current, forward)
+        if line >= 0:
+            self.log_view.jump_to_line(line)
+
+    def visible_term_lines(self, term, is_case_i):
+        """
+        단어가 들어 있는, 현재 뷰에 보이는 줄 번호의 정렬된 배열.
+        뷰(필터 결과)나 저장소가 바뀔 때까지 재사용하므로 이어지는 이동은 이진 탐색 한 번입니다.
+        """
+        store, line_count, shown = state = (self.log_data.store, self.log_data.line_count, self.filtered_bits)
+        old = self.highlight_lines_state
+        if old is None or old[0] is not store or old[1] != line_count or old[2] is not shown:
+            self.highlight_lines = {}
+            self.highlight_lines_state = state
+        key = (term, is_case_i)
+        lines = self.highlight_lines.get(key)
+        if lines is None:
+            bits = self.visible_term_bits(term, is_case_i)
+            if bits is None:
+                return None
+            lines = self.highlight_lines[key] = self.log_data.bits_to_lines(bits, 0, line_count)
+        return lines
+
+    def visible_term_bits(self, term, is_case_i):
+        """
+        단어가 들어 있는 줄 중 현재 뷰에 보이는 줄의 비트셋 (0번 비트 = 첫 줄)
+        백그라운드 필터 계산이 같은 캐시를 쓰는 중이면 None (미니맵은 결과가 반영된 뒤 다시 셈)
+        """
+        key = (term, is_case_i)
+        bitmaps = self.visible_term_bitmaps([key])
+        return None if bitmaps is None else bitmaps[key]
+
+    def visible_term_bitmaps(self, keys):
+        """여러 (단어, 대소문자 무시) 항목의 visible_term_bits {항목: 비트셋}, 계산 중이면 None"""
+        if self.updates.busy:
+            return None
+        # 단어별 비트맵은 필터와 같은 캐시를 쓰므로 처음 한 번만 (모자란 단어를 함께) 파일을 훑음
+        bitmaps = self.log_data.get_term_bitmaps(keys)
+        if self.filtered_bits is not None:
+            bitmaps = {key: bits & self.filtered_bits for key, bits in bitmaps.items()}
+        return bitmaps
+
+    def on_time_range_requested(self, start_text, end_text):
+        """시간 범위 필터: 타임스탬프 색인이 없으면 백그라운드에서 만든 뒤 적용합니다."""
+        if self.loader is not None or not self.log_data.line_count:
+            QMessageBox.information(self, "Time Range", "Wait until the file has finished loading.")
+            return
+        self.pending_time_range = (start_text, end_text)
+        if self.time_indexer is not None:
+            return
+        # 색인 스레드와 필터 계산이 같은 타임스탬프 색인을 함께 늘리지 않도록
+        self.updates.settle()
+        # 전에 색인해 둔 파일이면 디스크 캐시에서 바로 불러옴
+        self.log_data.load_cached_times()
+        if len(self.log_data.time_index) >= self.log_data.line_count:
+            self.apply_time_range()
+            return
+
+        self.time_indexer = TimeIndexLoader(
+            self.log_data.store.snapshot(), self.log_data.time_index, self.log_data.parallel)
+        self.time_indexer.index_ready.connect(self.on_time_index_ready)
+        self.side_panel.time_range_widget.set_busy(True)
+        self.time_indexer.start()
+
+    def on_time_index_ready(self, done):
+        if self.sender() is not self.time_indexer:
+            return
+        self.time_indexer.wait()
+        self.time_indexer = None
+        self.side_panel.time_range_widget.set_busy(False)
+        if done:
+            self.apply_time_range()
+
+    def apply_time_range(self):
+        """입력한 시각을 해석해 시간 범위 필터를 적용합니다."""
+        start_text, end_text = self.pending_time_range
+        self.pending_time_range = None
+        index = self.log_data.time_index
+        if index.fmt is None:
+            QMessageBox.information(self, "Time Range", "No timestamps detected in this log.")
+            return
+        try:
+            # 시각만 입력하면 로그 첫 타임스탬프의 날짜 기준
+            reference = index.first_time
+            start = parse_time_input(start_text, reference) if start_text else NO_TIME
+            end = parse_time_input(end_text, reference) if end_text else float("inf")
+        except ValueError as e:
+            QMessageBox.warning(self, "Time Range", str(e))
+            return
+        self.log_data.set_time_range((start, end))
+        self.on_filters_changed()
+
+    def on_time_range_cleared(self):
+        self.stop_time_indexing()
+        if self.log_data.time_range is not None:
+            self.log_data.set_time_range(None)
+            self.on_filters_changed()
+
+    def stop_time_indexing(self):
+        if self.time_indexer is not None:
+            self.time_indexer.cancel()
+            self.time_indexer = None
+        self.pending_time_range = None
+        self.side_panel.time_range_widget.set_busy(False)
+
+    def on_search_cleared(self):
+        self.search_engine.clear()
+        self.log_view.clear_search_highlights()
 
     def on_export_log(self):
         """내보내기 신호를 받아 파일 저장 대화상자를 엽니다."""
         
-        # 1. 파일 경로 먼저 묻기
+        if self.exporter is not None:
+            return
+
+        # 1. 파일 경로 먼저 묻기 (.gz로 저장하면 압축하며 씀)
         path, _ = QFileDialog.getSaveFileName(self, 
-            "Export Visible Log", "", "Text Files (*.txt);;All Files (*.*)")
+            "Export Visible Log", "", "Text Files (*.txt);;Gzip Files (*.gz);;All Files (*.*)")
         
         if not path:
             return # 사용자가 취소함
@@ -163,29 +680,83 @@ class MainWindow(QWidget):
         clicked_button = msg_box.clickedButton()
         
         # 3. 사용자 선택에 따라 동작
+        if clicked_button == cancel_btn:
+            return # 내보내기 취소
+
+        include_line_num = clicked_button == include_btn
+        # 계산 중인 필터가 있으면 그 결과를 내보냄
+        self.updates.settle()
+
+        # 4. 원본 바이트에서 필터링된 줄을 백그라운드로 바로 파일에 씀
+        #    (뷰의 배열은 로딩/따라가기 중 늘어나므로 시작 시점의 복사본을 씀)
+        rows = self.filtered_indices
+        if not isinstance(rows, range):
+            rows = array("q", rows)
         try:
-            if clicked_button == cancel_btn:
-                return # 내보내기 취소
-                
-            elif clicked_button == include_btn:
-                # 옵션 1: 줄 번호 포함 (현재 보이는 그대로 저장)
-                text_to_save = self.log_view.toPlainText()
-                
-            elif clicked_button == exclude_btn:
-                # 옵션 2: 줄 번호 제외 (텍스트만)
-                # " 1234 | " (9자) 형식을 제거
-                original_text = self.log_view.toPlainText()
-                lines = original_text.split('\n')
-                # 각 줄의 9번째 문자부터 끝까지 (줄 번호 포맷: " 1234 | ")
-                stripped_lines = [line[9:] for line in lines]
-                text_to_save = "\n".join(stripped_lines)
-
-            # 4. 파일 쓰기
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(text_to_save)
-                
+            store = self.log_data.store.snapshot()
         except Exception as e:
             QMessageBox.warning(self, "Export Error", f"Failed to export log:\n{e}")
+            return
+        self.exporter = ExportWorker(store, rows, path, include_line_num, path.lower().endswith(".gz"))
+
+        self.export_progress = QProgressDialog("Exporting log...", "Cancel", 0, 100, self)
+        self.export_progress.setWindowTitle("Export Visible Log")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(0)
+        self.export_progress.setAutoClose(False)
+        self.export_progress.setAutoReset(False)
+        self.export_progress.canceled.connect(self.stop_export)
+        self.exporter.progress.connect(self.export_progress.setValue)
+        self.exporter.export_finished.connect(self.on_export_finished)
+        self.export_timing = (recorder.begin(), len(rows))
+        self.exporter.start()
+
+    def on_export_finished(self, completed, error):
+        if self.exporter is None or self.sender() is not self.exporter:
+            return
+        self.exporter.wait()
+        self.exporter = None
+        self._close_export_progress()
+        if completed:
+            started, lines = self.export_timing
+            recorder.end("export", started, lines=lines)
+        self.export_timing = None
+        if error:
+            QMessageBox.warning(self, "Export Error", f"Failed to export log:\n{error}")
+
+    def stop_export(self):
+        """내보내기를 취소합니다. (쓰던 파일은 작업 스레드가 지움)"""
+        if self.exporter is not None:
+            self.exporter.cancel()
+            self.exporter = None
+        self.export_timing = None
+        self._close_export_progress()
+
+    def _close_export_progress(self):
+        dialog, self.export_progress = self.export_progress, None
+        if dialog is not None:
+            # 닫을 때 나오는 canceled 신호가 다시 들어오지 않도록 먼저 끊음
+            dialog.canceled.disconnect(self.stop_export)
+            dialog.close()
+            dialog.deleteLater()
+
+    # --- 성능 표시줄 ---
+
+    def toggle_perf_hud(self):
+        self.set_perf_hud_visible(not self.perf_hud.isVisibleTo(self))
+
+    def set_perf_hud_visible(self, visible):
+        """성능 표시줄을 켜고 끕니다. 보이는 동안만 주기적으로 갱신합니다."""
+        self.perf_hud.setVisible(visible)
+        if visible:
+            self.update_perf_hud()
+            self.perf_timer.start()
+        else:
+            self.perf_timer.stop()
+
+    def update_perf_hud(self):
+        text = hud_text(recorder.last, resident_memory_mb())
+        self.perf_hud.setText(text or "No timings yet")
 
     # --- 설정 저장/불러오기 ---
     
@@ -194,51 +765,62 @@ class MainWindow(QWidget):
         if config:
             self.side_panel.load_settings(config)
 
+    def restore_settings(self):
+        """저장된 필터/하이라이트/메모를 한 번만 불러오고, 이미 읽은 줄에 적용합니다."""
+        if self.settings_restored:
+            return
+        self.settings_restored = True
+        self.load_settings()
+        self.on_filters_changed()
+
+    def eventFilter(self, obj, event):
+        # 로그 뷰가 처음 그려지는 때를 첫 화면으로 봄
+        if event.type() == QEvent.Paint and obj is self.log_view.viewport():
+            obj.removeEventFilter(self)
+            elapsed = time.perf_counter() - self.started
+            recorder.record("startup", elapsed)
+            self.first_painted.emit(elapsed)
+            QTimer.singleShot(0, self.on_first_paint)
+        return super().eventFilter(obj, event)
+
+    def on_first_paint(self):
+        """첫 화면을 그린 뒤: 저장된 설정을 불러옵니다."""
+        self.restore_settings()
+
     def closeEvent(self, event):
         """창을 닫을 때 현재 설정을 저장합니다."""
+        # 설정을 불러오기 전에 닫아도 저장된 설정이 빈 목록으로 덮이지 않도록
+        if not self.settings_restored:
+            self.settings_restored = True
+            self.load_settings()
+        self.updates.cancel()
+        self.stop_loading()
+        self.stop_following()
+        self.stop_time_indexing()
+        self.stop_export()
+        self.search_engine.clear()
+        self.log_data.close()
+        # 닫힌 저장소를 뷰가 (예약된 미리 읽기 등에서) 더 읽지 않도록 빈 저장소로 바꿈
+        self.log_view.set_log_data(self.log_data.store, [])
+
         # 각 매니저에서 '모든' 아이템의 데이터를 수집
         try:
-            or_filters = []
-            for i in range(self.side_panel.or_filter_manager.list_widget.count()):
-                item = self.side_panel.or_filter_manager.list_widget.item(i)
-                widget = self.side_panel.or_filter_manager.list_widget.itemWidget(item)
-                data = item.data(Qt.UserRole)
-                cb = widget.findChild(QCheckBox)
-                data["is_checked"] = cb.isChecked() if cb else False
-                case_cb = widget.findChild(QCheckBox, "case_i_cb")
-                data["is_case_i"] = case_cb.isChecked() if case_cb else False
-                or_filters.append(data)
-                
-            add_filters = []
-            for i in range(self.side_panel.and_filter_manager.list_widget.count()):
-                item = self.side_panel.and_filter_manager.list_widget.item(i)
-                widget = self.side_panel.and_filter_manager.list_widget.itemWidget(item)
-                data = item.data(Qt.UserRole)
-                cb = widget.findChild(QCheckBox)
-                data["is_checked"] = cb.isChecked() if cb else False
-                case_cb = widget.findChild(QCheckBox, "case_i_cb")
-                data["is_case_i"] = case_cb.isChecked() if case_cb else False
-                add_filters.append(data)
-                
-            highlights = []
-            for i in range(self.side_panel.hl_manager.list_widget.count()):
-                item = self.side_panel.hl_manager.list_widget.item(i)
-                widget = self.side_panel.hl_manager.list_widget.itemWidget(item)
-                data = item.data(Qt.UserRole)
-                cb = widget.findChild(QCheckBox)
-                data["is_checked"] = cb.isChecked() if cb else False
-                case_cb = widget.findChild(QCheckBox, "case_i_cb")
-                data["is_case_i"] = case_cb.isChecked() if case_cb else False
-                data["color"] = self.side_panel.hl_manager.highlight_colors.get(data["term"], QColor("#ffff00")).name()
-                highlights.append(data)
+            or_filters = self.side_panel.or_filter_manager.get_save_data()
+            add_filters = self.side_panel.and_filter_manager.get_save_data()
+            highlights = self.side_panel.hl_manager.get_save_data()
 
             memo = self.side_panel.memo_widget.get_text()
+
+            # 켜져 있는 필터 전체의 표현식 트리 (헤드리스 모드의 --config가 그대로 씀)
+            filter_expression = filter_tree(
+                [f for f in or_filters if f["is_checked"]], [f for f in add_filters if f["is_checked"]])
             
             config_to_save = {
                 "memo": memo,
                 "or_filters": or_filters,
                 "add_filters": add_filters,
-                "highlights": highlights
+                "highlights": highlights,
+                "filter": filter_expression
             }
             self.settings.save(config_to_save)
         except Exception as e:
@@ -0,0 +1,173 @@
+from array import array
+from collections import OrderedDict
+from itertools import compress
+
+from .filter_engine import FilterCancelled, TermMatcher, FILTER_CHUNK_SIZE
+from .line_store import CaseFoldShadow
+
+# 단어별 비트맵 캐시의 메모리 한도 (바이트)
+MATCH_CACHE_BUDGET = 256 * 1024 * 1024
+# 걸린 덩어리가 이보다 많으면 덩어리마다 비트셋에 밀어 합치지 않고 한 번에 압축 (큰 정수 복사 반복 방지)
+MAX_SHIFTED_PARTS = 8
+
+# 0/1 바이트 <-> 8줄을 묶은 비트 바이트 변환표
+_PACK_TABLES = [bytes((1 << k) if b else 0 for b in range(256)) for k in range(8)]
+_UNPACK_TABLES = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+
+
+def _size(bits):
+    return (bits.bit_length() + 7) // 8
+
+
+def pack_mask(mask):
+    """줄마다 0/1인 바이트 마스크를 비트셋(int, i번째 비트 = i번째 줄)으로 압축합니다."""
+    padded = bytes(mask) + bytes(-len(mask) % 8)
+    bits = 0
+    for k in range(8):
+        bits |= int.from_bytes(padded[k::8].translate(_PACK_TABLES[k]), "little")
+    return bits
+
+
+def join_masks(parts, start, stop):
+    """
+    (시작 줄, 마스크) 조각들을 [start, stop) 줄의 비트셋으로 합칩니다. (0번 비트 = start 줄)
+    조각이 없는 구간은 걸린 줄이 없는 것으로 봅니다.
+    """
+    if len(parts) <= MAX_SHIFTED_PARTS:
+        bits = 0
+        for first, mask in parts:
+            bits |= pack_mask(mask) << (first - start)
+        return bits
+    buffer = bytearray(stop - start)
+    for first, mask in parts:
+        buffer[first - start:first - start + len(mask)] = mask
+    return pack_mask(buffer)
+
+
+def unpack_bits(bits, n):
+    """비트셋을 길이 n의 0/1 바이트 마스크로 펼칩니다."""
+    nbytes = (n + 7) // 8
+    packed = bits.to_bytes(nbytes, "little")
+    mask = bytearray(nbytes * 8)
+    for k in range(8):
+        mask[k::8] = packed.translate(_UNPACK_TABLES[k])
+    del mask[n:]
+    return mask
+
+
+def bits_to_indices(bits, n, base=0):
+    """비트셋에서 켜진 비트의 위치(+base)를 오름차순 배열로 반환합니다."""
+    return array("q", compress(range(base, base + n), unpack_bits(bits, n)))
+
+
+class MatchCache:
+    """
+    (단어, 대소문자 무시) 항목별로 '어느 줄에 걸리는지'를 비트셋으로 캐시합니다.
+    필터 조합이 바뀌어도 이미 계산한 항목은 다시 훑지 않고 비트 연산만 합니다.
+    메모리 한도를 넘으면 가장 오래 쓰지 않은 항목부터 버립니다(LRU).
+    """
+    def __init__(self, budget=MATCH_CACHE_BUDGET, parallel=None):
+        self.budget = budget
+        # 큰 범위를 여러 프로세스로 나눠 계산하는 실행기 (ParallelFilter, 없으면 항상 현재 스레드)
+        self.parallel = parallel
+        # 항목 -> [비트셋, 계산된 줄 수]
+        self._entries = OrderedDict()
+        self._shadow = None
+        # 캐시에 없는 항목을 계산하기 전에 찾아볼 함수: 항목 -> (비트셋, 계산된 줄 수) 또는 None
+        # (디스크 색인 캐시에 저장해 둔 비트맵)
+        self.persisted = None
+
+    def reset(self, persisted=None):
+        """저장소가 바뀌면 캐시와 소문자 사본을 비웁니다."""
+        self._entries.clear()
+        self.persisted = persisted
+        if self._shadow is not None:
+            self._shadow.close()
+            self._shadow = None
+
+    def truncate(self, n):
+        """n번째 줄부터는 다시 계산하도록 캐시를 자릅니다. (이어 쓰여 내용이 바뀐 마지막 줄)"""
+        for entry in self._entries.values():
+            if entry[1] > n:
+                entry[0] &= (1 << n) - 1
+                entry[1] = n
+
+    def items(self):
+        """(항목, 비트셋, 계산된 줄 수) 목록"""
+        return [(key, bits, covered) for key, (bits, covered) in self._entries.items()]
+
+    def memory_usage(self):
+        # 실제 정수 크기 (마지막으로 걸린 줄까지만 차지하므로 드문 단어는 훨씬 작음)
+        return sum(_size(bits) for bits, _ in self._entries.values())
+
+    def bitmaps(self, store, keys, cancelled=None):
+        """
+        항목마다 저장소 전체 줄에 대한 비트셋을 반환합니다. 없거나 모자란 부분만 계산합니다.
+        cancelled: 덩어리마다 확인하는 중단 여부 함수 (True면 FilterCancelled)
+        """
+        keys = list(dict.fromkeys(keys))
+        n = len(store)
+        if self.persisted is not None:
+            for key in keys:
+                if key not in self._entries:
+                    saved = self.persisted(key)
+                    if saved is not None:
+                        self._entries[key] = list(saved)
+        stale = [k for k in keys if k not in self._entries or self._entries[k][1] < n]
+        if stale:
+            self._extend(store, stale, n, cancelled)
+
+        result = {}
+        for key in keys:
+            self._entries.move_to_end(key)
+            result[key] = self._entries[key][0]
+        self._evict(keys)
+        return result
+
+    def _extend(self, store, keys, n, cancelled=None):
+        """모자란 항목들을 (가장 덜 계산된 줄부터) 한 번의 훑기로 함께 계산합니다."""
+        for key in keys:
+            self._entries.setdefault(key, [0, 0])
+        start = min(self._entries[k][1] for k in keys)
+
+        if self.parallel is not None and self.parallel.should_use(store, start, n):
+            for key, bits in self.parallel.term_bitmaps(store, keys, start, n, cancelled).items():
+                entry = self._entries[key]
+                entry[0] |= bits << start
+                entry[1] = n
+            return
+
+        matcher = TermMatcher(keys)
+        low_source = None
+        if matcher.needs_lower:
+            # 대소문자 무시 단어는 원본을 매번 소문자로 바꾸지 않고 소문자 사본에서 읽음
+            if self._shadow is None:
+                self._shadow = CaseFoldShadow()
+            self._shadow.sync(store)
+            low_source = self._shadow
+
+        # 항목별 (덩어리 시작 줄, 마스크) - 걸린 줄이 있는 덩어리만
+        chunks = {key: [] for key in keys}
+        for first, end, data in store.iter_chunks(start, n, FILTER_CHUNK_SIZE):
+            if cancelled is not None and cancelled():
+                # 항목은 모든 덩어리를 다 본 뒤에만 갱신하므로 여기서 멈춰도 캐시는 그대로
+                raise FilterCancelled()
+            low = low_source.read(*store.byte_range(first, end)) if low_source else None
+            for key, mask in matcher.match_chunk(data, end - first, low).items():
+                chunks[key].append((first, mask))
+
+        for key in keys:
+            entry = self._entries[key]
+            # 이미 계산된 앞부분과 겹치는 줄은 같은 결과이므로 OR로 합쳐도 됨
+            entry[0] |= join_masks(chunks[key], start, n) << start
+            entry[1] = n
+
+    def _evict(self, keep):
+        keep = set(keep)
+        usage = self.memory_usage()
+        for key in list(self._entries):
+            if usage <= self.budget:
+                break
+            if key in keep:
+                continue
+            usage -= _size(self._entries.pop(key)[0])
@@ -0,0 +1,132 @@
+# minimap.py
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from PyQt5.QtWidgets import QScrollBar, QStyle, QStyleOptionSlider
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtCore import Qt
+
+# 가장 적게 걸린 구간의 불투명도 (한 줄만 걸려도 보이도록)
+MIN_MARK_ALPHA = 110
+# 북마크 표시 높이 (px)
+BOOKMARK_MARK_HEIGHT = 2
+
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+def bucket_edges(rows, buckets):
+    """
+    뷰 줄을 buckets개 구간(스크롤바의 픽셀 줄)으로 나눈 경계의 원본 인덱스 (길이 buckets + 1).
+    k번째 구간 = 원본 인덱스 [edges[k], edges[k+1])
+    """
+    n = len(rows)
+    edges = array("q", (rows[k * n // buckets] for k in range(buckets)))
+    edges.append(rows[n - 1] + 1)
+    return edges
+
+
+def bin_bits(bits, edges):
+    """
+    비트셋(0번 비트 = 첫 줄)의 켜진 비트 수를 구간마다 셉니다.
+    비트셋을 한 번 바이트로 바꾼 뒤 구간마다 그 조각만 세므로, 비용은 줄 수가 아닌 바이트 수에 비례합니다.
+    """
+    start, stop = edges[0], edges[-1]
+    bits = (bits >> start) & ((1 << (stop - start)) - 1)
+    if not bits:
+        return [0] * (len(edges) - 1)
+    packed = bits.to_bytes((stop - start + 7) // 8, "little")
+    if bin(bits).count("1") < len(edges):
+        # 드물게 걸린 단어 (하이라이트가 수천 개일 때 대부분): 켜진 비트마다 구간을 이진 탐색
+        counts = [0] * (len(edges) - 1)
+        for m in _NONZERO.finditer(packed):
+            byte, base = packed[m.start()], start + m.start() * 8
+            for k in range(8):
+                if byte >> k & 1:
+                    counts[bisect_right(edges, base + k) - 1] += 1
+        return counts
+    counts = []
+    for a, b in zip(edges, edges[1:]):
+        a, b = a - start, b - start
+        part = int.from_bytes(packed[a >> 3:(b + 7) >> 3], "little") >> (a & 7)
+        counts.append(bin(part & ((1 << (b - a)) - 1)).count("1"))
+    return counts
+
+
+def _marks(counts):
+    """구간별 개수 -> (구간 수, 최댓값, [(구간, 개수), ...] 걸린 구간만), 걸린 구간이 없으면 None"""
+    if not counts:
+        return None
+    peak = max(counts)
+    if not peak:
+        return None
+    return len(counts), peak, [(k, count) for k, count in enumerate(counts) if count]
+
+
+def bin_sorted(values, edges):
+    """오름차순 원본 인덱스 배열(검색 결과, 북마크)의 값 수를 구간마다 셉니다. (구간 경계마다 이진 탐색 한 번)"""
+    positions = [bisect_left(values, edge) for edge in edges]
+    return [b - a for a, b in zip(positions, positions[1:])]
+
+
+class MinimapScrollBar(QScrollBar):
+    """
+    구간(픽셀 줄)마다 하이라이트 단어, 검색 결과, 북마크가 얼마나 몰려 있는지 덧그리는 세로 스크롤바.
+    - 왼쪽 절반: 하이라이트 (규칙 순서대로 덧그림, 뒤의 규칙이 위)
+    - 오른쪽 절반: 검색 결과
+    - 전체 너비의 가는 줄: 북마크
+    많이 걸린 구간일수록 진하게 그립니다. (층마다 가장 많은 구간 기준)
+    """
+    def __init__(self, parent=None):
+        super().__init__(Qt.Vertical, parent)
+        # [(색, (구간 수, 최댓값, [(구간, 개수), ...])), ...] - set_marks가 걸린 구간만 추림
+        self.highlight_marks = []
+        self.search_marks = None
+        self.bookmark_marks = None
+        self.search_color = QColor("#ff9900")
+        self.bookmark_color = QColor("#3d8eff")
+
+    def groove_rect(self):
+        option = QStyleOptionSlider()
+        self.initStyleOption(option)
+        return self.style().subControlRect(QStyle.CC_ScrollBar, option, QStyle.SC_ScrollBarGroove, self)
+
+    def bucket_count(self):
+        """표시할 수 있는 구간 수 (홈의 높이, px)"""
+        return max(0, self.groove_rect().height())
+
+    def set_marks(self, highlights, search, bookmarks):
+        """highlights: [(QColor, 구간별 개수), ...], search/bookmarks: 구간별 개수 (없으면 None)"""
+        # 그릴 때마다 모든 구간을 훑지 않도록 층마다 걸린 구간과 최댓값을 미리 추려 둠
+        # (하이라이트 단어가 수천 개여도 대부분은 몇 구간에만 걸림)
+        layers = ((color, _marks(counts)) for color, counts in highlights)
+        self.highlight_marks = [(color, marks) for color, marks in layers if marks]
+        self.search_marks = _marks(search)
+        self.bookmark_marks = _marks(bookmarks)
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.highlight_marks and not self.search_marks and not self.bookmark_marks:
+            return
+        groove = self.groove_rect()
+        half = groove.width() // 2
+        painter = QPainter(self)
+        for color, marks in self.highlight_marks:
+            self._paint_counts(painter, groove, groove.left(), half, color, marks)
+        if self.search_marks:
+            self._paint_counts(painter, groove, groove.left() + half, groove.width() - half,
+                               self.search_color, self.search_marks)
+        if self.bookmark_marks:
+            self._paint_counts(painter, groove, groove.left(), groove.width(),
+                               self.bookmark_color, self.bookmark_marks, BOOKMARK_MARK_HEIGHT)
+
+    @staticmethod
+    def _paint_counts(painter, groove, x, width, color, marks, height=None):
+        buckets, peak, hits = marks
+        top, total = groove.top(), groove.height()
+        mark = QColor(color)
+        for k, count in hits:
+            y0 = top + k * total // buckets
+            y1 = top + (k + 1) * total // buckets
+            mark.setAlpha(MIN_MARK_ALPHA + (255 - MIN_MARK_ALPHA) * count // peak)
+            painter.fillRect(x, y0, width, height or max(1, y1 - y0), mark)
@@ -0,0 +1,199 @@
+import mmap
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+from .filter_engine import FilterCancelled, TermMatcher, FILTER_CHUNK_SIZE
+from .match_cache import join_masks
+from .timestamps import FORMATS, NO_TIME
+
+# 필터 실행 방식: "serial"(현재 스레드), "process"(프로세스 풀), "auto"(큰 파일만 프로세스 풀)
+FILTER_MODES = ("serial", "process", "auto")
+# 환경 변수로 실행 방식을 고를 수 있음 (벤치마크/문제 확인용)
+FILTER_MODE_ENV = "LOG_VIEWER_FILTER_MODE"
+# auto 모드에서 이보다 적은 바이트를 훑을 때는 프로세스 간 통신 비용이 더 큼
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+# 작업자 하나가 맡는 최소 바이트 (너무 잘게 나누면 결과 합치는 비용이 커짐)
+MIN_PART_SIZE = 8 * 1024 * 1024
+# 작업자 수 대비 나누는 조각 수 (조각마다 걸리는 시간이 달라도 고르게 끝나도록)
+PARTS_PER_WORKER = 4
+
+
+def _match_range(path, a, b, line_count, keys):
+    """
+    (작업자 프로세스) 파일의 [a, b) 바이트 범위를 직접 mmap으로 읽어 항목별 비트셋을 반환합니다.
+    범위는 줄 경계에 맞춰져 있고, 반환 비트셋의 0번 비트는 범위의 첫 줄입니다.
+    """
+    matcher = TermMatcher(keys)
+    # 항목별 (범위 안 시작 줄, 마스크) - 걸린 줄이 있는 덩어리만
+    masks = {key: [] for key in matcher.keys}
+    lines = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = a
+        while pos < b:
+            end = min(b, pos + FILTER_CHUNK_SIZE)
+            if end < b:
+                # 덩어리도 줄 경계에서 자름 (덩어리보다 긴 한 줄은 통째로)
+                cut = mm.rfind(b"\n", pos, end)
+                if cut < 0:
+                    cut = mm.find(b"\n", end, b)
+                end = b if cut < 0 else cut + 1
+            data = mm[pos:end]
+            count = data.count(b"\n") + (not data.endswith(b"\n"))
+            for key, mask in matcher.match_chunk(data, count).items():
+                masks[key].append((lines, mask))
+            lines += count
+            pos = end
+
+    if lines != line_count:
+        raise ValueError(f"line count mismatch in [{a}, {b}): {lines} != {line_count}")
+    return {key: join_masks(parts, 0, line_count) for key, parts in masks.items()}
+
+
+def _parse_times(path, a, b, line_count, fmt_name):
+    """
+    (작업자 프로세스) 파일의 [a, b) 바이트 범위의 줄마다 타임스탬프를 읽어 array('d')의 바이트로 반환합니다.
+    범위 앞쪽의 타임스탬프 없는 줄은 NO_TIME (앞 조각의 마지막 값은 합칠 때 채움)
+    """
+    fmt = next(f for f in FORMATS if f.name == fmt_name)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = mm[a:b].split(b"\n", line_count)[:line_count]
+    times = array("d", fmt.parse_lines(lines, NO_TIME))
+    if len(times) != line_count:
+        raise ValueError(f"line count mismatch in [{a}, {b}): {len(times)} != {line_count}")
+    return times.tobytes()
+
+
+def default_filter_mode():
+    mode = os.environ.get(FILTER_MODE_ENV, "auto").lower()
+    return mode if mode in FILTER_MODES else "auto"
+
+
+class ParallelFilter:
+    """
+    필터 항목 검사를 줄 경계에 맞춘 바이트 범위로 나눠 프로세스 풀에서 실행합니다.
+    작업자는 줄 목록을 받지 않고 파일 경로로 직접 mmap해 읽으며,
+    결과 비트셋은 원래 줄 순서대로 이어 붙입니다.
+    """
+    def __init__(self, mode=None, workers=None):
+        self.mode = mode or default_filter_mode()
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+
+    def should_use(self, store, start, stop):
+        """이 저장소의 [start, stop) 줄 범위를 프로세스 풀로 검사할지 결정합니다."""
+        if self.mode == "serial" or store.path is None or start >= stop:
+            return False
+        if self.mode == "process":
+            return True
+        a, b = store.byte_range(start, stop)
+        return self.workers > 1 and b - a >= PARALLEL_MIN_BYTES
+
+    def split(self, offsets, start, stop):
+        """[start, stop) 줄 범위를 비슷한 바이트 크기의 (첫 줄, 끝 줄) 조각들로 나눕니다."""
+        total = offsets[stop] - offsets[start]
+        part_size = max(MIN_PART_SIZE, -(-total // (self.workers * PARTS_PER_WORKER)))
+        parts = []
+        line = start
+        while line < stop:
+            end = bisect_left(offsets, offsets[line] + part_size, line + 1, stop)
+            parts.append((line, end))
+            line = end
+        return parts
+
+    def term_bitmaps(self, store, keys, start, stop, cancelled=None):
+        """
+        항목마다 [start, stop) 줄 범위의 비트셋(0번 비트 = start 줄)을 반환합니다.
+        cancelled: 조각 결과를 받을 때마다 확인하는 중단 여부 함수 (True면 남은 조각을 버리고 FilterCancelled)
+        """
+        executor = self._get_executor()
+        o = store.offsets
+        futures = [
+            (first - start, executor.submit(_match_range, store.path, o[first], o[end], end - first, keys))
+            for first, end in self.split(o, start, stop)
+        ]
+        result = {key: 0 for key in keys}
+        for shift, future in futures:
+            if cancelled is not None and cancelled():
+                for _, rest in futures:
+                    rest.cancel()
+                raise FilterCancelled()
+            for key, bits in future.result().items():
+                result[key] |= bits << shift
+        return result
+
+    def timestamps(self, store, fmt, start, stop, last=NO_TIME):
+        """
+        [start, stop) 줄의 타임스탬프 배열을 조각별로 나눠 읽습니다. (TimestampIndex 형식)
+        last: start 앞 줄의 값 (조각 앞쪽의 타임스탬프 없는 줄이 이어받음)
+        """
+        executor = self._get_executor()
+        o = store.offsets
+        futures = [
+            executor.submit(_parse_times, store.path, o[first], o[end], end - first, fmt.name)
+            for first, end in self.split(o, start, stop)
+        ]
+        result = array("d")
+        for future in futures:
+            times = array("d")
+            times.frombytes(future.result())
+            # 조각 앞쪽의 타임스탬프 없는 줄은 앞 조각의 마지막 값을 따름
+            i = 0
+            while i < len(times) and times[i] == NO_TIME:
+                times[i] = last
+                i += 1
+            result.extend(times)
+            if times:
+                last = times[-1]
+        return result
+
+    def warm_up(self):
+        """작업자 프로세스를 미리 모두 띄워 둡니다. (첫 필터의 기동 지연 제거)"""
+        list(self._get_executor().map(abs, range(self.workers)))
+
+    def _get_executor(self):
+        if self._executor is None:
+            # 병렬 필터를 처음 쓸 때 가져옴 (시작 시간 단축)
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Qt 스레드가 있는 프로세스를 fork하지 않도록 모든 OS에서 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def shutdown(self):
+        """프로세스 풀을 정리합니다."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def benchmark(path, terms, case_i=False, workers=None):
+    """같은 파일/단어로 serial과 process 방식의 필터 시간을 재고 결과가 같은지 확인합니다."""
+    from .core_logic import LogDataManager
+
+    filters = [{"term": t, "is_case_i": case_i} for t in terms]
+    results = {}
+    for mode in ("serial", "process"):
+        manager = LogDataManager(ParallelFilter(mode, workers))
+        manager.load_file(path)
+        if mode == "process":
+            # 작업자 프로세스 기동 시간은 제외
+            manager.parallel.warm_up()
+        t = time.perf_counter()
+        rows = manager.get_filtered_lines(filters, [])
+        elapsed = time.perf_counter() - t
+        results[mode] = rows
+        print(f"{mode:>8}: {elapsed:.3f}s, {len(rows)} / {manager.line_count} lines")
+        manager.close()
+    print("same result:", list(results["serial"]) == list(results["process"]))
+
+
+if __name__ == "__main__":
+    # 사용법: python -m widget.parallel_filter <로그 파일> <단어> [<단어> ...]
+    if len(sys.argv) < 3:
+        print("usage: python -m widget.parallel_filter <log file> <term> [<term> ...]")
+        sys.exit(1)
+    benchmark(sys.argv[1], sys.argv[2:])
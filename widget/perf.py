@@ -0,0 +1,219 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# 값이 있으면 세션 전체를 cProfile로 기록 (폴더 경로, "1"이면 기본 폴더)
+PROFILE_ENV = "LOG_VIEWER_PROFILE"
+# 실행 인자로 켤 때: --profile 또는 --profile=폴더
+PROFILE_FLAG = "--profile"
+# 기본 프로파일 폴더 이름 (설정 파일과 같은 위치)
+PROFILE_DIR = "log_viewer_profile"
+# 트레이스에 남기는 최대 구간 수 (오래 켜 두어도 메모리가 계속 늘지 않도록)
+TRACE_LIMIT = 200000
+# 성능 표시줄에 보여 주는 단계 (순서대로, startup은 실행부터 첫 화면까지)
+HUD_PHASES = ["startup", "load", "read", "decompress", "index", "filter", "render", "rehighlight", "search", "export"]
+# 처리량(lines/s)을 함께 보여 주는 단계 (그리기처럼 보이는 줄만 다루는 단계는 제외)
+THROUGHPUT_PHASES = {"load", "filter", "search", "export"}
+
+
+class PerfRecorder:
+    """
+    단계(로딩, 필터, 그리기, 하이라이트, 검색, 내보내기)별 소요 시간을 모읍니다.
+    - last: 단계마다 마지막 기록 (성능 표시줄이 읽음)
+    - trace: 프로파일링 중이면 모든 기록 (Chrome trace 형식으로 저장)
+    어느 스레드에서나 기록할 수 있습니다. (GIL 아래에서 dict/list 갱신은 원자적)
+    """
+    def __init__(self):
+        self.last = {}
+        self.trace = None
+        self._origin = time.perf_counter()
+
+    def record(self, name, seconds, **counts):
+        """
+        끝난 단계 하나를 기록합니다.
+        counts: lines(처리한 줄 수), matched(걸린 줄 수), bytes(처리한 바이트) 등
+        """
+        end = time.perf_counter()
+        stats = {"ms": seconds * 1000, "at": end, **counts}
+        self.last[name] = stats
+        trace = self.trace
+        if trace is not None and len(trace) < TRACE_LIMIT:
+            trace.append({
+                "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": round((end - seconds - self._origin) * 1e6), "dur": round(seconds * 1e6),
+                "args": counts,
+            })
+
+    @contextmanager
+    def phase(self, name, **counts):
+        """
+        with 블록의 소요 시간을 기록합니다. 블록 안에서 받은 dict에 개수를 채우면 함께 기록됩니다.
+        예: with recorder.phase("filter") as stats: ...; stats["matched"] = n
+        """
+        stats = dict(counts)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            self.record(name, time.perf_counter() - started, **stats)
+
+    def begin(self):
+        """신호로 끝을 알리는 (다른 스레드에서 도는) 단계의 시작 시각. end()에 넘깁니다."""
+        return time.perf_counter()
+
+    def end(self, name, started, **counts):
+        if started is not None:
+            self.record(name, time.perf_counter() - started, **counts)
+
+
+# 앱 전체가 함께 쓰는 기록기
+recorder = PerfRecorder()
+
+
+def resident_memory_mb():
+    """현재 프로세스의 상주 메모리 (MB), 알 수 없으면 None"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize / (1024 * 1024)
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    # 현재 값을 읽을 수 없는 OS는 최대값 (macOS는 바이트 단위)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _rate(count, ms):
+    """초당 처리량 (1.2M, 850k 형식)"""
+    rate = count * 1000 / ms
+    if rate >= 1e6:
+        return f"{rate / 1e6:.1f}M"
+    if rate >= 1e3:
+        return f"{rate / 1e3:.0f}k"
+    return f"{rate:.0f}"
+
+
+def hud_text(last, memory_mb=None):
+    """단계별 마지막 기록을 한 줄로 씁니다. 예: load 812 ms, 2,000,000 lines (2.5M lines/s) | ... | RSS 154 MB"""
+    parts = []
+    for name in HUD_PHASES:
+        stats = last.get(name)
+        if stats is None:
+            continue
+        ms = stats["ms"]
+        text = f"{name} {ms:,.0f} ms" if ms >= 10 else f"{name} {ms:.1f} ms"
+        lines, size = stats.get("lines"), stats.get("bytes")
+        if lines is not None:
+            text += f", {lines:,} lines"
+            if ms > 0 and lines and name in THROUGHPUT_PHASES:
+                text += f" ({_rate(lines, ms)} lines/s)"
+        elif size:
+            text += f", {size / (1024 * 1024):,.0f} MB"
+            if ms > 0:
+                text += f" ({_rate(size / (1024 * 1024), ms)} MB/s)"
+        if stats.get("matched") is not None:
+            text += f", {stats['matched']:,} matched"
+        parts.append(text)
+    if memory_mb is not None:
+        parts.append(f"RSS {memory_mb:,.0f} MB")
+    return "  |  ".join(parts)
+
+
+def profile_directory(argv, base_path):
+    """
+    프로파일링을 켰으면 결과를 저장할 폴더, 아니면 None.
+    실행 인자(--profile[=폴더])가 환경 변수(LOG_VIEWER_PROFILE)보다 우선합니다.
+    """
+    value = None
+    for arg in argv[1:]:
+        if arg == PROFILE_FLAG:
+            value = "1"
+        elif arg.startswith(PROFILE_FLAG + "="):
+            value = arg.split("=", 1)[1]
+    if value is None:
+        value = os.environ.get(PROFILE_ENV, "")
+    if not value or value.lower() in ("0", "false", "no"):
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        return os.path.join(base_path, PROFILE_DIR)
+    return value
+
+
+class ProfileSession:
+    """
+    세션 전체의 cProfile(GUI 스레드)과 단계별 트레이스를 기록하고, 끝나면 폴더에 저장합니다.
+    - profile-<시각>.prof: pstats/snakeviz로 열 수 있는 cProfile 결과
+    - trace-<시각>.json: 단계별 구간 (chrome://tracing, Perfetto로 열 수 있음)과 요약
+    백그라운드 스레드(로딩, 검색, 내보내기)의 시간은 트레이스에만 남습니다.
+    """
+    def __init__(self, directory):
+        # 프로파일링할 때만 가져옴
+        import cProfile
+        self.directory = directory
+        self.profile = cProfile.Profile()
+        self.started = None
+
+    def start(self):
+        self.started = time.strftime("%Y%m%d-%H%M%S")
+        recorder.trace = []
+        self.profile.enable()
+
+    def stop(self):
+        """기록을 멈추고 저장한 (프로파일, 트레이스) 경로를 반환합니다."""
+        self.profile.disable()
+        trace, recorder.trace = recorder.trace or [], None
+        import platform
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile_path = os.path.join(self.directory, f"profile-{self.started}.prof")
+            trace_path = os.path.join(self.directory, f"trace-{self.started}.json")
+            self.profile.dump_stats(profile_path)
+            with open(trace_path, "w") as f:
+                json.dump({
+                    "started": self.started,
+                    "environment": {
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "cpu_count": os.cpu_count(),
+                        "memory_mb": resident_memory_mb(),
+                    },
+                    "summary": summarize(trace),
+                    "traceEvents": trace,
+                }, f, indent=1)
+            return profile_path, trace_path
+        except OSError as e:
+            print(f"Error saving profile: {e}")
+            return None
+
+
+def summarize(trace):
+    """트레이스의 단계별 횟수, 합계/최대 ms"""
+    result = {}
+    for event in trace:
+        item = result.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        ms = event["dur"] / 1000
+        item["count"] += 1
+        item["total_ms"] = round(item["total_ms"] + ms, 3)
+        item["max_ms"] = max(item["max_ms"], round(ms, 3))
+    return result
@@ -0,0 +1,163 @@
+import re
+from array import array
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from .filter_engine import FILTER_CHUNK_SIZE
+
+# 필터된 뷰를 검색할 때 한 번에 이어 붙여 검사하는 줄 수
+SEARCH_BATCH_LINES = 20000
+
+
+def find_in_text(pattern, text, indices, lines, cols):
+    """
+    줄들을 '\\n'으로 이어 붙인 텍스트에서 pattern을 찾아
+    (원본 줄 번호, 줄 안의 시작 열)을 lines, cols 배열에 추가합니다.
+    indices[k] = 텍스트의 k번째 줄의 원본 줄 번호
+    """
+    line = pos = line_start = 0
+    for m in pattern.finditer(text):
+        s = m.start()
+        skipped = text.count("\n", pos, s)
+        if skipped:
+            line += skipped
+            line_start = text.rfind("\n", pos, s) + 1
+        pos = s
+        lines.append(indices[line])
+        cols.append(s - line_start)
+
+
+class SearchWorker(QThread):
+    """저장소의 줄 데이터를 백그라운드에서 훑어 검색어 위치를 찾는 스레드"""
+    # (원본 줄 번호 배열, 시작 열 배열) - 찾은 순서(줄 순서)대로 조금씩 보냄
+    matches_found = pyqtSignal(object, object)
+    search_finished = pyqtSignal()
+
+    def __init__(self, store, rows, term, case_sensitive):
+        """
+        store: 이 스레드 전용 저장소 (LineStore.snapshot(), 끝나면 닫음)
+        rows: 검색할 원본 줄 번호 (range 또는 오름차순 배열)
+        """
+        super().__init__()
+        self.store = store
+        self.rows = rows
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self.pattern = re.compile(re.escape(term), flags)
+
+    def cancel(self):
+        self.requestInterruption()
+        self.wait()
+
+    def _batches(self):
+        """(원본 줄 번호들, '\\n'으로 이어 붙인 텍스트) 묶음을 순서대로 돌려줍니다."""
+        rows = self.rows
+        if isinstance(rows, range):
+            # 연속된 범위는 덩어리째 한 번에 디코딩
+            for first, end, data in self.store.iter_chunks(rows.start, rows.stop, FILTER_CHUNK_SIZE):
+                yield range(first, end), data.decode("utf-8", errors="ignore").replace("\r\n", "\n")
+        else:
+            for i in range(0, len(rows), SEARCH_BATCH_LINES):
+                indices = rows[i:i + SEARCH_BATCH_LINES]
+                yield indices, "\n".join(self.store.lines(indices))
+
+    def run(self):
+        try:
+            for indices, text in self._batches():
+                if self.isInterruptionRequested():
+                    return
+                lines, cols = array("q"), array("q")
+                find_in_text(self.pattern, text, indices, lines, cols)
+                if lines:
+                    self.matches_found.emit(lines, cols)
+        except Exception as e:
+            print(f"Error searching log: {e}")
+        finally:
+            self.store.close()
+            self.search_finished.emit()
+
+
+class SearchEngine(QObject):
+    """
+    검색 실행과 결과 이동을 맡는 클래스.
+    결과는 (원본 줄 번호, 시작 열) 두 개의 정수 배열로만 보관하고,
+    다음/이전 이동은 배열 위치만 바꾸므로 결과 수와 관계없이 O(1)입니다.
+    """
+    # (현재 번호(1-based, 0=선택 없음), 지금까지 찾은 수, 검색 완료 여부)
+    count_changed = pyqtSignal(int, int, bool)
+    # 현재 결과가 바뀜: (원본 줄 번호, 시작 열, 길이)
+    match_selected = pyqtSignal(int, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        self.lines = array("q")
+        self.cols = array("q")
+        self.index = -1
+        self.length = 0
+        self.finished = True
+        # 지금 결과를 만든 검색 조건 (검색어, 대소문자 구분, 전체 파일)
+        self.query = None
+
+    def __len__(self):
+        return len(self.lines)
+
+    def search(self, store, rows, term, case_sensitive, whole_file):
+        """이전 검색을 멈추고 새 검색을 백그라운드에서 시작합니다."""
+        self.clear()
+        self.query = (term, case_sensitive, whole_file)
+        self.length = len(term)
+        self.finished = False
+        if whole_file:
+            rows = range(len(store))
+        elif not isinstance(rows, range):
+            # 뷰의 배열은 로딩/따라가기 중 늘어나므로 시작 시점의 복사본을 검색
+            rows = array("q", rows)
+
+        self.worker = SearchWorker(store.snapshot(), rows, term, case_sensitive)
+        self.worker.matches_found.connect(self.on_matches_found)
+        self.worker.search_finished.connect(self.on_search_finished)
+        self.worker.start()
+        self.count_changed.emit(0, 0, False)
+
+    def clear(self):
+        """검색을 멈추고 결과를 비웁니다."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.lines = array("q")
+        self.cols = array("q")
+        self.index = -1
+        self.finished = True
+        self.query = None
+
+    def on_matches_found(self, lines, cols):
+        if self.sender() is not self.worker:
+            return
+        self.lines.extend(lines)
+        self.cols.extend(cols)
+        if self.index < 0:
+            # 첫 결과가 나오면 바로 이동
+            self.step(True)
+        else:
+            self.count_changed.emit(self.index + 1, len(self.lines), False)
+
+    def on_search_finished(self):
+        if self.sender() is not self.worker:
+            return
+        self.worker.wait()
+        self.worker = None
+        self.finished = True
+        self.count_changed.emit(self.index + 1, len(self.lines), True)
+
+    def step(self, forward=True):
+        """다음(또는 이전) 결과로 이동합니다. 결과가 없으면 False를 반환합니다."""
+        total = len(self.lines)
+        if not total:
+            return False
+        if self.index < 0:
+            self.index = 0 if forward else total - 1
+        else:
+            self.index = (self.index + (1 if forward else -1)) % total
+        self.count_changed.emit(self.index + 1, total, self.finished)
+        self.match_selected.emit(self.lines[self.index], self.cols[self.index], self.length)
+        return True
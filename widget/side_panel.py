@@ -1,11 +1,13 @@
 # side_panel.py
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel
 from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QColor
 
 # 분리된 위젯들 임포트
 from .side_penel_widget.search_widget import SearchWidget
 from .side_penel_widget.go_to_line_widget import GoToLineWidget
-from .side_penel_widget.item_managers import FilterManager, HighlightManager
+from .side_penel_widget.time_range_widget import TimeRangeWidget
+from .side_penel_widget.item_managers import DEFAULT_HIGHLIGHT_COLOR, FilterManager, HighlightManager
 from .side_penel_widget.memo_widget import MemoWidget
 
 class SidePanel(QWidget):
@@ -13,9 +15,12 @@ class SidePanel(QWidget):
     filters_updated = pyqtSignal(list)
     highlights_updated = pyqtSignal(list)
     export_requested = pyqtSignal()
-    search_triggered = pyqtSignal(str, object)
+    search_triggered = pyqtSignal(str, object, bool)
     search_cleared = pyqtSignal()
     go_to_line_requested = pyqtSignal(int)
+    highlight_jump_requested = pyqtSignal(str, bool, bool)
+    time_range_requested = pyqtSignal(str, str)
+    time_range_cleared = pyqtSignal()
     
     def __init__(self):
         super().__init__()
@@ -23,6 +28,8 @@ class SidePanel(QWidget):
         
         # 1. 위젯 생성
         self.search_widget = SearchWidget()
+        self.go_to_line_widget = GoToLineWidget()
+        self.time_range_widget = TimeRangeWidget()
         self.or_filter_manager = FilterManager("OR")
         self.and_filter_manager = FilterManager("AND")
         self.hl_manager = HighlightManager()
@@ -47,7 +54,8 @@ class SidePanel(QWidget):
         
         # 2. 레이아웃에 조립
         layout.addWidget(self.search_widget)
-        # layout.addWidget(self.go_to_line_widget)
+        layout.addWidget(self.go_to_line_widget)
+        layout.addWidget(self.time_range_widget)
         layout.addWidget(self.or_filter_manager)
         layout.addWidget(self.and_filter_manager)
         layout.addWidget(self.hl_manager)
@@ -63,7 +71,10 @@ class SidePanel(QWidget):
         self.export_btn.clicked.connect(self.export_requested)
         self.search_widget.search_triggered.connect(self.search_triggered)
         self.search_widget.search_cleared.connect(self.search_cleared)
-        # self.go_to_line_widget.go_to_line_requested.connect(self.go_to_line_requested)
+        self.go_to_line_widget.go_to_line_requested.connect(self.go_to_line_requested)
+        self.hl_manager.jump_requested.connect(self.highlight_jump_requested)
+        self.time_range_widget.time_range_requested.connect(self.time_range_requested)
+        self.time_range_widget.time_range_cleared.connect(self.time_range_cleared)
         
     def load_settings(self, config):
         """설정을 각 매니저에 전달합니다."""
@@ -71,28 +82,20 @@ class SidePanel(QWidget):
         add_filters = config.get("add_filters", [])
         highlights = config.get("highlights", [])
         memo = config.get("memo", "")
-        
-        for f_data in or_filters:
-            term = f_data.get("term")
-            is_case_i = f_data.get("is_case_i", False)
-            checked = f_data.get("is_checked", True)
-            if term:
-                self.or_filter_manager.add_filter_item(term, checked=checked, is_case_i=is_case_i)
-        
-        for f_data in add_filters:
-            term = f_data.get("term")
-            is_case_i = f_data.get("is_case_i", False)
-            checked = f_data.get("is_checked", True)
-            if term:
-                self.and_filter_manager.add_filter_item(term, checked=checked, is_case_i=is_case_i)
 
-        for h_data in highlights:
-            term = h_data.get("term")
-            color = h_data.get("color", "#ffff00")
-            is_case_i = h_data.get("is_case_i", False)
-            checked = h_data.get("is_checked", True)
-            if term:
-                self.hl_manager.add_highlight_item(term, color, checked=checked, is_case_i=is_case_i)
+        # 목록마다 한 번에 추가 (항목이 많아도 변경 알림은 한 번)
+        for manager, filters in ((self.or_filter_manager, or_filters), (self.and_filter_manager, add_filters)):
+            manager.add_items([
+                {"term": f_data["term"], "kind": f_data.get("kind", "text"),
+                 "is_checked": f_data.get("is_checked", True), "is_case_i": f_data.get("is_case_i", False)}
+                for f_data in filters if f_data.get("term")
+            ])
+
+        self.hl_manager.add_items([
+            {"term": h_data["term"], "color": QColor(h_data.get("color", DEFAULT_HIGHLIGHT_COLOR)).name(),
+             "is_checked": h_data.get("is_checked", True), "is_case_i": h_data.get("is_case_i", False)}
+            for h_data in highlights if h_data.get("term")
+        ])
 
         self.memo_widget.set_text(memo)
         
@@ -13,7 +13,7 @@ class GoToLineWidget(QWidget):
         
         self.line_num_box = QLineEdit()
         self.line_num_box.setPlaceholderText("Go to line...")
-        self.line_num_box.setValidator(QIntValidator(1, 9999999)) 
+        self.line_num_box.setValidator(QIntValidator(1, 2147483647))
         
         self.go_btn = QPushButton("Go")
         self.go_btn.setFixedWidth(40)
@@ -1,14 +1,49 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
-    QListWidget, QListWidgetItem, QPushButton, QCheckBox, 
-    QColorDialog, QLabel
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
+    QPushButton, QColorDialog, QLabel, QComboBox, QMessageBox, QFileDialog
 )
 from PyQt5.QtGui import QColor
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import pyqtSignal
+
+from ..filter_expr import FILTER_KINDS, FilterSyntaxError, item_tree
+from .item_model import TermDelegate, TermListModel, TermListView
+
+# 필터 종류 선택 상자에 보이는 이름과 설명 (FILTER_KINDS 순서)
+KIND_LABELS = ["Text", "Regex", "Expr"]
+KIND_TOOLTIP = (
+    "Text: plain substring\n"
+    "Regex: regular expression, e.g. timeout \\d+ms\n"
+    "Expr: ERROR (modem | wifi) !\"link up\" /retry \\d+/i time>=12:00 source:kernel\n"
+    "      (AND by default, | or 'or', ! or 'not', quote phrases and paths)"
+)
+# 하이라이트 기본 색
+DEFAULT_HIGHLIGHT_COLOR = "#ffff00"
+# 단어 목록 파일 (한 줄에 하나, 빈 줄은 무시)
+TERM_FILE_FILTER = "Text Files (*.txt);;All Files (*.*)"
+
+
+def read_term_file(path):
+    """단어 목록 파일에서 단어들을 읽습니다. (앞뒤 공백 제거, 빈 줄 제외, 파일 순서)"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write_term_file(path, terms):
+    with open(path, "w", encoding="utf-8") as f:
+        for term in terms:
+            f.write(term + "\n")
+
 
 class BaseItemManager(QWidget):
+    """
+    단어 항목 목록 (필터/하이라이트 공용).
+    항목은 모델(TermListModel)에 보관하고 목록은 보이는 줄만 그리므로 수천 개도 가볍게 다룹니다.
+    항목을 여러 개 바꿔도 items_changed는 한 번만 보냅니다.
+    """
     items_changed = pyqtSignal(list)
-    
+    # 목록 오른쪽 끝부터 놓는 버튼
+    BUTTONS = ("remove", "case")
+
     def __init__(self, name='', add_placeholder=''):
         super().__init__()
         layout = QVBoxLayout(self)
@@ -19,171 +54,192 @@ class BaseItemManager(QWidget):
         
         self.add_btn = QPushButton(f"Add {self.__class__.__name__.replace('Manager', '')}")
         
-        self.list_widget = QListWidget()
+        self.model = TermListModel(self)
+        self.delegate = TermDelegate(self.BUTTONS, self)
+        self.list_view = TermListView(self.model, self.delegate)
 
         add_widget = QWidget()
-        add_layout = QHBoxLayout(add_widget)
-        add_layout.addWidget(QLabel(name))
-        add_layout.addWidget(self.add_box)
-        add_layout.addWidget(self.add_btn)
+        self.add_layout = QHBoxLayout(add_widget)
+        self.add_layout.addWidget(QLabel(name))
+        self.add_layout.addWidget(self.add_box)
+        self.add_layout.addWidget(self.add_btn)
         
         layout.addWidget(add_widget)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.list_view)
         
         self.add_box.returnPressed.connect(self.on_add_pressed)
         self.add_btn.clicked.connect(self.on_add_pressed)
+        self.model.items_changed.connect(self.on_model_changed)
+        self.delegate.button_clicked.connect(self.on_button_clicked)
+        self.list_view.action_requested.connect(self.on_list_action)
 
     def on_add_pressed(self):
         raise NotImplementedError
 
-    def find_item(self, term):
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            data = item.data(Qt.UserRole)
-            if data and data.get("term") == term:
-                return item
-        return None
+    def on_model_changed(self):
+        self.items_changed.emit(self.get_all_data())
+
+    def find_item(self, term, kind=None):
+        """(단어, 종류) 항목 dict, 없으면 None (종류를 주지 않으면 종류와 관계없이)"""
+        return self.model.find(term, kind)
 
     def get_all_data(self):
-        data_list = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            widget = self.list_widget.itemWidget(item)
-            cb = widget.findChild(QCheckBox)
-            
-            if cb and cb.isChecked():
-                data = item.data(Qt.UserRole)
-                if data:
-                    case_cb = widget.findChild(QCheckBox, "case_i_cb")
-                    data["is_case_i"] = case_cb.isChecked() if case_cb else False
-                    data_list.append(data)
-        return data_list
-
-    def remove_item(self, list_item):
-        self.list_widget.takeItem(self.list_widget.row(list_item))
-        self.items_changed.emit(self.get_all_data())
+        """켜진 항목 목록 [{"term", "kind", "is_checked", "is_case_i", ...}, ...] (복사본)"""
+        return list(self.model.checked_items())
+
+    def get_save_data(self):
+        """설정 파일에 저장할 모든 항목 (보이는 순서)"""
+        return [
+            {"term": item["term"], "kind": item["kind"], "is_checked": item["is_checked"], "is_case_i": item["is_case_i"]}
+            for item in self.model.items()
+        ]
+
+    def add_items(self, items):
+        """항목 dict 목록을 한 번에 추가합니다. (이미 있는 항목은 건너뜀, 변경 알림은 한 번)"""
+        return self.model.add_items(items)
+
+    def remove_item(self, item):
+        row = self.model.row_of(item)
+        if row >= 0:
+            self.model.remove_rows([row])
+
+    def on_button_clicked(self, name, row):
+        if name == "remove":
+            self.model.remove_rows([row])
+
+    # --- 가져오기/내보내기 ---
+
+    def on_list_action(self, name):
+        model = self.model
+        if name == "import":
+            self.import_from_file()
+        elif name == "export":
+            self.export_to_file()
+        elif name in ("check_all", "uncheck_all"):
+            model.set_field(range(len(model)), "is_checked", name == "check_all")
+        elif name == "remove_selected":
+            model.remove_rows(self.list_view.selected_rows())
+        elif name == "remove_all":
+            model.clear()
+
+    def import_items(self, terms):
+        """
+        단어 목록을 새 항목으로 만듭니다. 반환: (항목 목록, 건너뛴 잘못된 단어 수)
+        하위 클래스가 종류/색 등을 채웁니다.
+        """
+        return [{"term": term} for term in terms], 0
+
+    def import_terms(self, terms):
+        """단어 목록을 한 번에 추가합니다. 반환: (추가한 수, 이미 있던 수, 잘못된 단어 수)"""
+        items, invalid = self.import_items(terms)
+        added = self.model.add_items(items)
+        return added, len(items) - added, invalid
+
+    def import_from_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Terms", "", TERM_FILE_FILTER)
+        if not path:
+            return
+        try:
+            terms = read_term_file(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Import Error", f"Failed to read terms:\n{e}")
+            return
+        added, existing, invalid = self.import_terms(terms)
+        if existing or invalid:
+            QMessageBox.information(
+                self, "Import", f"Added {added:,} terms ({existing:,} already listed, {invalid:,} invalid).")
+
+    def export_to_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Terms", "", TERM_FILE_FILTER)
+        if not path:
+            return
+        try:
+            # 다시 가져오면 지금과 같은 순서가 되도록 아래(먼저 추가한 항목)부터 씀
+            write_term_file(path, [item["term"] for item in reversed(self.model.items())])
+        except OSError as e:
+            QMessageBox.warning(self, "Export Error", f"Failed to write terms:\n{e}")
 
 
 # --- 필터 관리자 ---
 class FilterManager(BaseItemManager):
     def __init__(self, filter_type='OR'):
         super().__init__(filter_type + " Filter", "Add filter keyword")
+        # 단어 / 정규식 / 표현식
+        self.kind_box = QComboBox()
+        self.kind_box.addItems(KIND_LABELS)
+        self.kind_box.setToolTip(KIND_TOOLTIP)
+        self.add_layout.insertWidget(1, self.kind_box)
+
+    def current_kind(self):
+        return FILTER_KINDS[self.kind_box.currentIndex()]
 
     def on_add_pressed(self):
         term = self.add_box.text().strip()
-        if not term or self.find_item(term):
+        kind = self.current_kind()
+        if not term or self.find_item(term, kind):
+            return
+        try:
+            # 잘못된 정규식/표현식은 목록에 넣지 않음
+            item_tree({"term": term, "kind": kind})
+        except FilterSyntaxError as e:
+            QMessageBox.warning(self, "Filter", f"Invalid {KIND_LABELS[FILTER_KINDS.index(kind)].lower()}:\n{e}")
             return
         self.add_box.clear()
-        self.add_filter_item(term, checked=True)
-        self.items_changed.emit(self.get_all_data())
-
-    def add_filter_item(self, term, checked=True, is_case_i=False):
-        item_widget = QWidget()
-        layout = QHBoxLayout(item_widget)
-        layout.setContentsMargins(3, 0, 3, 0)
-        
-        checkbox = QCheckBox(term)
-        checkbox.setChecked(checked)
-        
-        case_cb = QCheckBox("i")
-        case_cb.setToolTip("Case Insensitive")
-        case_cb.setObjectName("case_i_cb")
-        case_cb.setFixedWidth(30)
-        case_cb.setChecked(is_case_i)
-        
-        remove_btn = QPushButton("X")
-        remove_btn.setFixedWidth(20)
-        
-        layout.addWidget(checkbox)
-        layout.addStretch()
-        layout.addWidget(case_cb)
-        layout.addWidget(remove_btn)
-        
-        list_item = QListWidgetItem()
-        data = {"term": term}
-        list_item.setData(Qt.UserRole, data)
-        
-        self.list_widget.insertItem(0, list_item)
-        self.list_widget.setItemWidget(list_item, item_widget)
-        
-        remove_btn.clicked.connect(lambda: self.remove_item(list_item))
-        checkbox.stateChanged.connect(lambda: self.items_changed.emit(self.get_all_data()))
-        case_cb.stateChanged.connect(lambda: self.items_changed.emit(self.get_all_data()))
+        self.add_filter_item(term, checked=True, kind=kind)
+
+    def add_filter_item(self, term, checked=True, is_case_i=False, kind="text"):
+        self.model.add_items([{"term": term, "kind": kind, "is_checked": checked, "is_case_i": is_case_i}])
+
+    def import_items(self, terms):
+        """가져온 단어는 지금 고른 종류로 추가합니다. (정규식/표현식이면 잘못된 줄은 건너뜀)"""
+        kind = self.current_kind()
+        items = []
+        invalid = 0
+        for term in terms:
+            if kind != "text":
+                try:
+                    item_tree({"term": term, "kind": kind})
+                except FilterSyntaxError:
+                    invalid += 1
+                    continue
+            items.append({"term": term, "kind": kind})
+        return items, invalid
 
 # --- 하이라이트 관리자 ---
 class HighlightManager(BaseItemManager):
-    items_changed = pyqtSignal(list)
+    # (단어, 대소문자 무시, 다음 방향 여부) - 이 하이라이트가 걸린 다음/이전 줄로 이동
+    jump_requested = pyqtSignal(str, bool, bool)
+    BUTTONS = ("remove", "case", "color", "next", "prev")
     
     def __init__(self):
         super().__init__("Highlighter", "Add highlight keyword")
-        self.highlight_colors = {}
 
     def on_add_pressed(self):
         term = self.add_box.text().strip()
         if not term or self.find_item(term):
             return
         self.add_box.clear()
-        self.add_highlight_item(term, "#ffff00", checked=True)
-        self.items_changed.emit(self.get_all_data())
+        self.add_highlight_item(term, DEFAULT_HIGHLIGHT_COLOR, checked=True)
 
-    def get_all_data(self):
-        data_list = super().get_all_data()
-        for data in data_list:
-            data["color"] = self.highlight_colors.get(data["term"], QColor("#ffff00"))
-        return data_list
+    def get_save_data(self):
+        return [
+            {"term": item["term"], "is_checked": item["is_checked"], "is_case_i": item["is_case_i"], "color": item["color"]}
+            for item in self.model.items()
+        ]
 
     def add_highlight_item(self, term, color, checked=True, is_case_i=False):
-        item_widget = QWidget()
-        layout = QHBoxLayout(item_widget)
-        layout.setContentsMargins(3, 0, 3, 0)
-        
-        checkbox = QCheckBox(term)
-        checkbox.setChecked(checked)
-        
-        color_btn = QPushButton()
-        color_btn.setFixedWidth(30)
-        q_color = QColor(color)
-        color_btn.setStyleSheet(f"background-color: {q_color.name()}; border-radius: 3px;")
-        
-        case_cb = QCheckBox("i")
-        case_cb.setToolTip("Case Insensitive")
-        case_cb.setObjectName("case_i_cb")
-        case_cb.setFixedWidth(30)
-        case_cb.setChecked(is_case_i)
-        
-        remove_btn = QPushButton("X")
-        remove_btn.setFixedWidth(20)
-        
-        layout.addWidget(checkbox)
-        layout.addStretch()
-        layout.addWidget(color_btn)
-        layout.addWidget(case_cb)
-        layout.addWidget(remove_btn)
-        
-        list_item = QListWidgetItem()
-        data = {"term": term}
-        list_item.setData(Qt.UserRole, data)
-        self.highlight_colors[term] = q_color
-        
-        self.list_widget.insertItem(0, list_item)
-        self.list_widget.setItemWidget(list_item, item_widget)
-        
-        def change_color():
-            new_color = QColorDialog.getColor(self.highlight_colors[term], self)
+        self.model.add_items([{"term": term, "color": QColor(color).name(), "is_checked": checked, "is_case_i": is_case_i}])
+
+    def import_items(self, terms):
+        return [{"term": term, "color": DEFAULT_HIGHLIGHT_COLOR} for term in terms], 0
+
+    def on_button_clicked(self, name, row):
+        item = self.model.item(row)
+        if name == "color":
+            new_color = QColorDialog.getColor(QColor(item["color"]), self)
             if new_color.isValid():
-                self.highlight_colors[term] = new_color
-                color_btn.setStyleSheet(f"background-color: {new_color.name()}; border-radius: 3px;")
-                self.items_changed.emit(self.get_all_data())
-
-        color_btn.clicked.connect(change_color)
-        remove_btn.clicked.connect(lambda: self.remove_item(list_item))
-        checkbox.stateChanged.connect(lambda: self.items_changed.emit(self.get_all_data()))
-        case_cb.stateChanged.connect(lambda: self.items_changed.emit(self.get_all_data()))
-
-    def remove_item(self, list_item):
-        data = list_item.data(Qt.UserRole)
-        if data:
-            term = data.get("term")
-            if term and term in self.highlight_colors:
-                del self.highlight_colors[term]
-        super().remove_item(list_item)
+                self.model.set_field([row], "color", new_color.name())
+        elif name in ("next", "prev"):
+            self.jump_requested.emit(item["term"], item["is_case_i"], name == "next")
+        else:
+            super().on_button_clicked(name, row)
@@ -0,0 +1,367 @@
+from contextlib import contextmanager
+
+from PyQt5.QtWidgets import QAbstractItemView, QListView, QMenu, QStyle, QStyledItemDelegate, QToolTip
+from PyQt5.QtGui import QColor, QFont, QPen
+from PyQt5.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt, pyqtSignal
+
+from ..filter_expr import FILTER_KINDS
+
+# 항목 전체 dict를 돌려주는 역할 (data(index, ITEM_ROLE))
+ITEM_ROLE = Qt.UserRole
+# 줄 높이에 더하는 여백과 버튼/체크 표시 크기 (px)
+ROW_PADDING = 8
+CHECK_SIZE = 14
+CASE_SIZE = 12
+BUTTON_WIDTH = 20
+COLOR_WIDTH = 30
+SPACING = 4
+# 종류 표시 (regex/expr) 너비 (px)
+KIND_WIDTH = 34
+# 다크 테마 색 (앱 스타일시트의 QCheckBox/QPushButton과 같은 색)
+BOX_COLOR = QColor("#3a3a3a")
+BOX_BORDER = QColor("#777")
+BUTTON_BORDER = QColor("#555")
+CHECKED_COLOR = QColor("#888")
+KIND_COLOR = QColor("#888")
+
+
+def item_key(term, kind="text"):
+    return (term, kind)
+
+
+class TermListModel(QAbstractListModel):
+    """
+    필터/하이라이트 항목 목록 모델. 항목: {"term", "kind", "is_checked", "is_case_i"} (+ 하이라이트는 "color")
+    - (단어, 종류)로 항목을 바로 찾도록 색인을 함께 둠
+    - 여러 항목을 한꺼번에 추가/삭제/변경하면 알림(items_changed)은 한 번만 보냄 (batch())
+    - 켜진 항목 목록은 바뀔 때까지 캐시 (필터/하이라이트 재계산 때마다 목록을 다시 훑지 않음)
+    """
+    items_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 보이는 순서 (새 항목이 위)
+        self._items = []
+        # (단어, 종류) -> 항목
+        self._by_key = {}
+        # 켜진 항목의 복사본 목록 (바뀌면 None)
+        self._checked = None
+        # batch() 중첩 수와 그동안 바뀐 것이 있는지
+        self._batch = 0
+        self._dirty = False
+
+    # --- Qt 모델 ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return item["term"]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if item["is_checked"] else Qt.Unchecked
+        if role == ITEM_ROLE:
+            return item
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    # --- 조회 ---
+
+    def __len__(self):
+        return len(self._items)
+
+    def find(self, term, kind=None):
+        """(단어, 종류) 항목, 없으면 None. kind가 없으면 종류와 관계없이 찾습니다."""
+        if kind is not None:
+            return self._by_key.get(item_key(term, kind))
+        for key_kind in FILTER_KINDS:
+            item = self._by_key.get(item_key(term, key_kind))
+            if item is not None:
+                return item
+        return None
+
+    def items(self):
+        """모든 항목 (보이는 순서)"""
+        return list(self._items)
+
+    def item(self, row):
+        return self._items[row]
+
+    def row_of(self, item):
+        """항목의 줄 번호, 목록에 없으면 -1"""
+        key = item_key(item["term"], item.get("kind", "text"))
+        if self._by_key.get(key) is not item:
+            return -1
+        return self._items.index(item)
+
+    def checked_items(self):
+        """켜진 항목의 복사본 목록 (보이는 순서, 다음 변경 전까지 같은 목록을 재사용)"""
+        if self._checked is None:
+            self._checked = [dict(item) for item in self._items if item["is_checked"]]
+        return self._checked
+
+    # --- 변경 ---
+
+    @contextmanager
+    def batch(self):
+        """with 블록 안의 변경 알림을 모아 끝날 때 한 번만 보냅니다."""
+        self._batch += 1
+        try:
+            yield
+        finally:
+            self._batch -= 1
+            if not self._batch and self._dirty:
+                self._dirty = False
+                self.items_changed.emit()
+
+    def _changed(self):
+        self._checked = None
+        if self._batch:
+            self._dirty = True
+        else:
+            self.items_changed.emit()
+
+    def add_items(self, items):
+        """
+        항목들을 목록 위에 추가합니다. (하나씩 위에 넣은 것과 같은 순서: 마지막 항목이 맨 위)
+        이미 있는 (단어, 종류)는 건너뛰고, 추가한 개수를 반환합니다.
+        """
+        new = []
+        for item in items:
+            key = item_key(item["term"], item.get("kind", "text"))
+            if not item["term"] or key in self._by_key:
+                continue
+            item.setdefault("kind", "text")
+            item.setdefault("is_checked", True)
+            item.setdefault("is_case_i", False)
+            self._by_key[key] = item
+            new.append(item)
+        if new:
+            self.beginInsertRows(QModelIndex(), 0, len(new) - 1)
+            self._items[0:0] = new[::-1]
+            self.endInsertRows()
+            self._changed()
+        return len(new)
+
+    def remove_rows(self, rows):
+        """여러 줄을 지웁니다. (이어진 구간마다 한 번씩 알리고 변경 알림은 한 번)"""
+        rows = sorted(set(rows), reverse=True)
+        if not rows:
+            return
+        # 뒤에서부터 이어진 구간 단위로 지워야 앞 줄 번호가 바뀌지 않음
+        end = start = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == start - 1:
+                start = row
+                continue
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for item in self._items[start:end + 1]:
+                del self._by_key[item_key(item["term"], item["kind"])]
+            del self._items[start:end + 1]
+            self.endRemoveRows()
+            if row is not None:
+                end = start = row
+        self._changed()
+
+    def clear(self):
+        if not self._items:
+            return
+        self.beginResetModel()
+        self._items = []
+        self._by_key = {}
+        self.endResetModel()
+        self._changed()
+
+    def set_field(self, rows, field, value):
+        """여러 줄의 한 값(is_checked, is_case_i, color)을 바꿉니다."""
+        rows = [row for row in rows if self._items[row].get(field) != value]
+        if not rows:
+            return
+        for row in rows:
+            self._items[row][field] = value
+        self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+        self._changed()
+
+    def toggle(self, row, field):
+        self.set_field([row], field, not self._items[row][field])
+
+
+class TermDelegate(QStyledItemDelegate):
+    """
+    항목 줄 하나를 위젯 없이 직접 그리고 클릭 위치로 체크/버튼을 처리합니다.
+    (항목마다 위젯을 만들지 않으므로 수천 개여도 보이는 줄만 그림)
+    buttons: 오른쪽 끝부터 놓을 버튼 이름 ("remove", "case", "color", "next", "prev")
+    """
+    # (버튼 이름, 줄 번호) - 체크/대소문자 표시는 여기서 바로 바꾸고 나머지는 알림
+    button_clicked = pyqtSignal(str, int)
+
+    GLYPHS = {"remove": "X", "next": "▼", "prev": "▲"}
+    TOOLTIPS = {"remove": "Remove", "case": "Case Insensitive", "color": "Change Color",
+                "next": "Next Line", "prev": "Previous Line"}
+
+    def __init__(self, buttons, parent=None):
+        super().__init__(parent)
+        self.buttons = buttons
+        self.small_font = QFont()
+        self.small_font.setPointSize(8)
+
+    def sizeHint(self, option, index):
+        return QSize(0, option.fontMetrics.height() + ROW_PADDING)
+
+    def layout(self, rect, item):
+        """줄 안의 영역 {"check", "kind", "text", 버튼 이름...}"""
+        areas = {}
+        right = rect.right() - SPACING
+        for name in self.buttons:
+            width = COLOR_WIDTH if name == "color" else BUTTON_WIDTH
+            height = min(rect.height() - 4, CASE_SIZE + 6) if name == "case" else rect.height() - 4
+            areas[name] = QRect(right - width + 1, rect.center().y() - height // 2, width, height)
+            right -= width + SPACING
+        left = rect.left() + SPACING
+        if item.get("kind", "text") != "text":
+            areas["kind"] = QRect(left, rect.top(), KIND_WIDTH, rect.height())
+            left += KIND_WIDTH + SPACING
+        areas["check"] = QRect(left, rect.center().y() - CHECK_SIZE // 2, CHECK_SIZE, CHECK_SIZE)
+        left += CHECK_SIZE + SPACING
+        areas["text"] = QRect(left, rect.top(), max(0, right - left), rect.height())
+        return areas
+
+    def paint(self, painter, option, index):
+        item = index.data(ITEM_ROLE)
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        areas = self.layout(option.rect, item)
+        text_color = option.palette.text().color()
+
+        if "kind" in areas:
+            # 정규식/표현식 항목은 앞에 종류 표시
+            painter.setFont(self.small_font)
+            painter.setPen(KIND_COLOR)
+            painter.drawText(areas["kind"], Qt.AlignVCenter | Qt.AlignLeft, item["kind"])
+            painter.setFont(option.font)
+        self._draw_box(painter, areas["check"], item["is_checked"])
+        painter.setPen(text_color)
+        text = option.fontMetrics.elidedText(item["term"], Qt.ElideRight, areas["text"].width())
+        painter.drawText(areas["text"], Qt.AlignVCenter | Qt.AlignLeft, text)
+
+        for name in self.buttons:
+            rect = areas[name]
+            if name == "case":
+                box = QRect(rect.left(), rect.center().y() - CASE_SIZE // 2, CASE_SIZE, CASE_SIZE)
+                self._draw_box(painter, box, item["is_case_i"])
+                painter.setFont(self.small_font)
+                painter.setPen(text_color)
+                painter.drawText(rect.adjusted(CASE_SIZE + 2, 0, 0, 0), Qt.AlignVCenter | Qt.AlignLeft, "i")
+                painter.setFont(option.font)
+            elif name == "color":
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(QColor(item.get("color", "#ffff00")))
+                painter.drawRoundedRect(rect, 3, 3)
+            else:
+                painter.setPen(BUTTON_BORDER)
+                painter.setBrush(BOX_COLOR)
+                painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 4, 4)
+                painter.setPen(text_color)
+                painter.drawText(rect, Qt.AlignCenter, self.GLYPHS[name])
+        painter.restore()
+
+    @staticmethod
+    def _draw_box(painter, rect, checked):
+        painter.setPen(QPen(BOX_BORDER))
+        painter.setBrush(CHECKED_COLOR if checked else BOX_COLOR)
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+    def hit_test(self, rect, item, pos):
+        """pos가 가리키는 영역 이름 (체크 표시는 단어 글자를 눌러도 바뀜), 없으면 None"""
+        for name, area in self.layout(rect, item).items():
+            if area.contains(pos):
+                return "check" if name == "text" else name
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            return False
+        if event.button() != Qt.LeftButton or event.modifiers() & (Qt.ControlModifier | Qt.ShiftModifier):
+            # Ctrl/Shift 클릭은 여러 항목 선택에 씀
+            return False
+        name = self.hit_test(option.rect, index.data(ITEM_ROLE), event.pos())
+        if name is None or name == "kind":
+            return False
+        if event.type() == QEvent.MouseButtonRelease:
+            if name == "check":
+                model.toggle(index.row(), "is_checked")
+            elif name == "case":
+                model.toggle(index.row(), "is_case_i")
+            else:
+                self.button_clicked.emit(name, index.row())
+        # 더블클릭은 체크를 두 번 바꾸지 않도록 먹어 둠
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        name = self.hit_test(option.rect, index.data(ITEM_ROLE), event.pos())
+        if name in self.TOOLTIPS:
+            QToolTip.showText(event.globalPos(), self.TOOLTIPS[name], view)
+            return True
+        return super().helpEvent(event, view, option, index)
+
+
+class TermListView(QListView):
+    """
+    항목 목록 보기. 보이는 줄만 대리자(TermDelegate)가 그립니다.
+    Space: 선택한 항목 켜기/끄기, Delete: 선택한 항목 지우기, 오른쪽 클릭: 가져오기/내보내기 등
+    """
+    # 오른쪽 클릭 메뉴에서 고른 동작 이름
+    action_requested = pyqtSignal(str)
+
+    MENU = [("import", "Import from File..."), ("export", "Export to File..."), None,
+            ("check_all", "Check All"), ("uncheck_all", "Uncheck All"), None,
+            ("remove_selected", "Remove Selected"), ("remove_all", "Remove All")]
+
+    def __init__(self, model, delegate, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(delegate)
+        # 모든 줄 높이가 같으므로 줄마다 크기를 묻지 않음
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+
+    def selected_rows(self):
+        return sorted(index.row() for index in self.selectionModel().selectedRows())
+
+    def keyPressEvent(self, event):
+        rows = self.selected_rows()
+        model = self.model()
+        if event.key() == Qt.Key_Space and rows:
+            # 선택한 항목이 모두 켜져 있으면 끄고, 아니면 모두 켬
+            checked = not all(model.data(model.index(row), ITEM_ROLE)["is_checked"] for row in rows)
+            model.set_field(rows, "is_checked", checked)
+            return
+        if event.key() == Qt.Key_Delete and rows:
+            model.remove_rows(rows)
+            return
+        super().keyPressEvent(event)
+
+    def contextMenuEvent(self, event):
+        menu = QMenu(self)
+        for entry in self.MENU:
+            if entry is None:
+                menu.addSeparator()
+                continue
+            name, label = entry
+            action = menu.addAction(label)
+            action.setData(name)
+            if name == "remove_selected":
+                action.setEnabled(bool(self.selected_rows()))
+            elif name != "import":
+                action.setEnabled(len(self.model()) > 0)
+        chosen = menu.exec_(event.globalPos())
+        if chosen is not None:
+            self.action_requested.emit(chosen.data())
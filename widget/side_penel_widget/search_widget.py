@@ -1,10 +1,11 @@
-from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLineEdit, QCheckBox, QLabel
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLineEdit, QCheckBox, QLabel, QPushButton
 from PyQt5.QtGui import QTextDocument
 from PyQt5.QtCore import pyqtSignal
 
 class SearchWidget(QWidget):
-    # 시그널: (검색어, 검색플래그)
-    search_triggered = pyqtSignal(str, object) 
+    # 시그널: (검색어, 검색플래그, 전체 파일 검색 여부)
+    # 이전 결과로 이동할 때는 검색플래그에 FindBackward가 포함됨
+    search_triggered = pyqtSignal(str, object, bool)
     search_cleared = pyqtSignal()
     
     def __init__(self):
@@ -14,37 +15,57 @@ class SearchWidget(QWidget):
         
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("Search...")
+        self.search_box.setMinimumWidth(100)
         
         self.search_case_cb = QCheckBox("Case (i)")
         self.search_case_cb.setToolTip("Case Insensitive Search")
         
+        self.search_all_cb = QCheckBox("All")
+        self.search_all_cb.setToolTip("Search Whole File (Ignore Filters)")
+
         self.search_count_label = QLabel("0/0")
-        self.search_count_label.setFixedWidth(60)
+        self.search_count_label.setMinimumWidth(90)
+
+        self.prev_btn = QPushButton("▲")
+        self.prev_btn.setToolTip("Previous Match")
+        self.prev_btn.setFixedWidth(24)
+        self.next_btn = QPushButton("▼")
+        self.next_btn.setToolTip("Next Match")
+        self.next_btn.setFixedWidth(24)
         
         layout.addWidget(self.search_box)
         layout.addWidget(self.search_case_cb)
+        layout.addWidget(self.search_all_cb)
         layout.addWidget(self.search_count_label)
+        layout.addWidget(self.prev_btn)
+        layout.addWidget(self.next_btn)
         
+        # 시그널 인자(체크 상태 등)가 backward로 넘어가지 않도록 람다로 연결
         self.search_box.returnPressed.connect(self.on_search)
         self.search_box.textChanged.connect(self.on_text_changed)
-        self.search_case_cb.stateChanged.connect(self.on_search)
+        self.search_case_cb.stateChanged.connect(lambda: self.on_search())
+        self.search_all_cb.stateChanged.connect(lambda: self.on_search())
+        self.prev_btn.clicked.connect(lambda: self.on_search(backward=True))
+        self.next_btn.clicked.connect(lambda: self.on_search())
 
-    def on_search(self):
+    def on_search(self, backward=False):
         term = self.search_box.text().strip()
         if term:
             find_flags = QTextDocument.FindFlags()
             if not self.search_case_cb.isChecked():
                 find_flags |= QTextDocument.FindCaseSensitively
+            if backward:
+                find_flags |= QTextDocument.FindBackward
             
-            self.search_triggered.emit(term, find_flags)
+            self.search_triggered.emit(term, find_flags, self.search_all_cb.isChecked())
         else:
             self.search_cleared.emit()
-            
+
     def on_text_changed(self, text):
         if not text.strip():
             self.search_count_label.setText("0/0")
             self.search_cleared.emit()
 
-    def set_search_count(self, index, total):
-        """검색 결과 라벨을 업데이트하는 슬롯"""
-        self.search_count_label.setText(f"{index}/{total}")
+    def set_search_count(self, index, total, finished=True):
+        """검색 결과 라벨을 업데이트하는 슬롯 (검색 중이면 전체 수 뒤에 '+' 표시)"""
+        self.search_count_label.setText(f"{index}/{total}" + ("" if finished else "+"))
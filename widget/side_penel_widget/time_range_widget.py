@@ -0,0 +1,54 @@
+# time_range_widget.py
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLineEdit, QPushButton
+from PyQt5.QtCore import pyqtSignal
+
+class TimeRangeWidget(QWidget):
+    # 시그널: (시작 시각, 끝 시각) - 비어 있으면 그쪽은 제한 없음
+    time_range_requested = pyqtSignal(str, str)
+    time_range_cleared = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.start_box = QLineEdit()
+        self.start_box.setPlaceholderText("From (HH:MM:SS)")
+        self.start_box.setMinimumWidth(80)
+        self.end_box = QLineEdit()
+        self.end_box.setPlaceholderText("To")
+        self.end_box.setMinimumWidth(80)
+
+        self.apply_btn = QPushButton("Time")
+        self.apply_btn.setToolTip("Show Only Lines In Time Range")
+        self.apply_btn.setFixedWidth(50)
+        self.clear_btn = QPushButton("✕")
+        self.clear_btn.setToolTip("Clear Time Range")
+        self.clear_btn.setFixedWidth(24)
+
+        layout.addWidget(self.start_box)
+        layout.addWidget(self.end_box)
+        layout.addWidget(self.apply_btn)
+        layout.addWidget(self.clear_btn)
+
+        self.apply_btn.clicked.connect(self.on_apply)
+        self.start_box.returnPressed.connect(self.on_apply)
+        self.end_box.returnPressed.connect(self.on_apply)
+        self.clear_btn.clicked.connect(self.on_clear)
+
+    def on_apply(self):
+        start, end = self.start_box.text().strip(), self.end_box.text().strip()
+        if start or end:
+            self.time_range_requested.emit(start, end)
+        else:
+            self.time_range_cleared.emit()
+
+    def on_clear(self):
+        self.start_box.clear()
+        self.end_box.clear()
+        self.time_range_cleared.emit()
+
+    def set_busy(self, busy):
+        """타임스탬프 색인 중에는 버튼에 표시합니다."""
+        self.apply_btn.setText("..." if busy else "Time")
+        self.apply_btn.setEnabled(not busy)
@@ -0,0 +1,259 @@
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+
+from .match_cache import pack_mask
+
+# 형식을 판단할 때 살펴보는 앞쪽 줄 수
+DETECT_LINES = 200
+# 이 비율 이상의 줄이 맞아야 그 형식으로 판단
+DETECT_RATIO = 0.5
+# 색인을 만들 때 한 번에 읽는 덩어리 크기
+INDEX_CHUNK_SIZE = 4 * 1024 * 1024
+# 타임스탬프가 없는 (첫 타임스탬프 앞의) 줄의 값
+NO_TIME = float("-inf")
+
+_MONTHS = {name: i + 1 for i, name in enumerate(
+    [b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun", b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec"])}
+# 줄 앞의 공백, syslog 우선순위(<13>) 등은 건너뜀
+_LEAD = rb"[ \t]*(?:<\d{1,3}>)?"
+
+
+@lru_cache(maxsize=4096)
+def _day_seconds(year, month, day):
+    """날짜의 시작 시각 (1970-01-01 기준 초, 시간대는 고려하지 않음)"""
+    return (date(year, month, day).toordinal() - 719163) * 86400
+
+
+def _iso(m):
+    y, mo, d, h, mi, s = m.group(2, 3, 4, 5, 6, 7)
+    return _day_seconds(int(y), int(mo), int(d)) + int(h) * 3600 + int(mi) * 60 + int(s)
+
+
+def _logcat(m):
+    mo, d, h, mi, s = m.group(2, 3, 4, 5, 6)
+    return _day_seconds(_THIS_YEAR, int(mo), int(d)) + int(h) * 3600 + int(mi) * 60 + int(s)
+
+
+def _syslog(m):
+    mon, d, h, mi, s = m.group(2, 3, 4, 5, 6)
+    return _day_seconds(_THIS_YEAR, _MONTHS[mon], int(d)) + int(h) * 3600 + int(mi) * 60 + int(s)
+
+
+def _seconds(m):
+    # epoch 초 또는 커널 부팅 후 경과 초
+    return int(m.group(2))
+
+
+# 연도가 없는 형식은 올해로 봄
+_THIS_YEAR = time.localtime().tm_year
+
+
+class TimestampFormat:
+    """
+    줄 맨 앞의 타임스탬프 형식 하나.
+    정규식의 1번 그룹은 초 단위까지의 텍스트, frac 그룹은 소수점 아래 자릿수입니다.
+    같은 초의 줄이 연달아 나오므로 초 단위 값은 텍스트별로 캐시해 두고 재사용합니다.
+    """
+    def __init__(self, name, pattern, convert):
+        self.name = name
+        self.regex = re.compile(_LEAD + pattern)
+        self.convert = convert
+        self._cache = {}
+
+    def parse(self, line):
+        """줄(bytes)의 타임스탬프를 초 단위 float로 반환합니다. 없거나 잘못된 값이면 None."""
+        m = self.regex.match(line)
+        if m is None:
+            return None
+        base = m.group(1)
+        seconds = self._cache.get(base)
+        if seconds is None:
+            try:
+                seconds = self.convert(m)
+            except (ValueError, KeyError):
+                return None
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            self._cache[base] = seconds
+        frac = m.group("frac")
+        return seconds + int(frac) / _SCALES[len(frac)] if frac else seconds
+
+    def parse_lines(self, lines, last=float("-inf")):
+        """
+        줄 목록의 타임스탬프 목록을 반환합니다. (덩어리 단위로 한 번에 처리)
+        타임스탬프가 없는 줄은 바로 앞 줄의 값(처음이면 last)을 따릅니다.
+        """
+        match = self.regex.match
+        cache = self._cache
+        convert = self.convert
+        result = []
+        append = result.append
+        for line in lines:
+            m = match(line)
+            if m is not None:
+                seconds = cache.get(m[1])
+                if seconds is None:
+                    try:
+                        seconds = convert(m)
+                    except (ValueError, KeyError):
+                        append(last)
+                        continue
+                    if len(cache) >= _CACHE_SIZE:
+                        cache.clear()
+                    cache[m[1]] = seconds
+                frac = m["frac"]
+                last = seconds + int(frac) / _SCALES[len(frac)] if frac else seconds
+            append(last)
+        return result
+
+
+_CACHE_SIZE = 65536
+_SCALES = [10 ** n for n in range(10)]
+
+# 판단 순서 = 우선순위 (더 구체적인 형식부터)
+FORMATS = [
+    # 2025-01-01 12:00:00.123, 2025-01-01T12:00:00,123Z
+    TimestampFormat("iso8601", rb"((\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d):(\d\d))(?:[.,](?P<frac>\d{1,9}))?", _iso),
+    # 01-15 12:34:56.789 (logcat threadtime)
+    TimestampFormat("logcat", rb"((\d\d)-(\d\d) (\d\d):(\d\d):(\d\d))\.(?P<frac>\d{1,6})", _logcat),
+    # Jan 15 12:34:56
+    TimestampFormat("syslog", rb"(([A-Z][a-z]{2}) {1,2}(\d{1,2}) (\d\d):(\d\d):(\d\d))(?P<frac>)", _syslog),
+    # [  123.456789] (dmesg)
+    TimestampFormat("kernel", rb"\[\s*((\d+))\.(?P<frac>\d{1,9})\]", _seconds),
+    # 1700000000.123
+    TimestampFormat("epoch", rb"((\d{10}))(?:\.(?P<frac>\d{1,9}))?(?!\d)", _seconds),
+]
+
+
+def detect_format(lines):
+    """앞쪽 줄(bytes)들을 보고 가장 많이 맞는 타임스탬프 형식을 반환합니다. (없으면 None)"""
+    sample = [line for line in lines[:DETECT_LINES] if line.strip()]
+    if not sample:
+        return None
+    best, best_count = None, 0
+    for fmt in FORMATS:
+        count = sum(1 for line in sample if fmt.parse(line) is not None)
+        if count > best_count:
+            best, best_count = fmt, count
+    return best if best_count >= len(sample) * DETECT_RATIO else None
+
+
+# 시각만 입력한 경우: 12:03:10, 12:03:10.250
+_TIME_ONLY = re.compile(r"\s*(\d{1,2}):(\d\d)(?::(\d\d)(?:[.,](\d{1,9}))?)?\s*$")
+# 날짜와 시각: 2024-05-01 13:00, 2024-05-01T13:00:05.5 (입력에서는 초를 빼도 됨)
+_DATE_TIME = re.compile(r"\s*(\d{4})-(\d\d)-(\d\d)[T ](\d{1,2}):(\d\d)(?::(\d\d)(?:[.,](\d{1,9}))?)?\s*$")
+
+
+def parse_time_input(text, reference=None):
+    """
+    사용자가 입력한 시각을 초 단위 float로 바꿉니다. (잘못된 입력이면 ValueError)
+    로그와 같은 형식의 전체 타임스탬프, 날짜와 시각(YYYY-MM-DD HH:MM[:SS[.fff]]),
+    또는 시각만(HH:MM[:SS[.fff]]) 입력할 수 있고, 시각만 입력하면 reference(로그 첫 타임스탬프)가 속한 날짜로 봅니다.
+    """
+    m = _TIME_ONLY.match(text)
+    if m is not None:
+        h, mi, sec, frac = m.groups()
+        day = (reference // 86400) * 86400 if reference is not None and reference != NO_TIME else 0
+        return day + int(h) * 3600 + int(mi) * 60 + int(sec or 0) + (int(frac) / _SCALES[len(frac)] if frac else 0)
+    m = _DATE_TIME.match(text)
+    if m is not None:
+        y, mo, d, h, mi, sec, frac = m.groups()
+        try:
+            day = _day_seconds(int(y), int(mo), int(d))
+        except ValueError:
+            raise ValueError(f"Unrecognized time: {text!r}") from None
+        return day + int(h) * 3600 + int(mi) * 60 + int(sec or 0) + (int(frac) / _SCALES[len(frac)] if frac else 0)
+    data = text.strip().encode("utf-8")
+    for fmt in FORMATS:
+        t = fmt.parse(data)
+        if t is not None:
+            return t
+    raise ValueError(f"Unrecognized time: {text!r}")
+
+
+class TimestampIndex:
+    """
+    줄 번호와 나란한 타임스탬프 배열 (array('d'), 초 단위).
+    형식은 첫 덩어리에서 한 번 판단하고, 타임스탬프가 없는 줄은 앞 줄의 값을 따릅니다.
+    줄이 추가되면 extend()로 새 줄만 이어서 색인합니다.
+    시각이 오름차순이면 시간 범위는 이진 탐색 두 번으로 바로 구합니다.
+    """
+    def __init__(self):
+        self.fmt = None
+        self.detected = False
+        self.times = array("d")
+        self.monotonic = True
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def first_time(self):
+        """첫 타임스탬프 (없으면 None)"""
+        start = bisect_right(self.times, NO_TIME) if self.monotonic else 0
+        for t in self.times[start:start + DETECT_LINES]:
+            if t != NO_TIME:
+                return t
+        return None
+
+    def extend(self, store, stop=None, cancelled=None, parallel=None):
+        """
+        저장소의 [len(self), stop) 줄을 색인합니다.
+        cancelled: 덩어리마다 확인하는 중단 여부 함수 (True면 그 자리에서 멈춤)
+        parallel: 큰 범위를 프로세스 풀로 나눠 읽을 ParallelFilter (없으면 현재 스레드)
+        """
+        stop = len(store) if stop is None else stop
+        start = len(self.times)
+        if start >= stop:
+            return True
+        if not self.detected:
+            # 형식은 첫 덩어리에서 한 번만 판단
+            self.fmt = detect_format(store.raw(0, min(stop, DETECT_LINES)).split(b"\n"))
+            self.detected = True
+        last = self.times[-1] if self.times else NO_TIME
+
+        if self.fmt is None:
+            self._append([last] * (stop - start), last)
+        elif parallel is not None and parallel.should_use(store, start, stop):
+            self._append(parallel.timestamps(store, self.fmt, start, stop, last), last)
+        else:
+            for first, end, data in store.iter_chunks(start, stop, INDEX_CHUNK_SIZE):
+                if cancelled is not None and cancelled():
+                    return False
+                keys = self.fmt.parse_lines(data.split(b"\n", end - first)[:end - first], last)
+                self._append(keys, last)
+                last = keys[-1]
+        return True
+
+    def restore(self, fmt_name, times, monotonic):
+        """저장해 둔 색인(형식 이름, 줄별 시각 배열, 오름차순 여부)으로 채웁니다."""
+        self.fmt = next((fmt for fmt in FORMATS if fmt.name == fmt_name), None)
+        self.detected = True
+        self.times = times
+        self.monotonic = monotonic
+
+    def _append(self, keys, last):
+        # 이미 어긋났으면 더 확인하지 않음 (덩어리마다 이웃한 값만 한 번씩 비교)
+        if self.monotonic and len(keys) and (
+                keys[0] < last or any(b < a for a, b in zip(keys, islice(keys, 1, None)))):
+            self.monotonic = False
+        self.times.extend(keys)
+
+    def truncate(self, n):
+        """n번째 줄부터의 색인을 버립니다. (따라가기 모드에서 다시 받을 마지막 줄)"""
+        del self.times[n:]
+
+    def range_bits(self, t0, t1, start, stop):
+        """[start, stop) 줄 중 시각이 t0 이상 t1 이하인 줄의 비트셋 (0번 비트 = start 줄)"""
+        times = self.times
+        if self.monotonic:
+            lo = bisect_left(times, t0, start, stop)
+            hi = bisect_right(times, t1, lo, stop)
+            return ((1 << (hi - lo)) - 1) << (lo - start) if hi > lo else 0
+        # 순서가 어긋난 줄이 있으면 줄마다 비교
+        return pack_mask(bytes(t0 <= t <= t1 for t in times[start:stop]))
@@ -0,0 +1,179 @@
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from .filter_engine import FilterCancelled
+from .perf import recorder
+
+# 변경 신호를 모았다가 한 번에 처리하는 간격 (ms, 화면 한 프레임)
+FRAME_INTERVAL = 16
+# 이 줄 수 이상이면 필터를 백그라운드 스레드에서 다시 계산 (작은 파일은 바로 계산하는 편이 빠름)
+BACKGROUND_FILTER_LINES = 200000
+
+
+class FilterJob(QThread):
+    """
+    필터를 전체 줄에 다시 적용하는 스레드.
+    더 새로운 요청이 오면 (requestInterruption) 다음 덩어리에서 멈추고 결과 없이 끝납니다.
+    """
+    def __init__(self, log_data, or_filters, and_filters, generation):
+        super().__init__()
+        self.log_data = log_data
+        self.or_filters = or_filters
+        self.and_filters = and_filters
+        # 요청 번호 (결과를 받을 때 이보다 새로운 요청이 있으면 버림)
+        self.generation = generation
+        self.line_count = log_data.line_count
+        self.started_at = recorder.begin()
+        # (비트셋, 원본 인덱스), 취소되거나 실패하면 None
+        self.result = None
+
+    def run(self):
+        n = self.line_count
+        try:
+            bits = self.log_data.get_filtered_bits(
+                self.or_filters, self.and_filters, 0, n, self.isInterruptionRequested)
+            self.result = (bits, self.log_data.bits_to_lines(bits, 0, n))
+        except FilterCancelled:
+            pass
+        except Exception as e:
+            print(f"Error filtering log: {e}")
+
+
+class UpdateScheduler(QObject):
+    """
+    필터/하이라이트/검색 변경을 모아 한 프레임에 한 번만 다시 계산합니다.
+    - 짧은 시간에 여러 번 바뀌면 마지막 상태로 한 번만 계산
+    - 큰 파일의 필터는 백그라운드 스레드에서 계산하고, 새 요청이 오면 이전 계산을 멈춤
+      (필터 계산 스레드는 한 번에 하나: 단어 비트맵 캐시와 타임스탬프 색인을 함께 쓰기 때문)
+    - 새 검색은 필터 결과가 뷰에 반영된 뒤에 시작 (필터된 뷰를 검색하므로)
+    계산 스레드가 도는 동안 GUI 스레드는 저장소와 캐시를 바꾸지 않아야 합니다. (busy 확인)
+    """
+    # 필터 실행 직전 (실행 계획) - 같은 연결로 바로 호출되므로 다른 백그라운드 작업을 기다릴 수 있음
+    filter_started = pyqtSignal(object)
+    # 새 필터 결과 (비트셋 또는 None, 원본 인덱스)
+    filters_ready = pyqtSignal(object, object)
+    highlights_due = pyqtSignal()
+    # 시작할 검색 (검색 인자 튜플)
+    search_due = pyqtSignal(object)
+    # 백그라운드 계산이 끝나 저장소를 다시 바꿔도 됨
+    idle = pyqtSignal()
+
+    def __init__(self, log_data, parent=None):
+        super().__init__(parent)
+        self.log_data = log_data
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(FRAME_INTERVAL)
+        self.timer.timeout.connect(self.flush)
+        # 다음 프레임에 처리할 변경 종류 ("filter", "highlight", "search")
+        self.pending = set()
+        # 마지막으로 요청된 필터 목록과 검색 인자 (여러 번 요청되면 마지막 것만)
+        self.filters = ([], [])
+        self.search_args = None
+        # 필터 결과를 기다리는 검색이 있는지
+        self.search_waiting = False
+        # 요청 번호 (필터를 요청할 때마다 증가)와 실행 중인 계산, 끝나면 다시 계산할지
+        self.generation = 0
+        self.job = None
+        self.restart = False
+
+    @property
+    def busy(self):
+        """백그라운드 필터 계산이 도는 중인지"""
+        return self.job is not None
+
+    # --- 요청 ---
+
+    def request_filter(self, or_filters, and_filters):
+        self.filters = (or_filters, and_filters)
+        self._schedule("filter")
+
+    def request_highlight(self):
+        self._schedule("highlight")
+
+    def request_search(self, args):
+        self.search_args = args
+        self._schedule("search")
+
+    def _schedule(self, kind):
+        self.pending.add(kind)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    # --- 처리 ---
+
+    def flush(self):
+        """모인 변경을 처리합니다. (타이머 또는 settle()에서 호출)"""
+        self.timer.stop()
+        kinds, self.pending = self.pending, set()
+        if "filter" in kinds:
+            self.generation += 1
+            if self.job is not None:
+                # 지금 계산은 더 이상 쓸모없음: 멈추게 하고, 끝나면 새 목록으로 다시 시작
+                self.job.requestInterruption()
+                self.restart = True
+            else:
+                self._start_filter()
+        if "highlight" in kinds:
+            self.highlights_due.emit()
+        if "search" in kinds:
+            if self.job is not None:
+                self.search_waiting = True
+            else:
+                self.search_due.emit(self.search_args)
+
+    def _start_filter(self):
+        or_filters, and_filters = self.filters
+        self.filter_started.emit(self.log_data.compile_filters(or_filters, and_filters))
+        n = self.log_data.line_count
+        if n < BACKGROUND_FILTER_LINES:
+            with recorder.phase("filter", lines=n) as stats:
+                bits = self.log_data.get_filtered_bits(or_filters, and_filters)
+                rows = self.log_data.bits_to_lines(bits, 0, n)
+                stats["matched"] = len(rows)
+            self.filters_ready.emit(bits, rows)
+            return
+        self.job = FilterJob(self.log_data, or_filters, and_filters, self.generation)
+        self.job.finished.connect(self.on_job_finished)
+        self.job.start()
+
+    def on_job_finished(self):
+        if self.sender() is self.job:
+            self._finish_job()
+
+    def _finish_job(self):
+        job, self.job = self.job, None
+        job.wait()
+        job.deleteLater()
+        if self.restart:
+            self.restart = False
+            self._start_filter()
+            return
+        if job.generation == self.generation and job.result is not None:
+            bits, rows = job.result
+            recorder.end("filter", job.started_at, lines=job.line_count, matched=len(rows))
+            self.filters_ready.emit(bits, rows)
+        if self.search_waiting:
+            self.search_waiting = False
+            self.search_due.emit(self.search_args)
+        self.idle.emit()
+
+    def settle(self):
+        """모인 변경을 바로 처리하고 백그라운드 계산이 끝날 때까지 기다립니다. (캐시를 직접 쓰기 전)"""
+        if self.pending:
+            self.flush()
+        while self.job is not None:
+            self.job.wait()
+            self._finish_job()
+
+    def cancel(self):
+        """
+        계산 중인 필터를 멈추고, 아직 처리하지 않은 필터/검색 요청은 버립니다. (저장소를 바꾸기 전)
+        하이라이트 요청은 그대로 처리됩니다.
+        """
+        self.pending -= {"filter", "search"}
+        self.generation += 1
+        self.restart = False
+        self.search_waiting = False
+        if self.job is not None:
+            self.job.requestInterruption()
+            self.settle()